@@ -41,4 +41,36 @@ app.conf.beat_schedule = {
         "task": "interview.tasks.ai_phone.initiate_all_interview",
         "schedule": crontab(minute="*/5"),
     },
+    "refresh-expiring-platform-tokens": {
+        "task": "organizations.tasks.refresh_expiring_platform_tokens",
+        "schedule": crontab(minute="*/5"),
+    },
+    "flush-application-status-updates": {
+        "task": "interview.tasks.status_updates.flush_all_application_status_updates",
+        "schedule": crontab(minute="*"),
+    },
+    "dispatch-due-call-retries": {
+        "task": "interview.tasks.retry.dispatch_due_retries",
+        "schedule": crontab(minute="*/5"),
+    },
+    "reconcile-call-quota": {
+        "task": "subscription.tasks.reconcile_call_quota",
+        "schedule": crontab(minute="*/15"),
+    },
+    "flush-email-buffer": {
+        "task": "common.tasks.flush_email_buffer",
+        "schedule": crontab(minute="*"),
+    },
+    "refresh-twilio-country-catalog": {
+        "task": "phone_number.tasks.refresh_country_catalog",
+        "schedule": crontab(minute=30, hour=0),
+    },
+    "resume-stalled-sms-campaigns": {
+        "task": "interview.tasks.sms_campaigns.resume_stalled_sms_campaigns",
+        "schedule": crontab(minute="*/5"),
+    },
+    "create-conversation-partitions": {
+        "task": "interview.tasks.archive.create_upcoming_conversation_partitions",
+        "schedule": crontab(minute=0, hour=1),
+    },
 }
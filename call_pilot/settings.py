@@ -29,6 +29,7 @@ DEFAULT_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 CREATED_APPS = [
     "core",
@@ -95,6 +96,13 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_CACHE_URL", "redis://localhost:6379/1"),
+    }
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -193,3 +201,6 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL")
+
+# Public URL of the Twilio SMS status callback, also used to verify signatures
+SMS_STATUS_CALLBACK_URL = os.getenv("SMS_STATUS_CALLBACK_URL")
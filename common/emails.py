@@ -0,0 +1,249 @@
+"""
+Batched email sending.
+
+Transactional emails (OTP, password reset, invitations) are queued on a Redis
+list and sent a couple of seconds later by a single flush, over one opened
+backend connection, instead of a new connection per email. Emails to many
+recipients with the same template go out as one SendGrid request with a
+personalization per recipient.
+
+Latency (queued to sent) and batch sizes are kept in Redis, see
+get_email_metrics.
+"""
+
+import time
+from functools import lru_cache
+
+import orjson
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+from django.utils.html import escape
+
+from common.redis_client import get_redis
+
+EMAIL_BUFFER_KEY = "email_buffer"
+EMAIL_METRICS_KEY = "email_metrics"
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 3
+# SendGrid accepts at most this many personalizations per request
+SENDGRID_PERSONALIZATION_LIMIT = 1000
+
+NO_REPLY_ADDRESS = "no-reply@rd1.co.uk"
+PLAIN_TEXT_BODY = "Please view this email in an HTML-compatible email client."
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name):
+    """Compiled templates, kept for the life of the worker."""
+    return get_template(template_name)
+
+
+def is_sendgrid_backend():
+    return "sendgrid" in (settings.EMAIL_BACKEND or "").lower()
+
+
+def get_from_email(customer_email=None):
+    if customer_email:
+        return f'"{customer_email}" <{NO_REPLY_ADDRESS}>'
+    return NO_REPLY_ADDRESS
+
+
+def get_reply_to(customer_email=None, reply_to=None):
+    reply_to_address = reply_to if reply_to else customer_email
+    return [reply_to_address] if reply_to_address else None
+
+
+def build_email(
+    subject, recipient, template_name, context, customer_email=None, reply_to=None
+):
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=PLAIN_TEXT_BODY,
+        from_email=get_from_email(customer_email),
+        to=[recipient],
+        reply_to=get_reply_to(customer_email, reply_to),
+    )
+    email.attach_alternative(
+        get_email_template(template_name).render(context), "text/html"
+    )
+    return email
+
+
+def build_personalized_email(
+    subject, template_name, context, recipients, customer_email=None, reply_to=None
+):
+    """
+    One email for many recipients, with a SendGrid personalization each.
+
+    recipients are {"email": ..., "context": {...}}. The template is rendered
+    once with a -key- substitution tag for every recipient specific context
+    key, which SendGrid replaces per recipient, so those values should be
+    output as they are rather than through filters.
+    """
+    keys = sorted({key for recipient in recipients for key in recipient["context"]})
+    html_content = get_email_template(template_name).render(
+        {**context, **{key: f"-{key}-" for key in keys}}
+    )
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=PLAIN_TEXT_BODY,
+        from_email=get_from_email(customer_email),
+        reply_to=get_reply_to(customer_email, reply_to),
+    )
+    email.attach_alternative(html_content, "text/html")
+    email.personalizations = [
+        {
+            "to": [{"email": recipient["email"]}],
+            # Substitutions skip the template's autoescaping. The SendGrid
+            # backend reads them as a list of single key dicts.
+            "substitutions": [
+                {f"-{key}-": escape(recipient["context"].get(key, ""))} for key in keys
+            ],
+        }
+        for recipient in recipients
+    ]
+    return email
+
+
+def push_emails(items):
+    if items:
+        get_redis().rpush(EMAIL_BUFFER_KEY, *[orjson.dumps(item) for item in items])
+
+
+def pop_emails(batch_size=EMAIL_BATCH_SIZE):
+    pipeline = get_redis().pipeline()
+    pipeline.lrange(EMAIL_BUFFER_KEY, 0, batch_size - 1)
+    pipeline.ltrim(EMAIL_BUFFER_KEY, batch_size, -1)
+    items, _ = pipeline.execute()
+    return [orjson.loads(item) for item in items]
+
+
+def record_email_metrics(sent, failed, latencies):
+    pipeline = get_redis().pipeline()
+    pipeline.hincrby(EMAIL_METRICS_KEY, "batches", 1)
+    pipeline.hincrby(EMAIL_METRICS_KEY, "sent", sent)
+    pipeline.hincrby(EMAIL_METRICS_KEY, "failed", failed)
+    pipeline.hincrbyfloat(EMAIL_METRICS_KEY, "latency_seconds_total", sum(latencies))
+    pipeline.hset(
+        EMAIL_METRICS_KEY,
+        mapping={
+            "last_batch_size": sent + failed,
+            "last_batch_max_latency_seconds": round(max(latencies, default=0), 3),
+            "last_batch_at": time.time(),
+        },
+    )
+    pipeline.execute()
+
+
+def get_email_metrics():
+    metrics = {
+        key.decode(): float(value)
+        for key, value in get_redis().hgetall(EMAIL_METRICS_KEY).items()
+    }
+    if metrics.get("sent"):
+        metrics["average_latency_seconds"] = round(
+            metrics["latency_seconds_total"] / metrics["sent"], 3
+        )
+    if metrics.get("batches"):
+        metrics["average_batch_size"] = round(
+            (metrics["sent"] + metrics["failed"]) / metrics["batches"], 1
+        )
+    return metrics
+
+
+def send_email_batch(items):
+    """
+    Send queued emails over one connection. Returns the items that failed,
+    with their attempts counted.
+    """
+    sent, failed, latencies = 0, [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        print(f"Failed to open the email connection: {e}")
+        for item in items:
+            item["attempts"] = item.get("attempts", 0) + 1
+        record_email_metrics(0, len(items), [])
+        return items
+
+    try:
+        for item in items:
+            try:
+                # One message at a time, so a failure is never resent with
+                # the emails sent before it
+                connection.send_messages([build_email(**item["email"])])
+                sent += 1
+                latencies.append(time.time() - item["queued_at"])
+            except Exception as e:
+                print(f"Failed to send email to {item['email']['recipient']}: {e}")
+                item["attempts"] = item.get("attempts", 0) + 1
+                failed.append(item)
+    finally:
+        connection.close()
+
+    record_email_metrics(sent, len(failed), latencies)
+    print(
+        f"Sent {sent} of {len(items)} emails, max latency "
+        f"{max(latencies, default=0):.2f}s"
+    )
+    return failed
+
+
+def flush_emails(batch_size=EMAIL_BATCH_SIZE):
+    """Send every queued email, returning how many were read."""
+    count = 0
+    while True:
+        items = pop_emails(batch_size)
+        if not items:
+            return count
+        failed = send_email_batch(items)
+        # Failed emails are tried again by a later flush
+        push_emails([item for item in failed if item["attempts"] < EMAIL_MAX_ATTEMPTS])
+        count += len(items)
+        # Stop while the backend is failing instead of cycling through the
+        # pushed back emails
+        if failed:
+            return count
+
+
+def send_bulk_email(
+    subject, template_name, context, recipients, customer_email=None, reply_to=None
+):
+    """Send one template to many recipients, returning the number of requests."""
+    recipients = [
+        {"email": recipient["email"], "context": recipient.get("context") or {}}
+        for recipient in recipients
+    ]
+    connection = get_connection()
+    connection.open()
+    try:
+        if is_sendgrid_backend():
+            messages = [
+                build_personalized_email(
+                    subject,
+                    template_name,
+                    context,
+                    recipients[i : i + SENDGRID_PERSONALIZATION_LIMIT],
+                    customer_email,
+                    reply_to,
+                )
+                for i in range(0, len(recipients), SENDGRID_PERSONALIZATION_LIMIT)
+            ]
+        else:
+            messages = [
+                build_email(
+                    subject,
+                    recipient["email"],
+                    template_name,
+                    {**context, **recipient["context"]},
+                    customer_email,
+                    reply_to,
+                )
+                for recipient in recipients
+            ]
+        connection.send_messages(messages)
+    finally:
+        connection.close()
+    return len(messages)
@@ -0,0 +1,39 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Cursor pagination, newest first, so pages don't need a COUNT(*) or an
+    OFFSET scan.
+
+    Clients that still page by number can pass ?page=<n> or
+    ?pagination=page to get the old page number responses.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def use_page_numbers(self, request):
+        return (
+            request.query_params.get("pagination") == "page"
+            or "page" in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_number_pagination = None
+        if self.use_page_numbers(request):
+            self.page_number_pagination = PageNumberPagination()
+            return self.page_number_pagination.paginate_queryset(
+                queryset.order_by(*self.ordering), request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.page_number_pagination:
+            return self.page_number_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class IdCursorPagination(CreatedAtCursorPagination):
+    ordering = ("-id",)
@@ -0,0 +1,12 @@
+import redis
+from django.conf import settings
+
+_redis = None
+
+
+def get_redis():
+    """Process wide client for the Redis behind the default cache."""
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.CACHES["default"]["LOCATION"])
+    return _redis
@@ -1,6 +1,12 @@
+import time
+
 from celery import shared_task
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.cache import cache
+
+from common.emails import build_email, flush_emails, push_emails, send_bulk_email
+
+EMAIL_FLUSH_LOCK_KEY = "email_flush"
+EMAIL_FLUSH_DELAY_SECONDS = 2
 
 
 @shared_task
@@ -12,22 +18,9 @@ def send_email_task(
     customer_email=None,
     reply_to=None,
 ):
-    html_content = render_to_string(template_name, context)
-    if customer_email:
-        from_email = f'"{customer_email}" <no-reply@rd1.co.uk>'
-    else:
-        from_email = "no-reply@rd1.co.uk"
-    reply_to_address = reply_to if reply_to else customer_email
-    reply_to_list = [reply_to_address] if reply_to_address else None
-    email = EmailMultiAlternatives(
-        subject=subject,
-        body="Please view this email in an HTML-compatible email client.",
-        from_email=from_email,
-        to=[recipient],
-        reply_to=reply_to_list,
+    email = build_email(
+        subject, recipient, template_name, context, customer_email, reply_to
     )
-
-    email.attach_alternative(html_content, "text/html")
     try:
         email.send()
         print(f"Email sent successfully to {recipient}")
@@ -35,3 +28,68 @@ def send_email_task(
     except Exception as e:
         print(f"Failed to send email to {recipient}: {str(e)}")
         raise
+
+
+def schedule_email_flush(countdown=EMAIL_FLUSH_DELAY_SECONDS):
+    if cache.add(EMAIL_FLUSH_LOCK_KEY, 1, countdown + 60):
+        flush_email_buffer.apply_async(countdown=countdown)
+
+
+def queue_email(
+    subject,
+    recipient,
+    template_name,
+    context,
+    customer_email=None,
+    reply_to=None,
+):
+    """
+    send_email_task, batched: the email is sent with the others queued in the
+    next couple of seconds, over one connection.
+    """
+    push_emails(
+        [
+            {
+                "email": {
+                    "subject": subject,
+                    "recipient": recipient,
+                    "template_name": template_name,
+                    "context": context,
+                    "customer_email": customer_email,
+                    "reply_to": reply_to,
+                },
+                "queued_at": time.time(),
+                "attempts": 0,
+            }
+        ]
+    )
+    schedule_email_flush()
+
+
+@shared_task
+def flush_email_buffer():
+    # Emails queued from now on schedule the next flush
+    cache.delete(EMAIL_FLUSH_LOCK_KEY)
+    count = flush_emails()
+    if count:
+        print(f"Flushed {count} queued emails")
+
+
+@shared_task
+def send_bulk_email_task(
+    subject,
+    template_name,
+    context,
+    recipients,
+    customer_email=None,
+    reply_to=None,
+):
+    """
+    Send one template to many recipients, given as
+    {"email": ..., "context": {...}} with their own context values.
+    """
+    requests = send_bulk_email(
+        subject, template_name, context, recipients, customer_email, reply_to
+    )
+    print(f"Sent bulk email to {len(recipients)} recipients in {requests} requests")
+    return requests
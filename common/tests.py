@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase, override_settings
+from sendgrid_backend.mail import SendgridBackend
+
+from common.emails import build_personalized_email
+
+
+@override_settings(SENDGRID_API_KEY="test", SENDGRID_SANDBOX_MODE_IN_DEBUG=True)
+class PersonalizedEmailTests(SimpleTestCase):
+    def test_sendgrid_payload_has_substitutions_per_recipient(self):
+        email = build_personalized_email(
+            "Your code",
+            "emails/otp_login.html",
+            {"valid_minutes": 10},
+            [
+                {"email": "a@example.com", "context": {"user_name": "A & B"}},
+                {"email": "c@example.com", "context": {"otp_code": "123456"}},
+            ],
+        )
+
+        payload = SendgridBackend()._build_sg_mail(email)
+
+        self.assertIn("-user_name-", payload["content"][-1]["value"])
+        substitutions = {
+            personalization["to"][0]["email"]: personalization["substitutions"]
+            for personalization in payload["personalizations"]
+        }
+        self.assertEqual(
+            substitutions,
+            {
+                "a@example.com": {"-otp_code-": "", "-user_name-": "A &amp; B"},
+                "c@example.com": {"-otp_code-": "123456", "-user_name-": ""},
+            },
+        )
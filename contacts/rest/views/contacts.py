@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.pagination import IdCursorPagination
 from contacts.models import Contacts
 from contacts.rest.serializers.contacts import (
     ContactExcelUploadSerializer,
@@ -15,6 +16,7 @@ class ContactListCreateAPIView(generics.ListCreateAPIView):
     queryset = Contacts.objects.all()
     serializer_class = ContactSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
 
 
 class ContactExcelUploadAPIView(APIView):
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from common.emails import EMAIL_BUFFER_KEY, get_email_metrics
+from common.redis_client import get_redis
+
+
+class Command(BaseCommand):
+    help = "Show batched email throughput, batch sizes and latency."
+
+    def handle(self, *args, **options):
+        metrics = get_email_metrics()
+        metrics["queued"] = get_redis().llen(EMAIL_BUFFER_KEY)
+        for key, value in sorted(metrics.items()):
+            self.stdout.write(f"{key}: {value:g}")
@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from common.tasks import send_email_task
+from common.tasks import queue_email
 from core.models import OTPToken, User
 from core.rest.serializers.login import LoginRequestSerializer, OTPVerifySerializer
 
@@ -48,7 +48,7 @@ class LoginRequestView(APIView):
                 "valid_minutes": 10,
             }
 
-            send_email_task.delay(
+            queue_email(
                 subject="Your Login OTP Code",
                 recipient=email,
                 template_name="emails/otp_login.html",
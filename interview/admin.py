@@ -2,10 +2,22 @@ from django.contrib import admin
 
 from .models import (
     AIPhoneCallConfig,
+    ApplicationStatusUpdate,
+    ArchivedConversation,
+    BulkRetryJob,
+    ConversationArchive,
+    ConversationTurn,
     InterviewCallConversation,
+    InterviewDailyStat,
+    InterviewExport,
     InterviewTaken,
     PrimaryQuestion,
     QuestionConfigConnection,
+    RetryPolicy,
+    ScheduledRetry,
+    SMSCampaign,
+    SMSCampaignRecipient,
+    SMSMessage,
 )
 
 admin.site.register(InterviewCallConversation)
@@ -13,3 +25,15 @@ admin.site.register(InterviewTaken)
 admin.site.register(AIPhoneCallConfig)
 admin.site.register(PrimaryQuestion)
 admin.site.register(QuestionConfigConnection)
+admin.site.register(ApplicationStatusUpdate)
+admin.site.register(BulkRetryJob)
+admin.site.register(RetryPolicy)
+admin.site.register(ScheduledRetry)
+admin.site.register(ConversationTurn)
+admin.site.register(ConversationArchive)
+admin.site.register(ArchivedConversation)
+admin.site.register(InterviewDailyStat)
+admin.site.register(InterviewExport)
+admin.site.register(SMSCampaign)
+admin.site.register(SMSCampaignRecipient)
+admin.site.register(SMSMessage)
@@ -0,0 +1,112 @@
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from interview.models import InterviewDailyStat, InterviewTaken
+
+STATS_TABLE = InterviewDailyStat._meta.db_table
+
+UPSERT_STATS_SQL = f"""
+INSERT INTO {STATS_TABLE} (
+    organization_id, job_id, day, ai_decision,
+    call_count, timed_call_count, total_duration_seconds
+)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (organization_id, day, job_id, ai_decision) DO UPDATE SET
+    call_count = {STATS_TABLE}.call_count + EXCLUDED.call_count,
+    timed_call_count = {STATS_TABLE}.timed_call_count + EXCLUDED.timed_call_count,
+    total_duration_seconds =
+        {STATS_TABLE}.total_duration_seconds + EXCLUDED.total_duration_seconds
+"""
+
+
+def get_stats_key(interview):
+    return (
+        interview.organization_id,
+        interview.job_id or 0,
+        interview.get_stats_day(),
+        interview.ai_decision or "",
+    )
+
+
+def get_stats_delta(interview, sign=1):
+    """The contribution of one interview to its rollup row, negated with sign=-1."""
+    duration = interview.call_duration_seconds
+    return get_stats_key(interview), (
+        sign,
+        sign if duration is not None else 0,
+        sign * (duration or 0),
+    )
+
+
+def apply_stats_deltas(deltas):
+    """
+    Add (key, (calls, timed calls, seconds)) deltas to the rollups. Deltas for
+    the same row are merged first, so each row is written once.
+    """
+    merged = {}
+    for key, values in deltas:
+        current = merged.get(key, (0, 0, 0))
+        merged[key] = tuple(a + b for a, b in zip(current, values))
+
+    rows = [
+        (*key, *values)
+        for key, values in sorted(merged.items(), key=lambda item: str(item[0]))
+        if any(values)
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(UPSERT_STATS_SQL, rows)
+
+
+def record_interview_stats(interviews, previous=None):
+    """
+    Count newly saved interviews in the rollups. previous holds the stats
+    deltas of updated interviews as they were before the update, which are
+    taken back out.
+    """
+    deltas = [get_stats_delta(interview) for interview in interviews]
+    for key, values in previous or []:
+        deltas.append((key, tuple(-value for value in values)))
+    apply_stats_deltas(deltas)
+
+
+def rebuild_interview_stats(organization_id=None):
+    """Recompute the rollups from InterviewTaken, for one or all organizations."""
+    interviews = InterviewTaken.objects.all()
+    stats = InterviewDailyStat.objects.all()
+    if organization_id:
+        interviews = interviews.filter(organization_id=organization_id)
+        stats = stats.filter(organization_id=organization_id)
+
+    rows = (
+        interviews.annotate(
+            stats_day=TruncDate(Coalesce("started_at", "created_at"), tzinfo=None)
+        )
+        .order_by()
+        .values("organization_id", "job_id", "stats_day", "ai_decision")
+        .annotate(
+            call_count=Count("id"),
+            timed_call_count=Count("call_duration_seconds"),
+            total_duration_seconds=Coalesce(Sum("call_duration_seconds"), 0),
+        )
+    )
+    with transaction.atomic():
+        stats.delete()
+        apply_stats_deltas(
+            (
+                (
+                    row["organization_id"],
+                    row["job_id"] or 0,
+                    row["stats_day"],
+                    row["ai_decision"] or "",
+                ),
+                (
+                    row["call_count"],
+                    row["timed_call_count"],
+                    row["total_duration_seconds"],
+                ),
+            )
+            for row in rows.iterator()
+        )
@@ -0,0 +1,294 @@
+"""
+Monthly partitions of interview_conversations and their archival.
+
+Each month of conversations lives in its own partition named
+interview_conversations_pYYYYMM. Old partitions are written to the default
+storage as gzipped JSONL (one file per organization, one gzip member per
+conversation), then detached and dropped, so everyday queries only touch the
+recent months still attached to the table. An ArchivedConversation row per
+call records where its member is, to rehydrate a transcript with one read.
+"""
+
+import gzip
+import re
+import tempfile
+from datetime import datetime, timezone
+
+import orjson
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone as django_timezone
+
+from interview.models import (
+    ArchivedConversation,
+    ConversationArchive,
+    ConversationTurn,
+    InterviewCallConversation,
+)
+from interview.rest.serializers.conversations import (
+    InterviewCallConversationSerializer,
+)
+
+CONVERSATION_TABLE = InterviewCallConversation._meta.db_table
+# Claims every live call_sid, see migration 0017
+CALL_SID_TABLE = "interview_conversation_call_sids"
+PARTITION_NAME_PATTERN = re.compile(rf"^{CONVERSATION_TABLE}_p(\d{{4}})(\d{{2}})$")
+PARTITION_MONTHS_AHEAD = 2
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_PREFIX = "conversation_archives"
+ARCHIVED_CONVERSATION_CACHE_TIMEOUT = 60 * 60
+
+
+def get_month_start(moment):
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month_start, months):
+    year, month = divmod(month_start.month - 1 + months, 12)
+    return month_start.replace(year=month_start.year + year, month=month + 1)
+
+
+def get_partition_name(month_start):
+    return f"{CONVERSATION_TABLE}_p{month_start:%Y%m}"
+
+
+def list_partitions():
+    """Return {partition name: (month start, attached)} for every partition table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, i.inhparent IS NOT NULL
+            FROM pg_class c
+            LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+            WHERE c.relkind = 'r' AND c.relname LIKE %s
+            """,
+            [f"{CONVERSATION_TABLE}_p%"],
+        )
+        rows = cursor.fetchall()
+
+    partitions = {}
+    for name, attached in rows:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            month_start = datetime(
+                int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc
+            )
+            partitions[name] = (month_start, attached)
+    return partitions
+
+
+def create_conversation_partitions(months_ahead=PARTITION_MONTHS_AHEAD):
+    """
+    Create the partitions for the current month and the next ones, so rows
+    never have to fall back to the default partition.
+    """
+    current = get_month_start(django_timezone.now())
+    created = []
+    existing = list_partitions()
+    with connection.cursor() as cursor:
+        for i in range(months_ahead + 1):
+            month_start = add_months(current, i)
+            name = get_partition_name(month_start)
+            if name in existing:
+                continue
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF '
+                f'"{CONVERSATION_TABLE}" FOR VALUES FROM (%s) TO (%s)',
+                [month_start, add_months(month_start, 1)],
+            )
+            created.append(name)
+    return created
+
+
+def get_archive_path(partition_name, organization_id):
+    return f"{ARCHIVE_PREFIX}/{partition_name}/{organization_id}.jsonl.gz"
+
+
+def write_archive_file(path, records):
+    """
+    Write records as gzipped JSONL, each record in its own gzip member, and
+    return the stored path with the (offset, length) of every member. The
+    file still reads as one gzip stream, and a record can be read back
+    without decompressing the others.
+    """
+    spans = []
+    with tempfile.TemporaryFile() as archive_file:
+        for record in records:
+            member = gzip.compress(orjson.dumps(record) + b"\n")
+            spans.append((archive_file.tell(), len(member)))
+            archive_file.write(member)
+        size = archive_file.tell()
+        archive_file.seek(0)
+        # Archiving a partition again replaces the earlier, partial file
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        path = default_storage.save(path, File(archive_file))
+
+    if default_storage.size(path) != size:
+        raise ValueError(f"Archive file {path} was not written completely")
+    return path, spans
+
+
+def iter_partition_rows(partition_name, batch_size=ARCHIVE_BATCH_SIZE):
+    last = (0, 0)
+    while True:
+        rows = list(
+            InterviewCallConversation.objects.raw(
+                f'SELECT * FROM "{partition_name}" '
+                f"WHERE (organization_id, id) > (%s, %s) "
+                f"ORDER BY organization_id, id LIMIT %s",
+                [*last, batch_size],
+            )
+        )
+        if not rows:
+            return
+        yield from rows
+        last = (rows[-1].organization_id, rows[-1].id)
+
+
+def archive_partition(partition_name, month_start):
+    """
+    Move a monthly partition's conversations to the default storage, then
+    detach and drop it. The partition stays attached until every archive
+    file is written, so a failure leaves its conversations readable. Safe
+    to run again for a partition that failed half way.
+    """
+    partitions = list_partitions()
+    if partition_name not in partitions:
+        return None
+
+    archive, _ = ConversationArchive.objects.get_or_create(
+        partition_name=partition_name,
+        defaults={
+            "period_start": month_start,
+            "period_end": add_months(month_start, 1),
+        },
+    )
+    with connection.cursor() as cursor:
+        # Lets the export below walk the rows organization by organization
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{partition_name}_archive_idx" '
+            f'ON "{partition_name}" (organization_id, id)'
+        )
+
+    count = 0
+    organization_id = None
+    records, stubs = [], []
+
+    def flush():
+        if organization_id is None:
+            return
+        path, spans = write_archive_file(
+            get_archive_path(partition_name, organization_id), records
+        )
+        for stub, (offset, length) in zip(stubs, spans):
+            stub.storage_path = path
+            stub.archive_offset = offset
+            stub.archive_length = length
+        ArchivedConversation.objects.bulk_create(
+            stubs,
+            batch_size=ARCHIVE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["call_sid"],
+            update_fields=[
+                "archive",
+                "storage_path",
+                "archive_offset",
+                "archive_length",
+                "updated_at",
+            ],
+        )
+
+    for conversation in iter_partition_rows(partition_name):
+        if conversation.organization_id != organization_id:
+            flush()
+            organization_id = conversation.organization_id
+            records, stubs = [], []
+
+        records.append(InterviewCallConversationSerializer(conversation).data)
+        stubs.append(
+            ArchivedConversation(
+                archive=archive,
+                organization_id=conversation.organization_id,
+                interview_id=conversation.interview_id,
+                call_sid=conversation.call_sid,
+            )
+        )
+        count += 1
+    flush()
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if partitions[partition_name][1]:
+                cursor.execute(
+                    f'ALTER TABLE "{CONVERSATION_TABLE}" '
+                    f'DETACH PARTITION "{partition_name}"'
+                )
+            # Nothing can write to the partition once it is detached
+            cursor.execute(f'SELECT count(*) FROM "{partition_name}"')
+            if cursor.fetchone()[0] != count:
+                raise ValueError(
+                    f"{partition_name} changed while it was archived, run it again"
+                )
+            # A detached partition has no triggers left to release its call_sids
+            cursor.execute(
+                f"DELETE FROM {CALL_SID_TABLE} WHERE call_sid IN "
+                f'(SELECT call_sid FROM "{partition_name}")'
+            )
+            cursor.execute(f'DROP TABLE "{partition_name}"')
+        ConversationTurn.objects.filter(
+            call_sid__in=archive.conversations.values("call_sid")
+        ).delete()
+        archive.conversation_count = count
+        archive.completed_at = django_timezone.now()
+        archive.save(update_fields=["conversation_count", "completed_at", "updated_at"])
+
+    print(f"Archived {count} conversations from {partition_name}")
+    return archive
+
+
+def archive_conversation_partitions(keep_months):
+    """Archive every partition older than the latest keep_months months."""
+    cutoff = add_months(get_month_start(django_timezone.now()), -keep_months + 1)
+    archives = []
+    for name, (month_start, _) in sorted(list_partitions().items()):
+        if month_start < cutoff:
+            archives.append(archive_partition(name, month_start))
+    return archives
+
+
+def find_archived_record(archive_file, call_sid):
+    needle = call_sid.encode()
+    with gzip.GzipFile(fileobj=archive_file) as lines:
+        for line in lines:
+            if needle not in line:
+                continue
+            data = orjson.loads(line)
+            if data.get("call_sid") == call_sid:
+                return data
+    return None
+
+
+def load_archived_conversation(archived):
+    """Read an archived conversation back from its archive file."""
+    cache_key = f"archived_conversation:{archived.call_sid}"
+    record = cache.get(cache_key)
+    if record is not None:
+        return record
+
+    with default_storage.open(archived.storage_path, "rb") as archive_file:
+        if archived.archive_offset is not None:
+            archive_file.seek(archived.archive_offset)
+            member = archive_file.read(archived.archive_length)
+            record = orjson.loads(gzip.decompress(member))
+        else:
+            # Archived before member offsets were stored
+            record = find_archived_record(archive_file, archived.call_sid)
+
+    if record is not None:
+        record["archived"] = True
+        cache.set(cache_key, record, ARCHIVED_CONVERSATION_CACHE_TIMEOUT)
+    return record
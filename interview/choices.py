@@ -11,3 +11,59 @@ class ProgressStatus(models.TextChoices):
     INITIATED = "INITIATED", "Initiated"
     IN_PROGRESS = "IN_PROGRESS", "In_progress"
     COMPLETED = "COMPLETED", "Completed"
+
+
+class RetryJobStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    COMPLETED = "COMPLETED", "Completed"
+    FAILED = "FAILED", "Failed"
+
+
+class TranscriptStorage(models.TextChoices):
+    PLAIN = "PLAIN", "Plain"
+    COMPRESSED = "COMPRESSED", "Compressed"
+    TURNS = "TURNS", "Turns"
+
+
+class ExportFormat(models.TextChoices):
+    CSV = "CSV", "CSV"
+    XLSX = "XLSX", "Excel"
+
+
+class ExportStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    COMPLETED = "COMPLETED", "Completed"
+    FAILED = "FAILED", "Failed"
+
+
+class CampaignSource(models.TextChoices):
+    INTERVIEWS = "INTERVIEWS", "Interviews"
+    CONTACTS = "CONTACTS", "Contacts"
+
+
+class CampaignStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    RUNNING = "RUNNING", "Running"
+    COMPLETED = "COMPLETED", "Completed"
+    CANCELLED = "CANCELLED", "Cancelled"
+    FAILED = "FAILED", "Failed"
+
+
+class RecipientStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+    SKIPPED = "SKIPPED", "Skipped"
+
+
+class SMSStatus(models.TextChoices):
+    ACCEPTED = "accepted", "Accepted"
+    QUEUED = "queued", "Queued"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    DELIVERED = "delivered", "Delivered"
+    UNDELIVERED = "undelivered", "Undelivered"
+    FAILED = "failed", "Failed"
+    READ = "read", "Read"
@@ -0,0 +1,31 @@
+import math
+import re
+
+CLOCK_DURATION_PATTERN = re.compile(r"^(?:(\d+):)?(\d+):(\d+)$")
+
+
+def parse_call_duration(value):
+    """
+    Convert a call duration as reported by the calling service, either
+    seconds ("95", "95.4", "95s") or a clock value ("1:35", "00:01:35"),
+    into whole seconds. Returns None when the value can't be read.
+    """
+    if value is None:
+        return None
+    value = str(value).strip().lower().removesuffix("s").strip()
+    if not value:
+        return None
+
+    match = CLOCK_DURATION_PATTERN.match(value)
+    if match:
+        hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return hours * 3600 + minutes * 60 + seconds
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    # float() also reads "nan" and "inf", which round() can't convert
+    if not math.isfinite(seconds) or seconds < 0:
+        return None
+    return round(seconds)
@@ -0,0 +1,219 @@
+"""
+Interview result exports.
+
+Rows are read with a server side cursor and written out one at a time, so
+an export of any size runs in constant memory. Transcripts are loaded per
+chunk of interviews with a single query.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from uuid import UUID
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from openpyxl import Workbook
+
+from interview.choices import ExportFormat, TranscriptStorage
+from interview.models import (
+    ConversationTurn,
+    InterviewCallConversation,
+    InterviewExport,
+    InterviewTaken,
+)
+from interview.transcripts import render_transcript_text
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_PREFIX = "interview_exports"
+# Excel refuses cells longer than this
+XLSX_CELL_LIMIT = 32767
+# The row count of a running export is saved every this many rows
+EXPORT_PROGRESS_INTERVAL = 1000
+# Cells starting with these are read as formulas by spreadsheet apps
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+EXPORT_COLUMNS = [
+    ("Interview ID", "uid"),
+    ("Candidate Name", "candidate_name"),
+    ("Candidate Email", "candidate_email"),
+    ("Candidate Phone", "candidate_phone"),
+    ("Candidate ID", "candidate_id"),
+    ("Application ID", "application_id"),
+    ("Job ID", "job_id"),
+    ("Job Title", "job_title"),
+    ("AI Decision", "ai_decision"),
+    ("Interview Status", "interview_status"),
+    ("Call Status", "call_status"),
+    ("Call Duration (seconds)", "call_duration_seconds"),
+    ("Disconnection Reason", "disconnection_reason"),
+    ("Started At", "started_at"),
+    ("Ended At", "ended_at"),
+    ("Created At", "created_at"),
+]
+
+
+def get_export_queryset(organization_id, filters):
+    queryset = InterviewTaken.objects.filter(organization_id=organization_id)
+    if filters.get("start"):
+        queryset = queryset.filter(created_at__date__gte=filters["start"])
+    if filters.get("end"):
+        queryset = queryset.filter(created_at__date__lte=filters["end"])
+    if filters.get("job_id"):
+        queryset = queryset.filter(job_id=filters["job_id"])
+    if filters.get("ai_decision"):
+        queryset = queryset.filter(ai_decision=filters["ai_decision"])
+    fields = [field for _, field in EXPORT_COLUMNS]
+    return queryset.only("id", *fields).order_by("created_at", "id")
+
+
+def get_transcripts(interview_ids):
+    conversations = InterviewCallConversation.objects.filter(
+        interview_id__in=interview_ids
+    ).only(
+        "interview_id",
+        "call_sid",
+        "storage_format",
+        "conversation_text",
+        "conversation_data",
+    )
+    conversations = list(conversations)
+    turn_messages = ConversationTurn.get_messages_for(
+        [
+            conversation.call_sid
+            for conversation in conversations
+            if conversation.storage_format == TranscriptStorage.TURNS
+        ]
+    )
+
+    transcripts = {}
+    for conversation in conversations:
+        if conversation.storage_format == TranscriptStorage.TURNS:
+            text = render_transcript_text(turn_messages.get(conversation.call_sid))
+        elif conversation.storage_format == TranscriptStorage.PLAIN:
+            # transcript would load the deferred conversation_json row by row
+            text = conversation.conversation_text
+        else:
+            text = conversation.transcript[1]
+        transcripts[conversation.interview_id] = text
+    return transcripts
+
+
+def escape_formula(value):
+    """Keep spreadsheet apps from running candidate data as a formula."""
+    if value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, str):
+        return escape_formula(value)
+    return value
+
+
+def build_rows(interviews, include_transcripts):
+    transcripts = {}
+    if include_transcripts:
+        transcripts = get_transcripts([interview.id for interview in interviews])
+    for interview in interviews:
+        row = [format_value(getattr(interview, field)) for _, field in EXPORT_COLUMNS]
+        if include_transcripts:
+            row.append(escape_formula(transcripts.get(interview.id) or ""))
+        yield row
+
+
+def iter_export_rows(organization_id, filters, include_transcripts=False):
+    """Yield the header and then one row per interview."""
+    header = [title for title, _ in EXPORT_COLUMNS]
+    if include_transcripts:
+        header.append("Transcript")
+    yield header
+
+    chunk = []
+    queryset = get_export_queryset(organization_id, filters)
+    for interview in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk.append(interview)
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield from build_rows(chunk, include_transcripts)
+            chunk = []
+    yield from build_rows(chunk, include_transcripts)
+
+
+class Echo:
+    """A file-like object that hands back what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_csv(rows, output):
+    text_output = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    writer = csv.writer(text_output)
+    for row in rows:
+        writer.writerow(row)
+    text_output.flush()
+    text_output.detach()
+
+
+def write_xlsx(rows, output):
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Interviews")
+    for row in rows:
+        worksheet.append(
+            [
+                value[:XLSX_CELL_LIMIT] if isinstance(value, str) else value
+                for value in row
+            ]
+        )
+    workbook.save(output)
+
+
+def get_export_path(export):
+    extension = "xlsx" if export.format == ExportFormat.XLSX else "csv"
+    return f"{EXPORT_PREFIX}/{export.organization_id}/{export.uid}.{extension}"
+
+
+def write_export(export):
+    """
+    Write an InterviewExport to the default storage, returning the row count.
+    The count is saved as the export goes, for clients following its progress.
+    """
+    row_count = 0
+
+    def rows():
+        nonlocal row_count
+        for i, row in enumerate(
+            iter_export_rows(
+                export.organization_id, export.filters, export.include_transcripts
+            )
+        ):
+            row_count = i
+            if i and i % EXPORT_PROGRESS_INTERVAL == 0:
+                InterviewExport.objects.filter(id=export.id).update(
+                    row_count=i, updated_at=timezone.now()
+                )
+            yield row
+
+    with tempfile.TemporaryFile() as output:
+        if export.format == ExportFormat.XLSX:
+            write_xlsx(rows(), output)
+        else:
+            write_csv(rows(), output)
+        output.seek(0)
+        export.file_path = default_storage.save(get_export_path(export), File(output))
+    return row_count
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from interview.archive import (
+    archive_conversation_partitions,
+    create_conversation_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive conversation partitions older than --keep-months to the "
+        "default storage as gzipped JSONL, then detach and drop them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            default=12,
+            help="Number of recent months, including the current one, to keep",
+        )
+
+    def handle(self, *args, **options):
+        if options["keep_months"] < 1:
+            raise CommandError("--keep-months must be at least 1")
+
+        for name in create_conversation_partitions():
+            self.stdout.write(f"Created partition {name}")
+
+        archives = archive_conversation_partitions(options["keep_months"])
+        for archive in archives:
+            if archive:
+                self.stdout.write(
+                    f"Archived {archive.conversation_count} conversations "
+                    f"from {archive.partition_name}"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Archived {len(archives)} partitions"))
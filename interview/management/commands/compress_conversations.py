@@ -0,0 +1,68 @@
+import time
+
+from django.contrib.postgres.search import SearchVector
+from django.core.management.base import BaseCommand
+
+from interview.choices import TranscriptStorage
+from interview.models import TRANSCRIPT_SEARCH_CONFIG, InterviewCallConversation
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert conversations stored as plain text and JSON into the "
+        "compressed transcript format, in batches, indexing them for search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches to limit database load",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = InterviewCallConversation.objects.filter(
+            storage_format=TranscriptStorage.PLAIN
+        ).only("id", "conversation_text", "conversation_json")
+
+        last_id = 0
+        converted = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+            if not batch:
+                break
+
+            # Index the text while it is still stored as plain text
+            InterviewCallConversation.objects.filter(
+                id__in=[conversation.id for conversation in batch]
+            ).update(
+                search_vector=SearchVector(
+                    "conversation_text", config=TRANSCRIPT_SEARCH_CONFIG
+                )
+            )
+            for conversation in batch:
+                conversation.set_transcript(
+                    conversation.conversation_json, conversation.conversation_text
+                )
+            InterviewCallConversation.objects.bulk_update(
+                batch,
+                [
+                    "conversation_data",
+                    "conversation_text",
+                    "conversation_json",
+                    "storage_format",
+                ],
+            )
+
+            last_id = batch[-1].id
+            converted += len(batch)
+            self.stdout.write(f"Compressed {converted} conversations")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done, compressed {converted} conversations")
+        )
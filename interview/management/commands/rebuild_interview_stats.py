@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from interview.analytics import rebuild_interview_stats
+from interview.durations import parse_call_duration
+from interview.models import InterviewTaken
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in numeric call durations and rebuild the daily interview "
+        "rollups from InterviewTaken."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--organization-id", type=int)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        interviews = InterviewTaken.objects.filter(
+            call_duration__isnull=False, call_duration_seconds__isnull=True
+        )
+        if options["organization_id"]:
+            interviews = interviews.filter(organization_id=options["organization_id"])
+        interviews = interviews.only("id", "call_duration")
+
+        last_id = 0
+        parsed = 0
+        while True:
+            batch = list(
+                interviews.filter(id__gt=last_id).order_by("id")[
+                    : options["batch_size"]
+                ]
+            )
+            if not batch:
+                break
+            for interview in batch:
+                interview.call_duration_seconds = parse_call_duration(
+                    interview.call_duration
+                )
+            InterviewTaken.objects.bulk_update(batch, ["call_duration_seconds"])
+            last_id = batch[-1].id
+            parsed += len(batch)
+        self.stdout.write(f"Parsed {parsed} call durations")
+
+        rebuild_interview_stats(options["organization_id"])
+        self.stdout.write(self.style.SUCCESS("Rebuilt interview stats"))
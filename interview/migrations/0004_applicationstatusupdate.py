@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:20
+
+import dirtyfields.dirtyfields
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0003_interviewtaken_from_number"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationStatusUpdate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uid",
+                    models.UUIDField(
+                        db_index=True, default=uuid.uuid4, editable=False, unique=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("application_id", models.PositiveIntegerField()),
+                (
+                    "status_id",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Empty means the configured status_when_call_is_placed",
+                        null=True,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("next_attempt_at", models.DateTimeField()),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="organizations.organization",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["organization", "next_attempt_at"],
+                        name="interview_a_organiz_7ea194_idx",
+                    )
+                ],
+                "unique_together": {("organization", "application_id")},
+            },
+            bases=(dirtyfields.dirtyfields.DirtyFieldsMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0006_retrypolicy_scheduledretry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interviewcallconversation",
+            name="conversation_data",
+            field=models.BinaryField(
+                blank=True, help_text="Compressed conversation", null=True
+            ),
+        ),
+        # Existing rows hold plain transcripts until compress_conversations runs
+        migrations.AddField(
+            model_name="interviewcallconversation",
+            name="storage_format",
+            field=models.CharField(
+                choices=[("PLAIN", "Plain"), ("COMPRESSED", "Compressed")],
+                default="PLAIN",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="interviewcallconversation",
+            name="storage_format",
+            field=models.CharField(
+                choices=[("PLAIN", "Plain"), ("COMPRESSED", "Compressed")],
+                default="COMPRESSED",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="interviewcallconversation",
+            name="conversation_json",
+            field=models.JSONField(
+                blank=True,
+                help_text="Conversation messages in JSON format, empty for compressed rows",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="interviewcallconversation",
+            name="conversation_text",
+            field=models.TextField(
+                blank=True,
+                help_text="Full conversation in text format, empty for compressed rows",
+                null=True,
+            ),
+        ),
+    ]
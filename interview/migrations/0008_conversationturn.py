@@ -0,0 +1,80 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:27
+
+import dirtyfields.dirtyfields
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0007_compressed_conversation_storage"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="interviewcallconversation",
+            name="storage_format",
+            field=models.CharField(
+                choices=[
+                    ("PLAIN", "Plain"),
+                    ("COMPRESSED", "Compressed"),
+                    ("TURNS", "Turns"),
+                ],
+                default="COMPRESSED",
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ConversationTurn",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uid",
+                    models.UUIDField(
+                        db_index=True, default=uuid.uuid4, editable=False, unique=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("call_sid", models.CharField(max_length=100)),
+                (
+                    "seq",
+                    models.PositiveIntegerField(
+                        help_text="Position of the turn in the call"
+                    ),
+                ),
+                ("role", models.CharField(max_length=50)),
+                ("content", models.TextField()),
+                ("spoken_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="organizations.organization",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "interview_conversation_turns",
+                "ordering": ["call_sid", "seq"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("call_sid", "seq"),
+                        name="conversation_turn_call_seq_uniq",
+                    )
+                ],
+            },
+            bases=(dirtyfields.dirtyfields.DirtyFieldsMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:29
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0008_conversationturn"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interviewcallconversation",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interviewcallconversation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="conversation_search_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,135 @@
+from django.db import migrations
+
+# Rebuild interview_conversations as a table partitioned by month on
+# created_at. Postgres requires unique constraints on a partitioned table to
+# include the partition key, so the primary key and the uid and call_sid
+# constraints now cover created_at as well. Rows outside of the monthly
+# partitions land in the default partition.
+PARTITION_CONVERSATIONS_SQL = """
+ALTER TABLE interview_conversations RENAME TO interview_conversations_unpartitioned;
+
+CREATE SEQUENCE interview_conversations_pk_seq;
+
+CREATE TABLE interview_conversations (
+    LIKE interview_conversations_unpartitioned INCLUDING DEFAULTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE interview_conversations
+    ALTER COLUMN id SET DEFAULT nextval('interview_conversations_pk_seq');
+ALTER SEQUENCE interview_conversations_pk_seq OWNED BY interview_conversations.id;
+
+CREATE TABLE interview_conversations_default
+    PARTITION OF interview_conversations DEFAULT;
+
+DO $$
+DECLARE
+    month_start timestamptz;
+    last_month timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC')
+        AT TIME ZONE 'UTC' + interval '2 months';
+BEGIN
+    SELECT coalesce(
+        date_trunc('month', min(created_at) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+    )
+    INTO month_start
+    FROM interview_conversations_unpartitioned;
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF interview_conversations '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'interview_conversations_p' || to_char(month_start AT TIME ZONE 'UTC', 'YYYYMM'),
+            month_start,
+            month_start + interval '1 month'
+        );
+        month_start := month_start + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO interview_conversations
+SELECT * FROM interview_conversations_unpartitioned;
+
+SELECT setval(
+    'interview_conversations_pk_seq',
+    coalesce((SELECT max(id) FROM interview_conversations), 0) + 1,
+    false
+);
+
+DROP TABLE interview_conversations_unpartitioned;
+
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_pkey PRIMARY KEY (id, created_at);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_uid_created_at_uniq
+    UNIQUE (uid, created_at);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_call_sid_created_at_uniq
+    UNIQUE (call_sid, created_at);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_organization_id_fk
+    FOREIGN KEY (organization_id) REFERENCES organizations_organization (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_interview_id_fk
+    FOREIGN KEY (interview_id) REFERENCES interview_interviewtaken (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX interview_conversations_organization_id_idx
+    ON interview_conversations (organization_id);
+CREATE INDEX interview_conversations_interview_id_idx
+    ON interview_conversations (interview_id);
+CREATE INDEX conversation_search_idx
+    ON interview_conversations USING gin (search_vector);
+"""
+
+# Back to a plain table. Detached partitions that were not archived yet are
+# left alone.
+UNPARTITION_CONVERSATIONS_SQL = """
+ALTER TABLE interview_conversations RENAME TO interview_conversations_partitioned;
+ALTER SEQUENCE interview_conversations_pk_seq OWNED BY NONE;
+
+CREATE TABLE interview_conversations (
+    LIKE interview_conversations_partitioned INCLUDING DEFAULTS
+);
+ALTER SEQUENCE interview_conversations_pk_seq OWNED BY interview_conversations.id;
+
+INSERT INTO interview_conversations
+SELECT * FROM interview_conversations_partitioned;
+
+DROP TABLE interview_conversations_partitioned CASCADE;
+
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_pkey PRIMARY KEY (id);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_uid_uniq UNIQUE (uid);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_call_sid_uniq UNIQUE (call_sid);
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_organization_id_fk
+    FOREIGN KEY (organization_id) REFERENCES organizations_organization (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE interview_conversations
+    ADD CONSTRAINT interview_conversations_interview_id_fk
+    FOREIGN KEY (interview_id) REFERENCES interview_interviewtaken (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX interview_conversations_organization_id_idx
+    ON interview_conversations (organization_id);
+CREATE INDEX interview_conversations_interview_id_idx
+    ON interview_conversations (interview_id);
+CREATE INDEX conversation_search_idx
+    ON interview_conversations USING gin (search_vector);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0010_conversationarchive"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            PARTITION_CONVERSATIONS_SQL, reverse_sql=UNPARTITION_CONVERSATIONS_SQL
+        ),
+    ]
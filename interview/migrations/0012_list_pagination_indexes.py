@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0011_partition_conversations"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interviewcallconversation",
+            index=models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="conversation_org_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interviewtaken",
+            index=models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="interview_org_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0012_list_pagination_indexes"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="interviewtaken",
+            name="call_duration_seconds",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="InterviewDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "job_id",
+                    models.PositiveIntegerField(default=0, help_text="0 when unknown"),
+                ),
+                ("day", models.DateField()),
+                (
+                    "ai_decision",
+                    models.CharField(blank=True, default="", max_length=100),
+                ),
+                ("call_count", models.IntegerField(default=0)),
+                (
+                    "timed_call_count",
+                    models.IntegerField(
+                        default=0, help_text="Calls with a known duration"
+                    ),
+                ),
+                ("total_duration_seconds", models.BigIntegerField(default=0)),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="organizations.organization",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "interview_daily_stats",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("organization", "day", "job_id", "ai_decision"),
+                        name="interview_daily_stat_key_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
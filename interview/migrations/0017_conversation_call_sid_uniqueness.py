@@ -0,0 +1,70 @@
+from django.db import migrations, models
+
+# A unique constraint on the partitioned table has to include created_at, so
+# call_sid uniqueness across partitions is enforced by claiming every call_sid
+# in a plain table from a trigger. A second insert of a call_sid fails with a
+# unique violation, like the constraint did before partitioning.
+CLAIM_CALL_SIDS_SQL = """
+CREATE TABLE interview_conversation_call_sids (
+    call_sid varchar(100) PRIMARY KEY
+);
+
+INSERT INTO interview_conversation_call_sids (call_sid)
+SELECT DISTINCT call_sid FROM interview_conversations
+ON CONFLICT DO NOTHING;
+
+CREATE FUNCTION interview_conversations_claim_call_sid() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE'
+        OR (TG_OP = 'UPDATE' AND NEW.call_sid IS DISTINCT FROM OLD.call_sid)
+    THEN
+        DELETE FROM interview_conversation_call_sids WHERE call_sid = OLD.call_sid;
+    END IF;
+    IF TG_OP = 'INSERT'
+        OR (TG_OP = 'UPDATE' AND NEW.call_sid IS DISTINCT FROM OLD.call_sid)
+    THEN
+        INSERT INTO interview_conversation_call_sids (call_sid)
+        VALUES (NEW.call_sid);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER interview_conversations_claim_call_sid
+    AFTER INSERT OR UPDATE OF call_sid OR DELETE ON interview_conversations
+    FOR EACH ROW EXECUTE FUNCTION interview_conversations_claim_call_sid();
+"""
+
+RELEASE_CALL_SIDS_SQL = """
+DROP TRIGGER interview_conversations_claim_call_sid ON interview_conversations;
+DROP FUNCTION interview_conversations_claim_call_sid();
+DROP TABLE interview_conversation_call_sids;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0016_smsmessage"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CLAIM_CALL_SIDS_SQL, reverse_sql=RELEASE_CALL_SIDS_SQL),
+        # The constraints created in 0011, only the model state is updated
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="interviewcallconversation",
+                    name="call_sid",
+                    field=models.CharField(max_length=100),
+                ),
+                migrations.AddConstraint(
+                    model_name="interviewcallconversation",
+                    constraint=models.UniqueConstraint(
+                        fields=("call_sid", "created_at"),
+                        name="interview_conversations_call_sid_created_at_uniq",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0017_conversation_call_sid_uniqueness"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedconversation",
+            name="archive_length",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="archivedconversation",
+            name="archive_offset",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Where the conversation's gzip member starts",
+                null=True,
+            ),
+        ),
+    ]
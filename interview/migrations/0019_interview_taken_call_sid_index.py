@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("interview", "0018_archived_conversation_offsets"),
+        ("organizations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interviewtaken",
+            index=models.Index(
+                fields=["organization", "call_sid"], name="interview_org_call_sid_idx"
+            ),
+        ),
+    ]
@@ -1,11 +1,41 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.cache import cache
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 from common.choices import Status
 from common.models import BaseModelWithUID
+from contacts.models import Contacts
 from organizations.models import Organization, OrganizationPlatform
 from phone_number.models import TwilioPhoneNumber
 
-from .choices import InterviewType, ProgressStatus
+from .choices import (
+    CampaignSource,
+    CampaignStatus,
+    ExportFormat,
+    ExportStatus,
+    InterviewType,
+    ProgressStatus,
+    RecipientStatus,
+    RetryJobStatus,
+    SMSStatus,
+    TranscriptStorage,
+)
+from .durations import parse_call_duration
+from .transcripts import (
+    get_transcript_cache_key,
+    pack_transcript,
+    render_transcript_text,
+    unpack_transcript,
+)
+
+TRANSCRIPT_TEXT_CACHE_TIMEOUT = 60 * 60
+TRANSCRIPT_SEARCH_CONFIG = "english"
 
 
 class InterviewTaken(BaseModelWithUID):
@@ -24,6 +54,7 @@ class InterviewTaken(BaseModelWithUID):
     ended_at = models.DateTimeField(null=True, blank=True)
     call_sid = models.CharField(max_length=100, null=True, blank=True)
     call_duration = models.CharField(max_length=100, null=True, blank=True)
+    call_duration_seconds = models.PositiveIntegerField(null=True, blank=True)
     call_status = models.CharField(max_length=100, null=True, blank=True)
     disconnection_reason = models.CharField(max_length=100, null=True, blank=True)
     from_number = models.CharField(max_length=255, null=True, blank=True)
@@ -38,16 +69,42 @@ class InterviewTaken(BaseModelWithUID):
         default=ProgressStatus.COMPLETED,
     )
 
+    class Meta(BaseModelWithUID.Meta):
+        indexes = [
+            models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="interview_org_created_idx",
+            ),
+            models.Index(
+                fields=["organization", "call_sid"],
+                name="interview_org_call_sid_idx",
+            ),
+        ]
+
     def __str__(self):
         return (
             f"candidate_id: {self.candidate_id} - application_id: {self.application_id}"
         )
 
+    def save(self, *args, **kwargs):
+        self.call_duration_seconds = parse_call_duration(self.call_duration)
+        super().save(*args, **kwargs)
+
+    def get_stats_day(self):
+        return (self.started_at or self.created_at).astimezone(ZoneInfo("UTC")).date()
+
 
 class InterviewCallConversation(BaseModelWithUID):
+    """
+    The table is partitioned by month on created_at (see interview/archive.py),
+    so in the database uid and call_sid are only unique together with
+    created_at. call_sid is kept unique across partitions by a trigger that
+    claims it in the unpartitioned interview_conversation_call_sids table.
+    """
+
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
     interview = models.ForeignKey(InterviewTaken, on_delete=models.CASCADE)
-    call_sid = models.CharField(max_length=100, unique=True)
+    call_sid = models.CharField(max_length=100)
     application_id = models.PositiveIntegerField()
     candidate_id = models.PositiveIntegerField()
     candidate_name = models.CharField(max_length=100, null=True, blank=True)
@@ -55,11 +112,26 @@ class InterviewCallConversation(BaseModelWithUID):
     candidate_phone = models.CharField(max_length=100, null=True, blank=True)
     job_id = models.PositiveIntegerField()
 
-    conversation_text = models.TextField(help_text="Full conversation in text format")
+    conversation_text = models.TextField(
+        null=True,
+        blank=True,
+        help_text="Full conversation in text format, empty for compressed rows",
+    )
     conversation_json = models.JSONField(
-        help_text="Conversation messages in JSON format"
+        null=True,
+        blank=True,
+        help_text="Conversation messages in JSON format, empty for compressed rows",
+    )
+    conversation_data = models.BinaryField(
+        null=True, blank=True, help_text="Compressed conversation"
+    )
+    storage_format = models.CharField(
+        max_length=20,
+        choices=TranscriptStorage.choices,
+        default=TranscriptStorage.COMPRESSED,
     )
     message_count = models.IntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     started_at = models.DateTimeField()
     ended_at = models.DateTimeField()
@@ -67,10 +139,186 @@ class InterviewCallConversation(BaseModelWithUID):
     class Meta:
         db_table = "interview_conversations"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="conversation_search_idx"),
+            models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="conversation_org_created_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["call_sid", "created_at"],
+                name="interview_conversations_call_sid_created_at_uniq",
+            )
+        ]
 
     def __str__(self):
         return f"Conversation {self.call_sid} - {self.candidate_id}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.get_text_cache_key())
+        self.__dict__.pop("transcript", None)
+
+    def get_text_cache_key(self):
+        return get_transcript_cache_key(self.call_sid)
+
+    def set_transcript(self, messages, text=None):
+        self.conversation_data = pack_transcript(messages, text)
+        self.conversation_text = None
+        self.conversation_json = None
+        self.storage_format = TranscriptStorage.COMPRESSED
+        self.__dict__.pop("transcript", None)
+
+    @cached_property
+    def transcript(self):
+        if self.storage_format == TranscriptStorage.COMPRESSED:
+            return unpack_transcript(self.conversation_data)
+        if self.storage_format == TranscriptStorage.TURNS:
+            messages = ConversationTurn.get_messages(self.call_sid)
+            return messages, render_transcript_text(messages)
+        return self.conversation_json, self.conversation_text
+
+    def update_search_vector(self):
+        # The transcript is not stored as plain text, so the vector is built
+        # from the text passed in as a query parameter
+        InterviewCallConversation.objects.filter(pk=self.pk).update(
+            search_vector=SearchVector(
+                models.Value(self.transcript_text), config=TRANSCRIPT_SEARCH_CONFIG
+            )
+        )
+
+    @classmethod
+    def update_search_vectors(cls, conversations, texts):
+        """Index many conversations at once, texts maps call_sid to transcript."""
+        for conversation in conversations:
+            conversation.search_vector = SearchVector(
+                models.Value(texts[conversation.call_sid]),
+                config=TRANSCRIPT_SEARCH_CONFIG,
+            )
+        cls.objects.bulk_update(conversations, ["search_vector"])
+
+    @property
+    def transcript_messages(self):
+        return self.transcript[0]
+
+    @property
+    def transcript_text(self):
+        if self.storage_format == TranscriptStorage.PLAIN:
+            return self.conversation_text
+        text = cache.get(self.get_text_cache_key())
+        if text is None:
+            text = self.transcript[1]
+            cache.set(self.get_text_cache_key(), text, TRANSCRIPT_TEXT_CACHE_TIMEOUT)
+        return text
+
+
+class ConversationTurn(BaseModelWithUID):
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    call_sid = models.CharField(max_length=100)
+    seq = models.PositiveIntegerField(help_text="Position of the turn in the call")
+    role = models.CharField(max_length=50)
+    content = models.TextField()
+    spoken_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "interview_conversation_turns"
+        ordering = ["call_sid", "seq"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["call_sid", "seq"], name="conversation_turn_call_seq_uniq"
+            )
+        ]
+
+    def __str__(self):
+        return f"Turn {self.seq} of {self.call_sid}"
+
+    @classmethod
+    def get_messages(cls, call_sid):
+        return [
+            {"role": role, "content": content}
+            for role, content in cls.objects.filter(call_sid=call_sid)
+            .order_by("seq")
+            .values_list("role", "content")
+        ]
+
+    @classmethod
+    def get_messages_for(cls, call_sids):
+        messages = {}
+        for call_sid, role, content in (
+            cls.objects.filter(call_sid__in=call_sids)
+            .order_by("call_sid", "seq")
+            .values_list("call_sid", "role", "content")
+        ):
+            messages.setdefault(call_sid, []).append({"role": role, "content": content})
+        return messages
+
+
+class InterviewDailyStat(models.Model):
+    """
+    Interview results rolled up per organization, job, day and decision.
+
+    Kept up to date as results are ingested (see interview/analytics.py), so
+    dashboards never scan InterviewTaken.
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    job_id = models.PositiveIntegerField(default=0, help_text="0 when unknown")
+    day = models.DateField()
+    ai_decision = models.CharField(max_length=100, blank=True, default="")
+    call_count = models.IntegerField(default=0)
+    timed_call_count = models.IntegerField(
+        default=0, help_text="Calls with a known duration"
+    )
+    total_duration_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "interview_daily_stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "day", "job_id", "ai_decision"],
+                name="interview_daily_stat_key_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.organization_id} - {self.day} - {self.job_id} - {self.ai_decision}"
+        )
+
+
+class ConversationArchive(BaseModelWithUID):
+    """A monthly conversation partition moved out of the database"""
+
+    partition_name = models.CharField(max_length=100, unique=True)
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    conversation_count = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.partition_name
+
+
+class ArchivedConversation(BaseModelWithUID):
+    """Where to find an archived conversation, without its transcript"""
+
+    archive = models.ForeignKey(
+        ConversationArchive, on_delete=models.CASCADE, related_name="conversations"
+    )
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    interview_id = models.PositiveBigIntegerField(db_index=True)
+    call_sid = models.CharField(max_length=100, unique=True)
+    storage_path = models.CharField(max_length=255)
+    archive_offset = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="Where the conversation's gzip member starts"
+    )
+    archive_length = models.PositiveBigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Archived conversation {self.call_sid}"
+
 
 class PrimaryQuestion(BaseModelWithUID):
     question = models.CharField(max_length=255)
@@ -119,3 +367,274 @@ class QuestionConfigConnection(BaseModelWithUID):
 
     def __str__(self):
         return f"{self.question.question}-{self.config.organization}"
+
+
+class ApplicationStatusUpdate(BaseModelWithUID):
+    """
+    Pending JobAdder status change for an application, the latest one wins
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    application_id = models.PositiveIntegerField()
+    status_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Empty means the configured status_when_call_is_placed",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("organization", "application_id")
+        indexes = [models.Index(fields=["organization", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"application_id: {self.application_id} - status_id: {self.status_id}"
+
+
+class BulkRetryJob(BaseModelWithUID):
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    job_id = models.PositiveIntegerField(null=True, blank=True)
+    limit = models.PositiveIntegerField(default=10)
+    status = models.CharField(
+        max_length=20,
+        choices=RetryJobStatus.choices,
+        default=RetryJobStatus.PENDING,
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    retried = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    results = models.JSONField(
+        default=list, blank=True, help_text="Per candidate retry outcome"
+    )
+    error = models.TextField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.organization_id} - {self.status} ({self.processed}/{self.total})"
+
+
+class InterviewExport(BaseModelWithUID):
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    format = models.CharField(
+        max_length=10, choices=ExportFormat.choices, default=ExportFormat.XLSX
+    )
+    filters = models.JSONField(default=dict, blank=True)
+    include_transcripts = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=20, choices=ExportStatus.choices, default=ExportStatus.PENDING
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    file_path = models.CharField(max_length=255, null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.organization_id} - {self.format} - {self.status}"
+
+
+class RetryPolicy(BaseModelWithUID):
+    """
+    Automatic retry rules for calls that ended in a disconnect
+    """
+
+    organization = models.OneToOneField(
+        Organization, on_delete=models.CASCADE, related_name="retry_policy"
+    )
+    is_enabled = models.BooleanField(default=False)
+    max_attempts = models.PositiveIntegerField(default=3)
+    base_delay_minutes = models.PositiveIntegerField(default=30)
+    backoff_multiplier = models.PositiveIntegerField(default=2)
+    quiet_hours_start = models.TimeField(null=True, blank=True)
+    quiet_hours_end = models.TimeField(null=True, blank=True)
+    timezone = models.CharField(max_length=64, default="Europe/London")
+
+    def __str__(self):
+        return f"{self.organization.name} - max {self.max_attempts} attempts"
+
+    def get_delay(self, attempts):
+        return timedelta(
+            minutes=self.base_delay_minutes * (self.backoff_multiplier**attempts)
+        )
+
+    def is_quiet_time(self, moment):
+        if not self.quiet_hours_start or not self.quiet_hours_end:
+            return False
+        local_time = moment.astimezone(ZoneInfo(self.timezone)).time()
+        if self.quiet_hours_start <= self.quiet_hours_end:
+            return self.quiet_hours_start <= local_time < self.quiet_hours_end
+        # Quiet hours spanning midnight, e.g. 21:00 - 08:00
+        return local_time >= self.quiet_hours_start or local_time < self.quiet_hours_end
+
+    def get_next_allowed_time(self, moment):
+        """Push ``moment`` to the end of quiet hours when it falls inside them."""
+        if not self.is_quiet_time(moment):
+            return moment
+        zone = ZoneInfo(self.timezone)
+        local = moment.astimezone(zone)
+        allowed = datetime.combine(local.date(), self.quiet_hours_end, tzinfo=zone)
+        if allowed <= local:
+            allowed += timedelta(days=1)
+        return allowed
+
+    def get_next_retry_at(self, attempts, moment):
+        if not self.is_enabled or attempts >= self.max_attempts:
+            return None
+        return self.get_next_allowed_time(moment + self.get_delay(attempts))
+
+
+class ScheduledRetry(BaseModelWithUID):
+    """
+    Retry state of one application, shared by all of its interview attempts
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    interview = models.ForeignKey(
+        InterviewTaken, on_delete=models.CASCADE, related_name="scheduled_retries"
+    )
+    application_id = models.PositiveIntegerField()
+    attempts = models.PositiveIntegerField(default=0)
+    next_retry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("organization", "application_id")
+        indexes = [
+            models.Index(
+                fields=["next_retry_at"],
+                condition=models.Q(next_retry_at__isnull=False),
+                name="scheduled_retry_due_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"application_id: {self.application_id} - attempts: {self.attempts}"
+
+
+class SMSCampaign(BaseModelWithUID):
+    """
+    One SMS sent to many candidates or contacts, paced per sending number
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255, blank=True)
+    message = models.TextField(help_text="{name} is replaced by the recipient name")
+    source = models.CharField(
+        max_length=20,
+        choices=CampaignSource.choices,
+        default=CampaignSource.INTERVIEWS,
+    )
+    filters = models.JSONField(default=dict, blank=True)
+    rate_per_number = models.PositiveIntegerField(
+        default=1, help_text="Messages per second from each sending number"
+    )
+    status = models.CharField(
+        max_length=20, choices=CampaignStatus.choices, default=CampaignStatus.PENDING
+    )
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    sender_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.organization_id} - {self.name} - {self.status}"
+
+    @property
+    def processed(self):
+        return self.sent + self.failed
+
+    def get_throughput(self):
+        """Messages processed per second since the campaign started."""
+        if not self.started_at or not self.processed:
+            return None
+        elapsed = (
+            (self.finished_at or timezone.now()) - self.started_at
+        ).total_seconds()
+        return self.processed / max(elapsed, 1)
+
+    def get_eta(self):
+        """Estimated completion time, from the measured or the paced throughput."""
+        if self.status != CampaignStatus.RUNNING:
+            return None
+        remaining = max(self.total - self.processed, 0)
+        throughput = self.get_throughput() or self.rate_per_number * self.sender_count
+        if not throughput:
+            return None
+        return timezone.now() + timedelta(seconds=remaining / throughput)
+
+
+class SMSCampaignRecipient(BaseModelWithUID):
+    campaign = models.ForeignKey(
+        SMSCampaign, on_delete=models.CASCADE, related_name="recipients"
+    )
+    phone = models.CharField(max_length=32)
+    name = models.CharField(max_length=255, null=True, blank=True)
+    interview = models.ForeignKey(
+        InterviewTaken, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    contact = models.ForeignKey(
+        Contacts, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    status = models.CharField(
+        max_length=20, choices=RecipientStatus.choices, default=RecipientStatus.PENDING
+    )
+    from_number = models.CharField(max_length=32, null=True, blank=True)
+    message_sid = models.CharField(max_length=64, null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModelWithUID.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["campaign", "phone"], name="sms_campaign_recipient_uniq"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["campaign", "id"],
+                condition=models.Q(status="PENDING"),
+                name="sms_recipient_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.phone} - {self.status}"
+
+
+class SMSMessage(BaseModelWithUID):
+    """
+    Every SMS sent for an organization, kept up to date by Twilio status
+    callbacks
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    campaign = models.ForeignKey(
+        SMSCampaign,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="messages",
+    )
+    message_sid = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    from_number = models.CharField(max_length=32, null=True, blank=True)
+    to_number = models.CharField(max_length=32)
+    status = models.CharField(
+        max_length=20, choices=SMSStatus.choices, default=SMSStatus.QUEUED
+    )
+    error_code = models.CharField(max_length=16, null=True, blank=True)
+    error_message = models.TextField(null=True, blank=True)
+    status_updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModelWithUID.Meta):
+        indexes = [
+            models.Index(
+                fields=["organization", "created_at"],
+                name="sms_message_org_created_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.to_number} - {self.status}"
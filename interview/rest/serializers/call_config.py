@@ -1,3 +1,5 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from django.db import transaction
 from rest_framework import serializers
 
@@ -5,6 +7,7 @@ from interview.models import (
     AIPhoneCallConfig,
     PrimaryQuestion,
     QuestionConfigConnection,
+    RetryPolicy,
 )
 from organizations.models import OrganizationPlatform
 from organizations.rest.serializers.organization_platform import MyPlatformSerializer
@@ -18,6 +21,42 @@ class PrimaryQuestionSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class RetryPolicySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RetryPolicy
+        fields = [
+            "uid",
+            "is_enabled",
+            "max_attempts",
+            "base_delay_minutes",
+            "backoff_multiplier",
+            "quiet_hours_start",
+            "quiet_hours_end",
+            "timezone",
+        ]
+        read_only_fields = ["uid"]
+
+    def validate_timezone(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError("Unknown timezone.")
+        return value
+
+    def validate(self, attrs):
+        start = attrs.get(
+            "quiet_hours_start", getattr(self.instance, "quiet_hours_start", None)
+        )
+        end = attrs.get(
+            "quiet_hours_end", getattr(self.instance, "quiet_hours_end", None)
+        )
+        if bool(start) != bool(end):
+            raise serializers.ValidationError(
+                {"quiet_hours": "Both quiet hours start and end must be set."}
+            )
+        return attrs
+
+
 class AIPhoneCallConfigSerializer(serializers.ModelSerializer):
     platform_uid = serializers.CharField(write_only=True)
     phone_uid = serializers.CharField(write_only=True)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from interview.models import InterviewCallConversation
+from interview.models import ConversationTurn, InterviewCallConversation
+from interview.transcripts import build_snippet
 
 
 class ConversationSaveSerializer(serializers.Serializer):
@@ -10,17 +11,92 @@ class ConversationSaveSerializer(serializers.Serializer):
     organization_id = serializers.IntegerField()
     candidate_id = serializers.IntegerField()
     job_id = serializers.IntegerField()
-    conversation_text = serializers.CharField()
-    conversation_json = serializers.JSONField()
-    message_count = serializers.IntegerField()
+    # Omitted when the turns were streamed during the call
+    conversation_text = serializers.CharField(required=False)
+    conversation_json = serializers.JSONField(required=False)
+    message_count = serializers.IntegerField(required=False)
     started_at = serializers.DateTimeField()
     ended_at = serializers.DateTimeField()
     candidate_name = serializers.CharField()
     candidate_email = serializers.CharField()
     candidate_phone = serializers.CharField()
 
+    def validate(self, attrs):
+        # The text is only stored alongside the messages, a transcript
+        # without them would be saved as streamed turns and lost
+        if "conversation_text" in attrs and "conversation_json" not in attrs:
+            raise serializers.ValidationError(
+                {"conversation_json": "Required when conversation_text is sent."}
+            )
+        return attrs
+
+
+class ConversationBulkSaveSerializer(serializers.Serializer):
+    conversations = ConversationSaveSerializer(many=True, allow_empty=False)
+
 
 class InterviewCallConversationSerializer(serializers.ModelSerializer):
+    conversation_text = serializers.CharField(source="transcript_text", read_only=True)
+    conversation_json = serializers.JSONField(
+        source="transcript_messages", read_only=True
+    )
+
     class Meta:
         model = InterviewCallConversation
-        fields = "__all__"
+        exclude = ["conversation_data", "search_vector"]
+
+
+class ConversationListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InterviewCallConversation
+        fields = [
+            "uid",
+            "call_sid",
+            "interview_id",
+            "application_id",
+            "candidate_id",
+            "candidate_name",
+            "candidate_email",
+            "candidate_phone",
+            "job_id",
+            "message_count",
+            "started_at",
+            "ended_at",
+            "created_at",
+        ]
+
+
+class ConversationTurnSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ConversationTurn
+        fields = ["seq", "role", "content", "spoken_at"]
+
+
+class ConversationTurnBatchSerializer(serializers.Serializer):
+    call_sid = serializers.CharField(max_length=100)
+    organization_id = serializers.IntegerField()
+    turns = ConversationTurnSerializer(many=True, allow_empty=False)
+
+
+class ConversationSearchResultSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.SerializerMethodField()
+
+    class Meta:
+        model = InterviewCallConversation
+        fields = [
+            "uid",
+            "call_sid",
+            "interview_id",
+            "application_id",
+            "candidate_id",
+            "candidate_name",
+            "job_id",
+            "started_at",
+            "ended_at",
+            "rank",
+            "snippet",
+        ]
+
+    def get_snippet(self, _object):
+        return build_snippet(_object.transcript_text, self.context.get("terms", []))
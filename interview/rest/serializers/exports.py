@@ -0,0 +1,64 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from interview.models import InterviewExport
+
+
+class InterviewExportFilterSerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    job_id = serializers.IntegerField(required=False)
+    ai_decision = serializers.CharField(required=False)
+    include_transcripts = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError({"end": "end must not be before start."})
+        return attrs
+
+
+class InterviewExportSerializer(serializers.ModelSerializer):
+    filters = InterviewExportFilterSerializer(required=False)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = InterviewExport
+        fields = [
+            "uid",
+            "format",
+            "filters",
+            "include_transcripts",
+            "status",
+            "row_count",
+            "download_url",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            "uid",
+            "include_transcripts",
+            "status",
+            "row_count",
+            "download_url",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+
+    def get_download_url(self, _object):
+        if not _object.file_path:
+            return None
+        return default_storage.url(_object.file_path)
+
+    def create(self, validated_data):
+        filters = validated_data.pop("filters", {})
+        include_transcripts = filters.pop("include_transcripts", False)
+        return InterviewExport.objects.create(
+            include_transcripts=include_transcripts,
+            filters={
+                key: value.isoformat() if hasattr(value, "isoformat") else value
+                for key, value in filters.items()
+            },
+            **validated_data,
+        )
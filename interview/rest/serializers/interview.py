@@ -1,19 +1,39 @@
+from celery import group
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from interview.analytics import get_stats_delta, record_interview_stats
+from interview.archive import load_archived_conversation
+from interview.durations import parse_call_duration
 from interview.models import (
     AIPhoneCallConfig,
+    ArchivedConversation,
     InterviewCallConversation,
     InterviewTaken,
 )
-from interview.tasks.ai_phone import update_application_status_after_call
+from interview.rest.serializers.conversations import (
+    InterviewCallConversationSerializer,
+)
 from interview.tasks.ai_sms import send_sms_message
+from interview.tasks.retry import schedule_call_retries, schedule_call_retry
+from interview.tasks.status_updates import (
+    queue_application_status_update,
+    queue_application_status_updates,
+)
 from organizations.models import Organization
 
 
-class InterviewCallConversationSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = InterviewCallConversation
-        fields = "__all__"
+def get_result_status_id(config, ai_decision):
+    if ai_decision == "successful":
+        return config.status_for_successful_call
+    if ai_decision == "unsuccessful":
+        return config.status_for_unsuccessful_call
+    return None
+
+
+def get_document_upload_message(config):
+    return f"Please Upload your updated documents in this link: {config.document_upload_link}"
 
 
 class InterviewTakenSerializer(serializers.ModelSerializer):
@@ -23,12 +43,15 @@ class InterviewTakenSerializer(serializers.ModelSerializer):
     class Meta:
         model = InterviewTaken
         fields = "__all__"
-        read_only_fields = ["organization"]
+        read_only_fields = ["organization", "call_duration_seconds"]
 
     def get_interview_data(self, _object):
         data = InterviewCallConversation.objects.filter(interview_id=_object.id).first()
         if data:
             return InterviewCallConversationSerializer(data).data
+        archived = ArchivedConversation.objects.filter(interview_id=_object.id).first()
+        if archived:
+            return load_archived_conversation(archived) or {}
         return {}
 
     def create(self, validated_data):
@@ -53,26 +76,142 @@ class InterviewTakenSerializer(serializers.ModelSerializer):
         interview = InterviewTaken.objects.create(
             organization=organization, **validated_data
         )
+        record_interview_stats([interview])
+        schedule_call_retry(interview)
 
         if application_id:
-            if status == "successful":
-                status_id = config.status_for_successful_call
-            elif status == "unsuccessful":
-                status_id = config.status_for_unsuccessful_call
-            else:
-                status_id = None
-
+            status_id = get_result_status_id(config, status)
             if status_id:
-                update_application_status_after_call.delay(
+                queue_application_status_update(
                     organization_id, application_id, status_id
                 )
             if status == "successful" and config.sent_document_upload_link:
-                message = f"Please Upload your updated documents in this link: {config.document_upload_link}"
                 send_sms_message.delay(
                     validated_data["candidate_phone"],
                     str(config.phone.phone_number),
-                    message,
+                    get_document_upload_message(config),
                     organization_id,
                 )
 
         return interview
+
+
+class InterviewTakenListSerializer(serializers.ModelSerializer):
+    has_conversation = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = InterviewTaken
+        exclude = ["organization", "job_details"]
+
+
+class InterviewTakenBulkSerializer(serializers.Serializer):
+    results = InterviewTakenSerializer(many=True, allow_empty=False)
+
+    def validate_results(self, results):
+        organization_ids = {result.get("organization_id") for result in results}
+        if None in organization_ids:
+            raise serializers.ValidationError(
+                "organization_id is required for every result."
+            )
+
+        organizations = Organization.objects.in_bulk(list(organization_ids))
+        self.configs = {
+            config.organization_id: config
+            for config in AIPhoneCallConfig.objects.filter(
+                organization_id__in=list(organization_ids)
+            ).select_related("phone")
+        }
+        missing = sorted(
+            organization_id
+            for organization_id in organization_ids
+            if organization_id not in organizations
+            or organization_id not in self.configs
+        )
+        if missing:
+            raise serializers.ValidationError(
+                f"No organization or config found for organization ids: {missing}"
+            )
+        return results
+
+    def create(self, validated_data):
+        results = validated_data["results"]
+        call_sids = [result["call_sid"] for result in results if result.get("call_sid")]
+        existing = {
+            interview.call_sid: interview
+            for interview in InterviewTaken.objects.filter(
+                organization_id__in=list(self.configs), call_sid__in=call_sids
+            )
+        }
+
+        now = timezone.now()
+        interviews, to_create, to_update, previous = {}, [], {}, []
+        update_fields = {"updated_at", "call_duration_seconds"}
+        for result in results:
+            result = dict(result)
+            organization_id = result.pop("organization_id")
+            call_sid = result.get("call_sid")
+            interview = interviews.get(call_sid) or existing.get(call_sid)
+            if interview and interview.organization_id == organization_id:
+                if interview.pk and interview.pk not in to_update:
+                    previous.append(get_stats_delta(interview))
+                for field, value in result.items():
+                    setattr(interview, field, value)
+                update_fields.update(result)
+                if interview.pk:
+                    interview.updated_at = now
+                    to_update[interview.pk] = interview
+            else:
+                interview = InterviewTaken(organization_id=organization_id, **result)
+                to_create.append(interview)
+            # bulk_create and bulk_update skip InterviewTaken.save
+            interview.call_duration_seconds = parse_call_duration(
+                interview.call_duration
+            )
+            if call_sid:
+                interviews[call_sid] = interview
+
+        with transaction.atomic():
+            InterviewTaken.objects.bulk_create(to_create)
+            if to_update:
+                InterviewTaken.objects.bulk_update(
+                    list(to_update.values()), list(update_fields)
+                )
+            record_interview_stats(to_create + list(to_update.values()), previous)
+
+        self.process_results(to_create + list(to_update.values()))
+        return {"created": len(to_create), "updated": len(to_update)}
+
+    def process_results(self, interviews):
+        by_organization = {}
+        for interview in interviews:
+            by_organization.setdefault(interview.organization_id, []).append(interview)
+
+        messages = []
+        for organization_id, organization_interviews in by_organization.items():
+            config = self.configs[organization_id]
+            schedule_call_retries(organization_id, organization_interviews)
+
+            statuses = {}
+            for interview in organization_interviews:
+                if not interview.application_id:
+                    continue
+                status_id = get_result_status_id(config, interview.ai_decision)
+                if status_id:
+                    statuses[interview.application_id] = status_id
+                if (
+                    interview.ai_decision == "successful"
+                    and config.sent_document_upload_link
+                ):
+                    messages.append(
+                        send_sms_message.s(
+                            interview.candidate_phone,
+                            str(config.phone.phone_number),
+                            get_document_upload_message(config),
+                            organization_id,
+                        )
+                    )
+            if statuses:
+                queue_application_status_updates(organization_id, statuses)
+
+        if messages:
+            group(messages).apply_async()
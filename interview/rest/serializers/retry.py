@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from interview.models import BulkRetryJob
+
+
+class BulkRetryJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BulkRetryJob
+        fields = [
+            "uid",
+            "job_id",
+            "limit",
+            "status",
+            "total",
+            "processed",
+            "retried",
+            "failed",
+            "results",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
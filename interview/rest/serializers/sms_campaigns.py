@@ -0,0 +1,106 @@
+from rest_framework import serializers
+
+from interview.choices import CampaignSource
+from interview.models import SMSCampaign, SMSCampaignRecipient
+from interview.rest.serializers.exports import InterviewExportFilterSerializer
+
+MAX_RATE_PER_NUMBER = 30
+
+
+class SMSCampaignFilterSerializer(InterviewExportFilterSerializer):
+    include_transcripts = None
+
+
+class SMSCampaignSerializer(serializers.ModelSerializer):
+    filters = SMSCampaignFilterSerializer(required=False)
+    pending = serializers.SerializerMethodField()
+    throughput = serializers.SerializerMethodField()
+    estimated_completion_at = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SMSCampaign
+        fields = [
+            "uid",
+            "name",
+            "message",
+            "source",
+            "filters",
+            "rate_per_number",
+            "status",
+            "total",
+            "sent",
+            "failed",
+            "pending",
+            "sender_count",
+            "throughput",
+            "estimated_completion_at",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            "uid",
+            "status",
+            "total",
+            "sent",
+            "failed",
+            "pending",
+            "sender_count",
+            "throughput",
+            "estimated_completion_at",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+    def get_pending(self, _object):
+        return max(_object.total - _object.processed, 0)
+
+    def get_throughput(self, _object):
+        throughput = _object.get_throughput()
+        return round(throughput, 2) if throughput is not None else None
+
+    def get_estimated_completion_at(self, _object):
+        return _object.get_eta()
+
+    def validate_rate_per_number(self, value):
+        if not 1 <= value <= MAX_RATE_PER_NUMBER:
+            raise serializers.ValidationError(
+                f"rate_per_number must be between 1 and {MAX_RATE_PER_NUMBER}."
+            )
+        return value
+
+    def validate(self, attrs):
+        if attrs.get("filters") and attrs.get("source") == CampaignSource.CONTACTS:
+            raise serializers.ValidationError(
+                {"filters": "Filters only apply to interview campaigns."}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        filters = validated_data.pop("filters", {})
+        return SMSCampaign.objects.create(
+            filters={
+                key: value.isoformat() if hasattr(value, "isoformat") else value
+                for key, value in filters.items()
+            },
+            **validated_data,
+        )
+
+
+class SMSCampaignRecipientSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SMSCampaignRecipient
+        fields = [
+            "uid",
+            "phone",
+            "name",
+            "status",
+            "from_number",
+            "message_sid",
+            "error",
+            "sent_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from interview.models import SMSMessage
+
+
+class SMSMessageSerializer(serializers.ModelSerializer):
+    campaign_uid = serializers.UUIDField(source="campaign.uid", default=None)
+
+    class Meta:
+        model = SMSMessage
+        fields = [
+            "uid",
+            "campaign_uid",
+            "message_sid",
+            "from_number",
+            "to_number",
+            "status",
+            "error_code",
+            "error_message",
+            "status_updated_at",
+            "created_at",
+        ]
+        read_only_fields = fields
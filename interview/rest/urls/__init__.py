@@ -6,4 +6,8 @@ urlpatterns = [
     path("call/config/", include("interview.rest.urls.call_config")),
     path("status/", include("interview.rest.urls.status")),
     path("retry/", include("interview.rest.urls.recall")),
+    path("analytics/", include("interview.rest.urls.analytics")),
+    path("exports/", include("interview.rest.urls.exports")),
+    path("sms/campaigns/", include("interview.rest.urls.sms_campaigns")),
+    path("sms/", include("interview.rest.urls.sms_messages")),
 ]
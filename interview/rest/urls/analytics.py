@@ -0,0 +1,7 @@
+from django.urls import path
+
+from ..views.analytics import InterviewAnalyticsView
+
+urlpatterns = [
+    path("", InterviewAnalyticsView.as_view(), name="interview_analytics"),
+]
@@ -4,6 +4,7 @@ from interview.rest.views.call_config import (
     AIPhoneCallConfigDetailView,
     AIPhoneCallConfigListCreateView,
     PrimaryQuestionListView,
+    RetryPolicyDetailView,
 )
 
 urlpatterns = [
@@ -22,4 +23,9 @@ urlpatterns = [
         PrimaryQuestionListView.as_view(),
         name="primary-question-list",
     ),
+    path(
+        "retry_policy",
+        RetryPolicyDetailView.as_view(),
+        name="retry-policy-detail",
+    ),
 ]
@@ -1,8 +1,25 @@
 from django.urls import path
 
-from ..views.conversations import GetConversationView, SaveConversationView
+from ..views.conversations import (
+    BulkSaveConversationView,
+    ConversationListView,
+    ConversationSearchView,
+    GetConversationTurnsView,
+    GetConversationView,
+    SaveConversationTurnsView,
+    SaveConversationView,
+)
 
 urlpatterns = [
+    path("", ConversationListView.as_view(), name="conversation_list"),
     path("save/", SaveConversationView.as_view(), name="save_conversation"),
+    path("bulk/", BulkSaveConversationView.as_view(), name="bulk_save_conversations"),
+    path("turns/", SaveConversationTurnsView.as_view(), name="save_conversation_turns"),
+    path("search/", ConversationSearchView.as_view(), name="conversation_search"),
+    path(
+        "<str:call_sid>/turns/",
+        GetConversationTurnsView.as_view(),
+        name="get_conversation_turns",
+    ),
     path("<str:call_sid>/", GetConversationView.as_view(), name="get_conversation"),
 ]
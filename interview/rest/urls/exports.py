@@ -0,0 +1,17 @@
+from django.urls import path
+
+from ..views.exports import (
+    InterviewCSVExportView,
+    InterviewExportCreateView,
+    InterviewExportDetailView,
+)
+
+urlpatterns = [
+    path("csv/", InterviewCSVExportView.as_view(), name="interview_csv_export"),
+    path("", InterviewExportCreateView.as_view(), name="interview_export_create"),
+    path(
+        "<uuid:uid>/",
+        InterviewExportDetailView.as_view(),
+        name="interview_export_detail",
+    ),
+]
@@ -1,8 +1,15 @@
 from django.urls import path
 
-from ..views.interview import InterviewTakenCreateView, InterviewTakenListView
+from ..views.interview import (
+    InterviewTakenBulkCreateView,
+    InterviewTakenCreateView,
+    InterviewTakenDetailView,
+    InterviewTakenListView,
+)
 
 urlpatterns = [
     path("save/", InterviewTakenCreateView.as_view(), name="save_interview"),
+    path("bulk/", InterviewTakenBulkCreateView.as_view(), name="bulk_save_interviews"),
     path("", InterviewTakenListView.as_view(), name="interview-list"),
+    path("<uuid:uid>/", InterviewTakenDetailView.as_view(), name="interview-detail"),
 ]
@@ -3,6 +3,11 @@ from django.urls import path
 from interview.rest.views import recall
 
 urlpatterns = [
+    path(
+        "jobs/<uuid:job_uid>",
+        recall.retry_job_status,
+        name="retry-job-status",
+    ),
     path(
         "<str:interview_id>",
         recall.retry_disconnected_candidate,
@@ -0,0 +1,27 @@
+from django.urls import path
+
+from ..views.sms_campaigns import (
+    SMSCampaignCancelView,
+    SMSCampaignDetailView,
+    SMSCampaignListCreateView,
+    SMSCampaignRecipientListView,
+)
+
+urlpatterns = [
+    path("", SMSCampaignListCreateView.as_view(), name="sms_campaign_list_create"),
+    path(
+        "<uuid:uid>/",
+        SMSCampaignDetailView.as_view(),
+        name="sms_campaign_detail",
+    ),
+    path(
+        "<uuid:uid>/cancel/",
+        SMSCampaignCancelView.as_view(),
+        name="sms_campaign_cancel",
+    ),
+    path(
+        "<uuid:uid>/recipients/",
+        SMSCampaignRecipientListView.as_view(),
+        name="sms_campaign_recipients",
+    ),
+]
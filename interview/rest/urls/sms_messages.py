@@ -0,0 +1,17 @@
+from django.urls import path
+
+from ..views.sms_messages import (
+    SMSDeliveryStatsView,
+    SMSMessageListView,
+    SMSStatusCallbackView,
+)
+
+urlpatterns = [
+    path("messages/", SMSMessageListView.as_view(), name="sms_message_list"),
+    path("stats/", SMSDeliveryStatsView.as_view(), name="sms_delivery_stats"),
+    path(
+        "status-callback/",
+        SMSStatusCallbackView.as_view(),
+        name="sms_status_callback",
+    ),
+]
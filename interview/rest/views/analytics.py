@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+from django.db.models import Q, Sum
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from interview.models import InterviewDailyStat
+
+ANALYTICS_GROUPS = {"day": "day", "job": "job_id", "decision": "ai_decision"}
+ANALYTICS_DEFAULT_DAYS = 30
+
+
+def summarize(stats):
+    calls = stats["call_count"] or 0
+    timed_calls = stats["timed_call_count"] or 0
+    return {
+        "calls": calls,
+        "successful_calls": stats["successful_count"] or 0,
+        "success_rate": (
+            round((stats["successful_count"] or 0) / calls, 4) if calls else None
+        ),
+        "average_duration_seconds": (
+            round(stats["total_duration_seconds"] / timed_calls, 1)
+            if timed_calls
+            else None
+        ),
+    }
+
+
+class InterviewAnalyticsView(APIView):
+    """
+    Call counts, success rate and average duration for the organization,
+    read from the daily rollups only.
+    """
+
+    def get(self, request):
+        organization = request.user.get_organization()
+        try:
+            end = date.fromisoformat(
+                request.query_params.get("end", date.today().isoformat())
+            )
+            start = date.fromisoformat(
+                request.query_params.get(
+                    "start",
+                    (end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)).isoformat(),
+                )
+            )
+        except ValueError:
+            return Response(
+                {"error": "start and end must be dates in YYYY-MM-DD format"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        group_by = request.query_params.get("group_by", "day")
+        if group_by not in ANALYTICS_GROUPS:
+            return Response(
+                {"error": f"group_by must be one of {', '.join(ANALYTICS_GROUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stats = InterviewDailyStat.objects.filter(
+            organization=organization, day__gte=start, day__lte=end
+        )
+        job_id = request.query_params.get("job_id")
+        if job_id:
+            stats = stats.filter(job_id=job_id)
+
+        totals = {
+            "call_count": Sum("call_count"),
+            "timed_call_count": Sum("timed_call_count"),
+            "total_duration_seconds": Sum("total_duration_seconds"),
+            "successful_count": Sum("call_count", filter=Q(ai_decision="successful")),
+        }
+        field = ANALYTICS_GROUPS[group_by]
+        groups = stats.order_by(field).values(field).annotate(**totals).order_by(field)
+        return Response(
+            {
+                "start": start,
+                "end": end,
+                "summary": summarize(stats.aggregate(**totals)),
+                "groups": [
+                    {group_by: group[field], **summarize(group)} for group in groups
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -4,10 +4,11 @@ from rest_framework import generics
 from rest_framework.exceptions import NotFound
 
 from common.choices import Status
-from interview.models import AIPhoneCallConfig, PrimaryQuestion
+from interview.models import AIPhoneCallConfig, PrimaryQuestion, RetryPolicy
 from interview.rest.serializers.call_config import (
     AIPhoneCallConfigSerializer,
     PrimaryQuestionSerializer,
+    RetryPolicySerializer,
 )
 
 
@@ -44,3 +45,12 @@ class AIPhoneCallConfigDetailView(generics.RetrieveUpdateDestroyAPIView):
 class PrimaryQuestionListView(generics.ListCreateAPIView):
     serializer_class = PrimaryQuestionSerializer
     queryset = PrimaryQuestion.objects.filter(status=Status.ACTIVE)
+
+
+class RetryPolicyDetailView(generics.RetrieveUpdateAPIView):
+    serializer_class = RetryPolicySerializer
+
+    def get_object(self):
+        organization = self.request.user.get_organization()
+        policy, _ = RetryPolicy.objects.get_or_create(organization=organization)
+        return policy
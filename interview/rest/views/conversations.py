@@ -1,16 +1,80 @@
+import base64
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DecimalField, F, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from interview.models import InterviewCallConversation
+from common.pagination import CreatedAtCursorPagination
+from interview.archive import load_archived_conversation
+from interview.choices import TranscriptStorage
+from interview.models import (
+    TRANSCRIPT_SEARCH_CONFIG,
+    ArchivedConversation,
+    ConversationTurn,
+    InterviewCallConversation,
+)
+from interview.transcripts import (
+    get_transcript_cache_key,
+    pack_transcript,
+    render_transcript_text,
+)
 
 from ..serializers.conversations import (
+    ConversationBulkSaveSerializer,
+    ConversationListSerializer,
     ConversationSaveSerializer,
+    ConversationSearchResultSerializer,
+    ConversationTurnBatchSerializer,
+    ConversationTurnSerializer,
     InterviewCallConversationSerializer,
 )
 
 
+def get_conversation_fields(validated_data, turn_count=None):
+    """Model fields for a conversation sent by the calling service."""
+    if "conversation_json" in validated_data:
+        conversation_json = validated_data["conversation_json"]
+        storage_format = TranscriptStorage.COMPRESSED
+        conversation_data = pack_transcript(
+            conversation_json, validated_data.get("conversation_text")
+        )
+        message_count = validated_data.get("message_count", len(conversation_json))
+    else:
+        # The turns were streamed during the call, the transcript is
+        # assembled from them when it is read
+        storage_format = TranscriptStorage.TURNS
+        conversation_data = None
+        message_count = validated_data.get("message_count", turn_count or 0)
+
+    return {
+        "application_id": validated_data["application_id"],
+        "organization_id": validated_data["organization_id"],
+        "interview_id": validated_data["interview_id"],
+        "candidate_id": validated_data["candidate_id"],
+        "candidate_name": validated_data["candidate_name"],
+        "candidate_phone": validated_data["candidate_phone"],
+        "candidate_email": validated_data["candidate_email"],
+        "job_id": validated_data["job_id"],
+        "conversation_text": None,
+        "conversation_json": None,
+        "conversation_data": conversation_data,
+        "storage_format": storage_format,
+        "message_count": message_count,
+        "started_at": validated_data["started_at"],
+        "ended_at": validated_data["ended_at"],
+    }
+
+
 class SaveConversationView(APIView):
     permission_classes = [AllowAny]
 
@@ -24,36 +88,29 @@ class SaveConversationView(APIView):
             )
 
         validated_data = serializer.validated_data
+        call_sid = validated_data["call_sid"]
+        turn_count = None
+        if not {"conversation_json", "message_count"} & set(validated_data):
+            turn_count = ConversationTurn.objects.filter(call_sid=call_sid).count()
 
         try:
             # Create or update conversation record
             conversation, created = InterviewCallConversation.objects.update_or_create(
-                call_sid=validated_data["call_sid"],
-                defaults={
-                    "application_id": validated_data["application_id"],
-                    "organization_id": validated_data["organization_id"],
-                    "interview_id": validated_data["interview_id"],
-                    "candidate_id": validated_data["candidate_id"],
-                    "candidate_name": validated_data["candidate_name"],
-                    "candidate_phone": validated_data["candidate_phone"],
-                    "candidate_email": validated_data["candidate_email"],
-                    "job_id": validated_data["job_id"],
-                    "conversation_text": validated_data["conversation_text"],
-                    "conversation_json": validated_data["conversation_json"],
-                    "message_count": validated_data["message_count"],
-                    "started_at": validated_data["started_at"],
-                    "ended_at": validated_data["ended_at"],
-                },
+                call_sid=call_sid,
+                defaults=get_conversation_fields(validated_data, turn_count),
             )
 
+            conversation.update_search_vector()
             response_serializer = InterviewCallConversationSerializer(conversation)
 
             return Response(
                 {
                     "success": True,
-                    "message": "Conversation saved successfully"
-                    if created
-                    else "Conversation updated successfully",
+                    "message": (
+                        "Conversation saved successfully"
+                        if created
+                        else "Conversation updated successfully"
+                    ),
                     "created": created,
                     "data": response_serializer.data,
                 },
@@ -67,16 +124,267 @@ class SaveConversationView(APIView):
             )
 
 
-class GetConversationView(APIView):
-    def get(self, request, call_sid):
+class BulkSaveConversationView(APIView):
+    """
+    Save many conversations in one request, creating or updating each by
+    call_sid with a constant number of queries.
+    """
+
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = ConversationBulkSaveSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid data", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The last entry wins when a call is sent more than once
+        items = {
+            item["call_sid"]: item
+            for item in serializer.validated_data["conversations"]
+        }
+        streamed = {
+            call_sid
+            for call_sid, item in items.items()
+            if "conversation_json" not in item
+        }
+        turn_messages = ConversationTurn.get_messages_for(list(streamed))
+
+        existing = {
+            conversation.call_sid: conversation
+            for conversation in InterviewCallConversation.objects.filter(
+                call_sid__in=list(items)
+            ).only("id", "call_sid", "created_at")
+        }
+        now = timezone.now()
+        texts = {}
+        to_create, to_update = [], []
+        for call_sid, item in items.items():
+            if call_sid in streamed:
+                messages = turn_messages.get(call_sid, [])
+                fields = get_conversation_fields(item, len(messages))
+                texts[call_sid] = render_transcript_text(messages)
+            else:
+                fields = get_conversation_fields(item)
+                texts[call_sid] = item.get("conversation_text") or (
+                    render_transcript_text(item["conversation_json"])
+                )
+
+            conversation = existing.get(call_sid)
+            if conversation is None:
+                to_create.append(InterviewCallConversation(call_sid=call_sid, **fields))
+            else:
+                for field, value in fields.items():
+                    setattr(conversation, field, value)
+                conversation.updated_at = now
+                to_update.append(conversation)
+
+        try:
+            with transaction.atomic():
+                InterviewCallConversation.objects.bulk_create(to_create)
+                if to_update:
+                    InterviewCallConversation.objects.bulk_update(
+                        to_update, [*fields, "updated_at"]
+                    )
+                InterviewCallConversation.update_search_vectors(
+                    to_create + to_update, texts
+                )
+        except Exception as e:
+            return Response(
+                {"error": "Failed to save conversations", "details": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        cache.delete_many([get_transcript_cache_key(call_sid) for call_sid in items])
+        return Response(
+            {"success": True, "created": len(to_create), "updated": len(to_update)},
+            status=status.HTTP_200_OK,
+        )
+
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+# ts_rank returns a float4, which does not survive a round trip through a
+# Python float. Ranks are ordered and compared as this exact decimal instead.
+SEARCH_RANK_FIELD = DecimalField(max_digits=16, decimal_places=8)
+
+
+def encode_search_cursor(rank, conversation_id):
+    return base64.urlsafe_b64encode(f"{rank}:{conversation_id}".encode()).decode()
+
+
+def decode_search_cursor(cursor):
+    rank, conversation_id = base64.urlsafe_b64decode(cursor.encode()).split(b":")
+    return Decimal(rank.decode()), int(conversation_id)
+
+
+class ConversationSearchView(APIView):
+    """
+    Full text search over the organization's transcripts, best matches first.
+
+    Pages are fetched with the next_cursor of the previous response, so deep
+    pages cost the same as the first one.
+    """
+
+    def get(self, request):
+        organization = request.user.get_organization()
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
-            organization = request.user.get_organization()
-            conversation = InterviewCallConversation.objects.get(
-                call_sid=call_sid, organization=organization
+            page_size = min(
+                max(int(request.query_params.get("page_size", SEARCH_PAGE_SIZE)), 1),
+                SEARCH_MAX_PAGE_SIZE,
             )
+            cursor = request.query_params.get("cursor")
+            cursor = decode_search_cursor(cursor) if cursor else None
+        except (ValueError, InvalidOperation):
+            return Response(
+                {"error": "Invalid page_size or cursor"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        query = SearchQuery(
+            text, search_type="websearch", config=TRANSCRIPT_SEARCH_CONFIG
+        )
+        conversations = (
+            InterviewCallConversation.objects.filter(
+                organization=organization, search_vector=query
+            )
+            .annotate(
+                rank=Cast(
+                    SearchRank(F("search_vector"), query),
+                    output_field=SEARCH_RANK_FIELD,
+                )
+            )
+            .order_by("-rank", "-id")
+        )
+        job_id = request.query_params.get("job_id")
+        if job_id:
+            conversations = conversations.filter(job_id=job_id)
+        if cursor:
+            rank, conversation_id = cursor
+            conversations = conversations.filter(
+                Q(rank__lt=rank) | Q(rank=rank, id__lt=conversation_id)
+            )
+
+        page = list(conversations.defer("search_vector")[: page_size + 1])
+        next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            next_cursor = encode_search_cursor(page[-1].rank, page[-1].id)
+
+        terms = [
+            term for term in re.findall(r"\w+", text) if term.lower() not in ("or",)
+        ]
+        serializer = ConversationSearchResultSerializer(
+            page, many=True, context={"terms": terms}
+        )
+        return Response(
+            {"results": serializer.data, "next_cursor": next_cursor},
+            status=status.HTTP_200_OK,
+        )
+
+
+class ConversationListView(ListAPIView):
+    serializer_class = ConversationListSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        queryset = InterviewCallConversation.objects.filter(
+            organization=organization
+        ).only(*ConversationListSerializer.Meta.fields, "id", "organization_id")
+        job_id = self.request.query_params.get("job_id")
+        if job_id:
+            queryset = queryset.filter(job_id=job_id)
+        return queryset
+
+
+class GetConversationView(APIView):
+    def get(self, request, call_sid):
+        organization = request.user.get_organization()
+        conversation = InterviewCallConversation.objects.filter(
+            call_sid=call_sid, organization=organization
+        ).first()
+        if conversation:
             serializer = InterviewCallConversationSerializer(conversation)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        except InterviewCallConversation.DoesNotExist:
+
+        # Conversations from archived months are read back from their archive
+        archived = ArchivedConversation.objects.filter(
+            call_sid=call_sid, organization=organization
+        ).first()
+        record = load_archived_conversation(archived) if archived else None
+        if record is None:
             return Response(
                 {"error": "Conversation not found"}, status=status.HTTP_404_NOT_FOUND
             )
+        return Response(record, status=status.HTTP_200_OK)
+
+
+class SaveConversationTurnsView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = ConversationTurnBatchSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid data", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        validated_data = serializer.validated_data
+        call_sid = validated_data["call_sid"]
+        turns = [
+            ConversationTurn(
+                organization_id=validated_data["organization_id"],
+                call_sid=call_sid,
+                **turn,
+            )
+            for turn in validated_data["turns"]
+        ]
+
+        try:
+            # Turns already received are skipped, so a batch can be resent safely
+            ConversationTurn.objects.bulk_create(turns, ignore_conflicts=True)
+        except Exception as e:
+            return Response(
+                {"error": "Failed to save conversation turns", "details": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        cache.delete(get_transcript_cache_key(call_sid))
+        return Response(
+            {"success": True, "received": len(turns)}, status=status.HTTP_201_CREATED
+        )
+
+
+class GetConversationTurnsView(APIView):
+    def get(self, request, call_sid):
+        organization = request.user.get_organization()
+        turns = ConversationTurn.objects.filter(
+            call_sid=call_sid, organization=organization
+        ).order_by("seq")
+
+        after = request.query_params.get("after")
+        if after is not None:
+            try:
+                turns = turns.filter(seq__gt=int(after))
+            except ValueError:
+                return Response(
+                    {"error": "after must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        serializer = ConversationTurnSerializer(turns, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
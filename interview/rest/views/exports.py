@@ -0,0 +1,53 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from interview.exports import iter_export_rows, stream_csv
+from interview.models import InterviewExport
+from interview.rest.serializers.exports import (
+    InterviewExportFilterSerializer,
+    InterviewExportSerializer,
+)
+from interview.tasks.exports import run_interview_export
+
+
+class InterviewCSVExportView(APIView):
+    """Stream the organization's interviews as CSV while they are read."""
+
+    def get(self, request):
+        serializer = InterviewExportFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = dict(serializer.validated_data)
+        include_transcripts = filters.pop("include_transcripts")
+
+        organization = request.user.get_organization()
+        rows = iter_export_rows(organization.id, filters, include_transcripts)
+        response = StreamingHttpResponse(stream_csv(rows), content_type="text/csv")
+        filename = f"interviews-{timezone.now():%Y%m%d-%H%M%S}.csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class InterviewExportCreateView(APIView):
+    """Build a CSV or XLSX export in the background and store it."""
+
+    def post(self, request):
+        serializer = InterviewExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        export = serializer.save(organization=request.user.get_organization())
+        run_interview_export.delay(export.id)
+        return Response(
+            InterviewExportSerializer(export).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class InterviewExportDetailView(RetrieveAPIView):
+    serializer_class = InterviewExportSerializer
+    lookup_field = "uid"
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        return InterviewExport.objects.filter(organization=organization)
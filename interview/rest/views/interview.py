@@ -1,8 +1,21 @@
-from rest_framework.generics import CreateAPIView, ListAPIView
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from rest_framework import status
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from interview.models import InterviewTaken
-from interview.rest.serializers.interview import InterviewTakenSerializer
+from common.pagination import CreatedAtCursorPagination
+from interview.models import (
+    ArchivedConversation,
+    InterviewCallConversation,
+    InterviewTaken,
+)
+from interview.rest.serializers.interview import (
+    InterviewTakenBulkSerializer,
+    InterviewTakenListSerializer,
+    InterviewTakenSerializer,
+)
 
 
 class InterviewTakenCreateView(CreateAPIView):
@@ -11,11 +24,47 @@ class InterviewTakenCreateView(CreateAPIView):
     permission_classes = [AllowAny]
 
 
+class InterviewTakenBulkCreateView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = InterviewTakenBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class InterviewTakenListView(ListAPIView):
-    serializer_class = InterviewTakenSerializer
+    """
+    Interviews without their transcripts and job details, which are served
+    by InterviewTakenDetailView.
+    """
+
+    serializer_class = InterviewTakenListSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         organization = user.get_organization()
-        queryset = InterviewTaken.objects.filter(organization=organization)
+        has_conversation = Q(
+            Exists(InterviewCallConversation.objects.filter(interview=OuterRef("pk")))
+        ) | Q(Exists(ArchivedConversation.objects.filter(interview_id=OuterRef("pk"))))
+        queryset = (
+            InterviewTaken.objects.filter(organization=organization)
+            .defer("job_details")
+            .annotate(
+                has_conversation=ExpressionWrapper(
+                    has_conversation, output_field=BooleanField()
+                )
+            )
+        )
         return queryset
+
+
+class InterviewTakenDetailView(RetrieveAPIView):
+    serializer_class = InterviewTakenSerializer
+    lookup_field = "uid"
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        return InterviewTaken.objects.filter(organization=organization)
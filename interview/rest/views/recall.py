@@ -5,8 +5,18 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from interview.models import AIPhoneCallConfig, InterviewTaken
-from interview.tasks import make_interview_call
+from interview.models import AIPhoneCallConfig, BulkRetryJob, InterviewTaken
+from interview.rest.serializers.retry import BulkRetryJobSerializer
+from interview.tasks import (
+    generate_welcome_audio,
+    get_welcome_text,
+    make_interview_call,
+)
+from interview.tasks.retry import (
+    DISCONNECTED_DECISIONS,
+    normalize_candidate_phone,
+    run_bulk_retry_job,
+)
 
 
 @api_view(["POST"])
@@ -18,7 +28,7 @@ def retry_disconnected_candidate(request, interview_id):
             uid=interview_id,
             organization=request.user.get_organization(),
         )
-        if interview.ai_decision not in ["user_disconnect", "network_disconnect"]:
+        if interview.ai_decision not in DISCONNECTED_DECISIONS:
             return Response(
                 {
                     "error": "This candidate was not disconnected",
@@ -35,24 +45,12 @@ def retry_disconnected_candidate(request, interview_id):
                 {"error": "No call configuration found for this organization"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        candidate_phone = interview.candidate_phone
-        if candidate_phone and not candidate_phone.startswith("+"):
-            if candidate_phone.startswith("0"):
-                candidate_phone = f"+44{candidate_phone[1:]}"
-            elif candidate_phone.startswith("44"):
-                candidate_phone = f"+{candidate_phone}"
-            else:
-                candidate_phone = f"+{candidate_phone}"
+        candidate_phone = normalize_candidate_phone(interview.candidate_phone)
         primary_questions = config.get_primary_questions()
-        from interview.tasks import generate_welcome_audio
-        welcome_text = (
-            f"Welcome to the {interview.organization.name} Platform and thank you for your "
-            f"application for the {interview.job_title} position. May I talk with you for "
-            f"some moments please?"
-        )
-
         welcome_audio_url, welcome_text = generate_welcome_audio(
-            welcome_text=welcome_text,
+            welcome_text=get_welcome_text(
+                interview.organization.name, interview.job_title
+            ),
             voice_id=config.voice_id,
         )
         make_interview_call.delay(
@@ -98,98 +96,31 @@ def retry_all_disconnected_candidates(request):
     organization_id = request.user.get_organization().id
     job_id = request.query_params.get("job_id")
     retry_limit = int(request.query_params.get("limit", 10))
-    try:
-        try:
-            config = AIPhoneCallConfig.objects.get(organization_id=organization_id)
-        except AIPhoneCallConfig.DoesNotExist:
-            return Response(
-                {"error": "No call configuration found for this organization"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        disconnected_interviews = InterviewTaken.objects.filter(
-            organization_id=organization_id,
-            ai_decision__in=["user_disconnect", "network_disconnect"],
+    if not AIPhoneCallConfig.objects.filter(organization_id=organization_id).exists():
+        return Response(
+            {"error": "No call configuration found for this organization"},
+            status=status.HTTP_404_NOT_FOUND,
         )
 
-        if job_id:
-            disconnected_interviews = disconnected_interviews.filter(job_id=job_id)
+    retry_job = BulkRetryJob.objects.create(
+        organization_id=organization_id,
+        job_id=job_id or None,
+        limit=retry_limit,
+    )
+    run_bulk_retry_job.delay(retry_job.id)
 
-        disconnected_interviews = disconnected_interviews[:retry_limit]
+    return Response(
+        BulkRetryJobSerializer(retry_job).data,
+        status=status.HTTP_202_ACCEPTED,
+    )
 
-        if not disconnected_interviews.exists():
-            return Response(
-                {"message": "No disconnected candidates found"},
-                status=status.HTTP_200_OK,
-            )
 
-        retried_count = 0
-        failed_retries = []
-
-        for i, interview in enumerate(disconnected_interviews):
-            try:
-                candidate_phone = interview.candidate_phone
-                if candidate_phone and not candidate_phone.startswith("+"):
-                    if candidate_phone.startswith("0"):
-                        candidate_phone = f"+44{candidate_phone[1:]}"
-                    elif candidate_phone.startswith("44"):
-                        candidate_phone = f"+{candidate_phone}"
-                    else:
-                        candidate_phone = f"+{candidate_phone}"
-                primary_questions = config.get_primary_questions()
-                from interview.tasks import generate_welcome_audio
-                welcome_text = (
-                    f"Welcome to the {interview.organization.name} Platform and thank you for your "
-                    f"application for the {interview.job_title} position. May I talk with you for "
-                    f"some moments please?"
-                )
-                welcome_audio_url, welcome_text = generate_welcome_audio(
-                    welcome_text=welcome_text,
-                    voice_id=config.voice_id,
-                )
-                countdown = i * 120
-
-                make_interview_call.apply_async(
-                    args=[
-                        candidate_phone,
-                        str(config.phone.phone_number),
-                        interview.organization_id,
-                        interview.application_id,
-                        "general",
-                        interview.candidate_name,
-                        interview.candidate_id,
-                        interview.job_title,
-                        interview.job_id,
-                        interview.job_details,
-                        primary_questions,
-                        config.end_call_if_primary_answer_negative,
-                        welcome_audio_url,
-                        welcome_text,
-                        config.voice_id,
-                        interview.candidate_email,
-                        True,
-                    ],
-                    countdown=countdown,
-                )
-                retried_count += 1
-
-            except Exception as e:
-                failed_retries.append(
-                    {"candidate_name": interview.candidate_name, "error": str(e)}
-                )
-
-        response_data = {
-            "message": f"Retry initiated for {retried_count} disconnected candidates",
-            "retried_count": retried_count,
-            "total_disconnected": disconnected_interviews.count(),
-        }
-
-        if failed_retries:
-            response_data["failed_retries"] = failed_retries
-
-        return Response(response_data, status=status.HTTP_200_OK)
-
-    except Exception as e:
-        return Response(
-            {"error": f"Failed to retry calls: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def retry_job_status(request, job_uid):
+    retry_job = get_object_or_404(
+        BulkRetryJob,
+        uid=job_uid,
+        organization=request.user.get_organization(),
+    )
+    return Response(BulkRetryJobSerializer(retry_job).data, status=status.HTTP_200_OK)
@@ -0,0 +1,83 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.generics import ListAPIView, ListCreateAPIView, RetrieveAPIView
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.pagination import CreatedAtCursorPagination, IdCursorPagination
+from interview.choices import CampaignStatus, RecipientStatus
+from interview.models import SMSCampaign, SMSCampaignRecipient
+from interview.rest.serializers.sms_campaigns import (
+    SMSCampaignRecipientSerializer,
+    SMSCampaignSerializer,
+)
+from interview.tasks.sms_campaigns import run_sms_campaign
+
+
+class SMSCampaignListCreateView(ListCreateAPIView):
+    serializer_class = SMSCampaignSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        return SMSCampaign.objects.filter(organization=organization)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        campaign = serializer.save(organization=request.user.get_organization())
+        run_sms_campaign.delay(campaign.id)
+        return Response(
+            SMSCampaignSerializer(campaign).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class SMSCampaignDetailView(RetrieveAPIView):
+    serializer_class = SMSCampaignSerializer
+    lookup_field = "uid"
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        return SMSCampaign.objects.filter(organization=organization)
+
+
+class SMSCampaignCancelView(APIView):
+    """Stop a campaign, its unsent recipients are skipped."""
+
+    def post(self, request, uid):
+        campaign = get_object_or_404(
+            SMSCampaign, uid=uid, organization=request.user.get_organization()
+        )
+        now = timezone.now()
+        # Conditional, so a campaign finishing meanwhile is not overwritten
+        cancelled = SMSCampaign.objects.filter(
+            id=campaign.id,
+            status__in=[CampaignStatus.PENDING, CampaignStatus.RUNNING],
+        ).update(status=CampaignStatus.CANCELLED, finished_at=now, updated_at=now)
+        campaign.refresh_from_db()
+        if not cancelled:
+            return Response(
+                {"error": f"Campaign is already {campaign.status.lower()}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        campaign.recipients.filter(status=RecipientStatus.PENDING).update(
+            status=RecipientStatus.SKIPPED, updated_at=now
+        )
+        return Response(SMSCampaignSerializer(campaign).data, status=status.HTTP_200_OK)
+
+
+class SMSCampaignRecipientListView(ListAPIView):
+    serializer_class = SMSCampaignRecipientSerializer
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        queryset = SMSCampaignRecipient.objects.filter(
+            campaign__uid=self.kwargs["uid"], campaign__organization=organization
+        )
+        recipient_status = self.request.query_params.get("status")
+        if recipient_status:
+            queryset = queryset.filter(status=recipient_status.upper())
+        return queryset
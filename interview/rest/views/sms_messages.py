@@ -0,0 +1,156 @@
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from twilio.request_validator import RequestValidator
+
+from common.pagination import CreatedAtCursorPagination
+from interview.choices import SMSStatus
+from interview.models import SMSMessage
+from interview.rest.serializers.sms_messages import SMSMessageSerializer
+from interview.tasks.sms_log import buffer_status_callback
+from phone_number.twilio_clients import get_account_credentials
+
+SMS_STATS_DEFAULT_DAYS = 30
+SMS_STATS_CACHE_TIMEOUT = 60
+UNDELIVERED_STATUSES = [SMSStatus.UNDELIVERED, SMSStatus.FAILED]
+
+
+class SMSStatusCallbackView(APIView):
+    """
+    Twilio message status callback. Callbacks are buffered and written in
+    batches, see interview.sms_log.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        # Unknown accounts get the same answer as bad signatures, so the
+        # endpoint does not reveal which account SIDs exist
+        account = get_account_credentials(request.data.get("AccountSid", ""))
+        if account is None:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        organization_id, auth_token = account
+        callback_url = settings.SMS_STATUS_CALLBACK_URL or (
+            request.build_absolute_uri()
+        )
+        if not RequestValidator(auth_token).validate(
+            callback_url,
+            request.POST,
+            request.headers.get("X-Twilio-Signature", ""),
+        ):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        buffer_status_callback(organization_id, request.data)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class SMSMessageListView(ListAPIView):
+    serializer_class = SMSMessageSerializer
+    pagination_class = CreatedAtCursorPagination
+
+    def get_queryset(self):
+        organization = self.request.user.get_organization()
+        queryset = SMSMessage.objects.filter(organization=organization).select_related(
+            "campaign"
+        )
+        message_status = self.request.query_params.get("status")
+        if message_status:
+            queryset = queryset.filter(status=message_status.lower())
+        campaign_uid = self.request.query_params.get("campaign")
+        if campaign_uid:
+            queryset = queryset.filter(campaign__uid=campaign_uid)
+        to_number = self.request.query_params.get("to_number")
+        if to_number:
+            queryset = queryset.filter(to_number=to_number)
+        return queryset
+
+
+def summarize(counts):
+    total = sum(counts.values())
+    delivered = counts.get(SMSStatus.DELIVERED, 0) + counts.get(SMSStatus.READ, 0)
+    undelivered = sum(counts.get(value, 0) for value in UNDELIVERED_STATUSES)
+    return {
+        "total": total,
+        "delivered": delivered,
+        "undelivered": undelivered,
+        "delivery_rate": (
+            round(delivered / (delivered + undelivered), 4)
+            if delivered + undelivered
+            else None
+        ),
+        "statuses": counts,
+    }
+
+
+class SMSDeliveryStatsView(APIView):
+    """
+    Message counts by status for the organization, per day and in total,
+    aggregated in the database and cached briefly.
+    """
+
+    def get(self, request):
+        organization = request.user.get_organization()
+        try:
+            end = date.fromisoformat(
+                request.query_params.get("end", date.today().isoformat())
+            )
+            start = date.fromisoformat(
+                request.query_params.get(
+                    "start",
+                    (end - timedelta(days=SMS_STATS_DEFAULT_DAYS - 1)).isoformat(),
+                )
+            )
+        except ValueError:
+            return Response(
+                {"error": "start and end must be dates in YYYY-MM-DD format"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        campaign_uid = request.query_params.get("campaign")
+
+        cache_key = f"sms_stats:{organization.id}:{start}:{end}:{campaign_uid or ''}"
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+        messages = SMSMessage.objects.filter(
+            organization=organization,
+            created_at__gte=timezone.make_aware(datetime.combine(start, time.min)),
+            created_at__lt=timezone.make_aware(
+                datetime.combine(end + timedelta(days=1), time.min)
+            ),
+        )
+        if campaign_uid:
+            messages = messages.filter(campaign__uid=campaign_uid)
+        rows = (
+            messages.annotate(day=TruncDate("created_at"))
+            .order_by()
+            .values("day", "status")
+            .annotate(count=Count("id"))
+        )
+
+        days, totals = {}, {}
+        for row in rows:
+            days.setdefault(row["day"], {})[row["status"]] = row["count"]
+            totals[row["status"]] = totals.get(row["status"], 0) + row["count"]
+        data = {
+            "start": start,
+            "end": end,
+            "summary": summarize(totals),
+            "days": [
+                {"day": day, **summarize(counts)}
+                for day, counts in sorted(days.items())
+            ],
+        }
+        cache.set(cache_key, data, SMS_STATS_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,303 @@
+"""
+Bulk SMS campaigns.
+
+Carriers and Twilio only accept a few messages per second from one number,
+anything faster is queued or filtered. Every sending number of the
+organization gets a token bucket refilled at the campaign's rate, and each
+message goes out from the number whose bucket frees up first, so the load is
+spread over all of them while none exceeds its rate.
+
+A campaign runs in slices of CAMPAIGN_SLICE_SECONDS under a lock per
+organization, since its numbers are shared with any other running campaign.
+Recipient state is saved after every batch, so a slice picks up where the
+last one stopped.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db.models import F
+from django.utils import timezone
+
+from common.choices import Status
+from contacts.models import Contacts
+from interview.choices import CampaignSource, CampaignStatus, RecipientStatus
+from interview.models import InterviewTaken, SMSCampaign, SMSCampaignRecipient
+from interview.sms_log import build_message, get_send_options, save_messages
+from phone_number.choices import PhoneNumberStatus
+from phone_number.models import TwilioPhoneNumber
+from phone_number.twilio_clients import get_organization_twilio_client
+
+SMS_BATCH_SIZE = 100
+RECIPIENT_INSERT_BATCH_SIZE = 1000
+CAMPAIGN_SLICE_SECONDS = 240
+# A sending number never bursts past its rate
+SENDER_BURST = 1
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def get_wait(self):
+        """Seconds until a token is available."""
+        self.refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self):
+        self.refill()
+        self.tokens -= 1
+
+
+def get_sender_numbers(organization_id):
+    return [
+        str(phone_number)
+        for phone_number in TwilioPhoneNumber.objects.filter(
+            organization_id=organization_id,
+            status=PhoneNumberStatus.ACTIVE,
+            sms_capable=True,
+        ).values_list("phone_number", flat=True)
+    ]
+
+
+def iter_campaign_recipients(campaign):
+    # interview.tasks imports this module
+    from interview.tasks.retry import normalize_candidate_phone
+
+    filters = campaign.filters
+    if campaign.source == CampaignSource.CONTACTS:
+        contacts = Contacts.objects.filter(
+            source__organization_id=campaign.organization_id,
+            status=Status.ACTIVE,
+            phone__isnull=False,
+        ).only("id", "first_name", "last_name", "phone")
+        for contact in contacts.iterator(chunk_size=RECIPIENT_INSERT_BATCH_SIZE):
+            yield SMSCampaignRecipient(
+                campaign=campaign,
+                contact_id=contact.id,
+                phone=str(contact.phone),
+                name=f"{contact.first_name} {contact.last_name}".strip(),
+            )
+        return
+
+    interviews = InterviewTaken.objects.filter(
+        organization_id=campaign.organization_id, candidate_phone__isnull=False
+    ).exclude(candidate_phone="")
+    if filters.get("job_id"):
+        interviews = interviews.filter(job_id=filters["job_id"])
+    if filters.get("ai_decision"):
+        interviews = interviews.filter(ai_decision=filters["ai_decision"])
+    if filters.get("start"):
+        interviews = interviews.filter(created_at__date__gte=filters["start"])
+    if filters.get("end"):
+        interviews = interviews.filter(created_at__date__lte=filters["end"])
+    interviews = interviews.only("id", "candidate_name", "candidate_phone")
+    for interview in interviews.iterator(chunk_size=RECIPIENT_INSERT_BATCH_SIZE):
+        yield SMSCampaignRecipient(
+            campaign=campaign,
+            interview_id=interview.id,
+            phone=normalize_candidate_phone(interview.candidate_phone),
+            name=interview.candidate_name,
+        )
+
+
+def create_campaign_recipients(campaign):
+    """Add the campaign's recipients once, a phone number at most once."""
+    batch = []
+    for recipient in iter_campaign_recipients(campaign):
+        batch.append(recipient)
+        if len(batch) >= RECIPIENT_INSERT_BATCH_SIZE:
+            SMSCampaignRecipient.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    SMSCampaignRecipient.objects.bulk_create(batch, ignore_conflicts=True)
+    return campaign.recipients.count()
+
+
+def render_message(template, recipient):
+    return template.replace("{name}", recipient.name or "").strip()
+
+
+class CampaignSender:
+    """
+    Sends a campaign's messages, paced by a token bucket per sending number.
+
+    Twilio calls run on a thread per number, so a slow request does not hold
+    back the other numbers.
+    """
+
+    def __init__(self, campaign, numbers):
+        self.campaign = campaign
+        self.numbers = numbers
+        self.buckets = {
+            number: TokenBucket(campaign.rate_per_number, SENDER_BURST)
+            for number in numbers
+        }
+        self.executor = ThreadPoolExecutor(max_workers=len(numbers))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def acquire_number(self):
+        """Wait for the first sending number with a free token and take it."""
+        while True:
+            number = min(self.numbers, key=lambda n: self.buckets[n].get_wait())
+            wait = self.buckets[number].get_wait()
+            if wait <= 0:
+                self.buckets[number].take()
+                return number
+            time.sleep(wait)
+
+    def send(self, recipient, from_number):
+        """Send one message, returning the recipient and its SMSMessage."""
+        recipient.from_number = from_number
+        try:
+            # Clients are per thread, this runs in the executor's threads
+            client = get_organization_twilio_client(self.campaign.organization_id)
+            sms = client.messages.create(
+                body=render_message(self.campaign.message, recipient),
+                from_=from_number,
+                to=recipient.phone,
+                **get_send_options(),
+            )
+            recipient.status = RecipientStatus.SENT
+            recipient.message_sid = sms.sid
+            recipient.sent_at = timezone.now()
+            message = build_message(
+                self.campaign.organization_id,
+                recipient.phone,
+                from_number,
+                sms=sms,
+                campaign_id=self.campaign.id,
+            )
+        except Exception as e:
+            recipient.status = RecipientStatus.FAILED
+            recipient.error = str(e)
+            message = build_message(
+                self.campaign.organization_id,
+                recipient.phone,
+                from_number,
+                error_message=str(e),
+                campaign_id=self.campaign.id,
+            )
+        return recipient, message
+
+    def send_batch(self, recipients):
+        futures = [
+            self.executor.submit(self.send, recipient, self.acquire_number())
+            for recipient in recipients
+        ]
+        results = [future.result() for future in futures]
+        recipients = [recipient for recipient, _ in results]
+        SMSCampaignRecipient.objects.bulk_update(
+            recipients, ["status", "from_number", "message_sid", "error", "sent_at"]
+        )
+        save_messages([message for _, message in results])
+        sent = sum(1 for r in recipients if r.status == RecipientStatus.SENT)
+        SMSCampaign.objects.filter(id=self.campaign.id).update(
+            sent=F("sent") + sent,
+            failed=F("failed") + len(recipients) - sent,
+            updated_at=timezone.now(),
+        )
+
+
+def fail_campaign(campaign, error, from_status):
+    """Mark the campaign FAILED, unless it left from_status in the meantime."""
+    now = timezone.now()
+    SMSCampaign.objects.filter(id=campaign.id, status=from_status).update(
+        status=CampaignStatus.FAILED, error=error, finished_at=now, updated_at=now
+    )
+    campaign.refresh_from_db(fields=["status", "error", "finished_at"])
+
+
+def start_campaign(campaign):
+    """
+    Create the recipients of a pending campaign and set it RUNNING. A campaign
+    cancelled while its recipients were created stays cancelled.
+    """
+    numbers = get_sender_numbers(campaign.organization_id)
+    if not numbers:
+        fail_campaign(
+            campaign, "No active SMS capable phone number found", CampaignStatus.PENDING
+        )
+        return numbers
+
+    total = create_campaign_recipients(campaign)
+    now = timezone.now()
+    started = SMSCampaign.objects.filter(
+        id=campaign.id, status=CampaignStatus.PENDING
+    ).update(
+        status=CampaignStatus.RUNNING,
+        sender_count=len(numbers),
+        started_at=now,
+        total=total,
+        updated_at=now,
+    )
+    if not started:
+        # The cancel skipped the recipients that existed at the time
+        campaign.recipients.filter(status=RecipientStatus.PENDING).update(
+            status=RecipientStatus.SKIPPED, updated_at=now
+        )
+    campaign.refresh_from_db(
+        fields=["status", "sender_count", "started_at", "total", "updated_at"]
+    )
+    return numbers
+
+
+def run_campaign_slice(campaign, slice_seconds=CAMPAIGN_SLICE_SECONDS):
+    """
+    Send pending messages of a campaign for up to slice_seconds.
+
+    Returns True when nothing is left to send.
+    """
+    if campaign.status == CampaignStatus.PENDING:
+        numbers = start_campaign(campaign)
+    else:
+        numbers = get_sender_numbers(campaign.organization_id)
+        if len(numbers) != campaign.sender_count:
+            campaign.sender_count = len(numbers)
+            campaign.save(update_fields=["sender_count", "updated_at"])
+    if campaign.status != CampaignStatus.RUNNING:
+        return True
+    if not numbers:
+        fail_campaign(
+            campaign, "No active SMS capable phone number found", CampaignStatus.RUNNING
+        )
+        return True
+
+    deadline = time.monotonic() + slice_seconds
+    sender = CampaignSender(campaign, numbers)
+    try:
+        while time.monotonic() < deadline:
+            # Cancelling only takes effect between batches
+            status = SMSCampaign.objects.values_list("status", flat=True).get(
+                id=campaign.id
+            )
+            if status != CampaignStatus.RUNNING:
+                return True
+            recipients = list(
+                campaign.recipients.filter(status=RecipientStatus.PENDING).order_by(
+                    "id"
+                )[:SMS_BATCH_SIZE]
+            )
+            if not recipients:
+                break
+            sender.send_batch(recipients)
+        else:
+            return False
+    finally:
+        sender.close()
+
+    # A campaign cancelled after the last batch stays cancelled
+    now = timezone.now()
+    SMSCampaign.objects.filter(id=campaign.id, status=CampaignStatus.RUNNING).update(
+        status=CampaignStatus.COMPLETED, finished_at=now, updated_at=now
+    )
+    return True
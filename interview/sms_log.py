@@ -0,0 +1,231 @@
+"""
+SMS message log and Twilio status callbacks.
+
+A busy campaign gets several status callbacks per message. Instead of a write
+per callback, the webhook pushes them on a Redis list and a flush task, run a
+few seconds after the first callback of a burst, folds them into one upsert
+per batch keyed by message SID. Callbacks arrive out of order, so a status is
+only replaced by one that comes later in the message's life.
+"""
+
+import uuid
+from datetime import datetime
+
+import orjson
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from common.redis_client import get_redis
+from interview.choices import SMSStatus
+from interview.models import SMSMessage
+
+SMS_STATUS_BUFFER_KEY = "sms_status_callbacks"
+SMS_STATUS_DEAD_LETTER_KEY = "sms_status_callbacks_failed"
+SMS_STATUS_FLUSH_BATCH_SIZE = 1000
+SMS_STATUS_MAX_ATTEMPTS = 5
+
+STATUS_RANKS = {
+    SMSStatus.ACCEPTED: 0,
+    SMSStatus.QUEUED: 0,
+    SMSStatus.SENDING: 1,
+    SMSStatus.SENT: 2,
+    SMSStatus.DELIVERED: 3,
+    SMSStatus.UNDELIVERED: 3,
+    SMSStatus.FAILED: 3,
+    SMSStatus.READ: 4,
+}
+
+MESSAGE_TABLE = SMSMessage._meta.db_table
+
+
+def get_status_rank_sql(column):
+    cases = " ".join(
+        f"WHEN '{status}' THEN {rank}" for status, rank in STATUS_RANKS.items()
+    )
+    return f"(CASE {column} {cases} ELSE 0 END)"
+
+
+UPSERT_MESSAGE_STATUS_SQL = f"""
+INSERT INTO {MESSAGE_TABLE} (
+    uid, created_at, updated_at, organization_id, message_sid,
+    from_number, to_number, status, error_code, error_message, status_updated_at
+)
+VALUES {{values}}
+ON CONFLICT (message_sid) DO UPDATE SET
+    status = EXCLUDED.status,
+    error_code = coalesce(EXCLUDED.error_code, {MESSAGE_TABLE}.error_code),
+    error_message = coalesce(EXCLUDED.error_message, {MESSAGE_TABLE}.error_message),
+    status_updated_at = EXCLUDED.status_updated_at,
+    updated_at = EXCLUDED.updated_at
+WHERE {get_status_rank_sql(f"{MESSAGE_TABLE}.status")}
+    <= {get_status_rank_sql("EXCLUDED.status")}
+"""
+
+
+def build_message(organization_id, to_number, from_number=None, sms=None, **kwargs):
+    """An SMSMessage for a message handed to Twilio, or for a failed send."""
+    if sms is not None:
+        kwargs.update(message_sid=sms.sid, status=sms.status or SMSStatus.QUEUED)
+    elif kwargs.get("error_message"):
+        kwargs.setdefault("status", SMSStatus.FAILED)
+    return SMSMessage(
+        organization_id=organization_id,
+        to_number=to_number,
+        from_number=from_number,
+        status_updated_at=timezone.now(),
+        **kwargs,
+    )
+
+
+def save_messages(messages):
+    """
+    Log sent messages. A status callback may have created a message's row
+    already, its status is kept.
+    """
+    return SMSMessage.objects.bulk_create(
+        messages,
+        update_conflicts=True,
+        unique_fields=["message_sid"],
+        update_fields=["campaign", "from_number", "to_number", "updated_at"],
+    )
+
+
+def get_send_options():
+    """Extra messages.create arguments, so Twilio reports delivery statuses."""
+    if settings.SMS_STATUS_CALLBACK_URL:
+        return {"status_callback": settings.SMS_STATUS_CALLBACK_URL}
+    return {}
+
+
+def parse_status_callback(organization_id, data):
+    return {
+        "organization_id": organization_id,
+        "message_sid": data.get("MessageSid") or data.get("SmsSid"),
+        "status": data.get("MessageStatus") or data.get("SmsStatus"),
+        "from_number": data.get("From"),
+        "to_number": data.get("To") or "",
+        "error_code": data.get("ErrorCode") or None,
+        "error_message": data.get("ErrorMessage") or None,
+        "received_at": timezone.now().isoformat(),
+    }
+
+
+def push_status_callback(callback):
+    get_redis().rpush(SMS_STATUS_BUFFER_KEY, orjson.dumps(callback))
+
+
+def pop_status_callbacks(batch_size=SMS_STATUS_FLUSH_BATCH_SIZE):
+    pipeline = get_redis().pipeline()
+    pipeline.lrange(SMS_STATUS_BUFFER_KEY, 0, batch_size - 1)
+    pipeline.ltrim(SMS_STATUS_BUFFER_KEY, batch_size, -1)
+    items, _ = pipeline.execute()
+    return items
+
+
+def merge_status_callbacks(callbacks):
+    """Keep the latest status of each message in a batch of callbacks."""
+    latest = {}
+    for callback in callbacks:
+        if not callback["message_sid"] or callback["status"] not in STATUS_RANKS:
+            continue
+        current = latest.get(callback["message_sid"])
+        if (
+            current is None
+            or STATUS_RANKS[callback["status"]] >= STATUS_RANKS[current["status"]]
+        ):
+            if current is not None:
+                callback["error_code"] = callback["error_code"] or current["error_code"]
+                callback["error_message"] = (
+                    callback["error_message"] or current["error_message"]
+                )
+            latest[callback["message_sid"]] = callback
+    return list(latest.values())
+
+
+def save_status_callbacks(callbacks):
+    now = timezone.now()
+    params = []
+    for callback in sorted(callbacks, key=lambda c: c["message_sid"]):
+        params.extend(
+            [
+                uuid.uuid4(),
+                now,
+                now,
+                callback["organization_id"],
+                callback["message_sid"],
+                callback["from_number"],
+                callback["to_number"],
+                callback["status"],
+                callback["error_code"],
+                callback["error_message"],
+                datetime.fromisoformat(callback["received_at"]),
+            ]
+        )
+    if not params:
+        return
+    # One statement per batch. SIDs are unique after merging, as ON CONFLICT
+    # can not update a row twice, and sorted so concurrent flushes lock rows
+    # in the same order.
+    values = ", ".join([f"({', '.join(['%s'] * 11)})"] * len(callbacks))
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_MESSAGE_STATUS_SQL.replace("{values}", values), params)
+
+
+def save_status_callbacks_one_by_one(callbacks):
+    """Save callbacks separately, returning the ones that failed."""
+    failed = []
+    for callback in callbacks:
+        try:
+            save_status_callbacks([callback])
+        except Exception as e:
+            callback["error"] = str(e)
+            failed.append(callback)
+    return failed
+
+
+def requeue_status_callbacks(callbacks):
+    """
+    Put failed callbacks back for the next flush, or on the dead letter list
+    once they have failed SMS_STATUS_MAX_ATTEMPTS times.
+    """
+    retry = [c for c in callbacks if c["attempts"] < SMS_STATUS_MAX_ATTEMPTS]
+    dead = [c for c in callbacks if c["attempts"] >= SMS_STATUS_MAX_ATTEMPTS]
+    pipeline = get_redis().pipeline()
+    if retry:
+        pipeline.rpush(SMS_STATUS_BUFFER_KEY, *[orjson.dumps(c) for c in retry])
+    if dead:
+        pipeline.rpush(SMS_STATUS_DEAD_LETTER_KEY, *[orjson.dumps(c) for c in dead])
+        print(f"Moved {len(dead)} SMS status callbacks to {SMS_STATUS_DEAD_LETTER_KEY}")
+    pipeline.execute()
+
+
+def has_buffered_status_callbacks():
+    return bool(get_redis().llen(SMS_STATUS_BUFFER_KEY))
+
+
+def flush_status_callbacks(batch_size=SMS_STATUS_FLUSH_BATCH_SIZE):
+    """
+    Write buffered callbacks, returning how many were read. A batch that
+    fails is saved one callback at a time, so a bad callback only holds up
+    itself. The flush stops after such a batch instead of cycling through
+    the callbacks it put back.
+    """
+    count = 0
+    while True:
+        items = pop_status_callbacks(batch_size)
+        if not items:
+            return count
+        count += len(items)
+        callbacks = merge_status_callbacks([orjson.loads(item) for item in items])
+        try:
+            save_status_callbacks(callbacks)
+        except Exception as e:
+            print(f"Saving SMS status callbacks failed, retrying one by one: {e}")
+            failed = save_status_callbacks_one_by_one(callbacks)
+            if not failed:
+                continue
+            for callback in failed:
+                callback["attempts"] = callback.get("attempts", 0) + 1
+            requeue_status_callbacks(failed)
+            return count
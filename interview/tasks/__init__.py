@@ -1 +1,7 @@
 from .ai_phone import *
+from .archive import *
+from .exports import *
+from .retry import *
+from .status_updates import *
+from .sms_campaigns import *
+from .sms_log import *
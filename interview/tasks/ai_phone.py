@@ -1,6 +1,6 @@
 import os
-import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import requests
@@ -9,9 +9,16 @@ from django.core.files.base import ContentFile
 from dotenv import load_dotenv
 from subscription.choices import FeatureType
 from subscription.models import Subscription
+from subscription.utils import (
+    consume_call_quota,
+    release_call_quota,
+    reserve_call_quota,
+)
 
 from common.choices import Status
 from interview.models import AIPhoneCallConfig, InterviewTaken
+from interview.tasks.status_updates import queue_application_status_update
+from organizations.jobadder import JobAdderClient
 from organizations.models import Organization
 
 load_dotenv()
@@ -19,6 +26,7 @@ load_dotenv()
 BASE_API_URL = os.getenv("CALLING_BASE_URL", "http://localhost:5050")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1/text-to-speech"
+CALL_SPACING_SECONDS = 120
 
 
 def generate_welcome_audio(welcome_text: str, voice_id: str) -> str:
@@ -80,6 +88,14 @@ def generate_welcome_audio(welcome_text: str, voice_id: str) -> str:
         raise RuntimeError(f"Audio generation failed: {e}")
 
 
+def get_welcome_text(organization_name: str, job_title: str) -> str:
+    return (
+        f"Welcome to the {organization_name} Platform and thank you for your "
+        f"application for the {job_title} position. May I talk with you for "
+        f"some moments please?"
+    )
+
+
 @shared_task(max_retries=3)
 def make_interview_call(
     to_number: str,
@@ -99,6 +115,7 @@ def make_interview_call(
     voice_id: str = "SQ1QAX1hsTZ1d6O0dCWA",
     candidate_email: str = None,
     is_retry: bool = False,
+    reservation_id: int = None,
 ):
     try:
         is_taken = False
@@ -135,37 +152,23 @@ def make_interview_call(
             )
             response.raise_for_status()
             print("Call initiated successfully")
-            update_application_status_after_call(organization_id, application_id)
+            consume_call_quota(reservation_id)
+            queue_application_status_update(organization_id, application_id)
 
         else:
+            release_call_quota(reservation_id)
             print(
                 f"Already called for an interview candidate_id:{candidate_id}, application:{application_id}"
             )
 
     except Exception as exc:
+        release_call_quota(reservation_id)
         print(f"Error making call to {to_number}: {str(exc)}")
 
 
 def fetch_job_details(job_self_url: str, config):
-    access_token = config.platform.access_token
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-
     try:
-        response = requests.get(job_self_url, headers=headers, timeout=30)
-        if response.status_code == 401:
-            print("Access token expired, refreshing...")
-            access_token = config.platform.refresh_access_token()
-            if not access_token:
-                print("Error: Could not refresh access token")
-                return {}
-
-            headers["Authorization"] = f"Bearer {access_token}"
-            response = requests.get(job_self_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        job_data = response.json()
+        job_data = JobAdderClient(config.platform).get_json(job_self_url)
 
         return {
             "description": job_data.get("description", ""),
@@ -187,54 +190,45 @@ def fetch_job_details(job_self_url: str, config):
 def update_application_status_after_call(
     organization_id: int, application_id: int, status_id=None
 ):
-    try:
-        config = AIPhoneCallConfig.objects.get(organization_id=organization_id)
-        if not status_id:
-            status_id = getattr(config, "status_when_call_is_placed", None)
+    queue_application_status_update(organization_id, application_id, status_id)
 
-        if not status_id:
-            print(
-                f"No status_when_call_is_placed configured for organization {organization_id}"
-            )
-            return
 
-        jobadder_api_url = f"{config.platform.base_url}/applications/{application_id}"
+@dataclass(slots=True, frozen=True)
+class JobCall:
+    """Per job data shared by every candidate called for that job."""
 
-        access_token = config.platform.access_token
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+    job_ad_id: int
+    job_title: str
+    job_details: dict
+    welcome_message_audio_url: str
+    welcome_text: str
 
-        payload = {"statusId": status_id}
 
-        response = requests.put(
-            jobadder_api_url, json=payload, headers=headers, timeout=10
-        )
+@dataclass(slots=True, frozen=True)
+class CandidateCall:
+    """Fields of a JobAdder application needed to place one interview call."""
 
-        if response.status_code == 401:
-            print("Access token expired, refreshing...")
-            access_token = config.platform.refresh_access_token()
-            if not access_token:
-                print("Error: Could not refresh access token")
-                return
+    to_number: str
+    application_id: int
+    candidate_id: int
+    candidate_name: str
+    candidate_email: str
+    job: JobCall
 
-            headers["Authorization"] = f"Bearer {access_token}"
-            response = requests.put(
-                jobadder_api_url, json=payload, headers=headers, timeout=10
-            )
 
-        response.raise_for_status()
-        print(
-            f"Successfully updated application {application_id} status to {status_id}"
-        )
+def get_candidate_phone(candidate: dict) -> str:
+    candidate_phone = candidate.get("mobile", "")
+    if len(candidate_phone) == 0:
+        candidate_phone = candidate.get("phone", "")
 
-    except AIPhoneCallConfig.DoesNotExist:
-        print(f"No config found for organization {organization_id}")
-    except requests.RequestException as e:
-        print(f"Failed to update JobAdder application status: {str(e)}")
-    except Exception as e:
-        print(f"Unexpected error updating application status: {str(e)}")
+    if candidate_phone and not candidate_phone.startswith("+44"):
+        if candidate_phone.startswith("0"):
+            candidate_phone = f"+44{candidate_phone[1:]}"
+        elif candidate_phone.startswith("+0"):
+            candidate_phone = f"+44{candidate_phone[2:]}"
+        elif candidate_phone.startswith("44"):
+            candidate_phone = f"+{candidate_phone}"
+    return candidate_phone
 
 
 def has_enough_time_passed(updated_at_str: str, waiting_duration_minutes: int) -> bool:
@@ -251,7 +245,6 @@ def has_enough_time_passed(updated_at_str: str, waiting_duration_minutes: int) -
 @shared_task
 def fetch_platform_candidates(config):
     access_token = config.platform.access_token
-    primary_questions = config.get_primary_questions()
     waiting_duration = config.calling_time_after_status_update
     organization_name = config.organization.name  # Get organization name
 
@@ -259,143 +252,87 @@ def fetch_platform_candidates(config):
         print("Error: Could not get JobAdder access token")
         return []
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
-
+    client = JobAdderClient(config.platform)
     candidates = []
 
     try:
-        jobs_response = requests.get(
-            f"{config.platform.base_url}/jobads",
-            headers=headers,
-            timeout=30,
-        )
-        if jobs_response.status_code == 401:
-            print("Access token expired, refreshing...")
-            access_token = config.platform.refresh_access_token()
-            if not access_token:
-                print("Error: Could not refresh access token")
-                return []
-
-            headers["Authorization"] = f"Bearer {access_token}"
-            jobs_response = requests.get(
-                f"{config.platform.base_url}/jobads",
-                headers=headers,
-                timeout=30,
-            )
-
-        jobs_response.raise_for_status()
-        jobs_data = jobs_response.json()
-
-        print(f"Found {len(jobs_data.get('items', []))} live jobs")
-        for job in jobs_data.get("items", []):
-            time.sleep(0.5)
-            if job.get("state") == config.jobad_status_for_calling:
-                ad_id = job.get("adId")
-                job_title = job.get("title")
-                job_self_url = job.get("links", {}).get("self")
-                applications_url = job.get("links", {}).get("applications")
-                if not applications_url:
-                    print(f"No applications link found for job: {job_title}")
-                    continue
-                job_details = fetch_job_details(job_self_url, config)
-                welcome_text = (
-                    f"Welcome to the {organization_name} Platform and thank you for your "
-                    f"application for the {job_title} position. May I talk with you for "
-                    f"some moments please?"
-                )
-                # Generate welcome audio for this job
-                welcome_audio_url, welcome_text = generate_welcome_audio(
-                    welcome_text=welcome_text,
-                    voice_id=config.voice_id,
-                )
-
-                try:
-                    applications_response = requests.get(
-                        applications_url,
-                        headers=headers,
-                        timeout=30,
-                    )
-                    if applications_response.status_code == 401:
-                        access_token = config.platform.refresh_access_token()
-                        if access_token:
-                            headers["Authorization"] = f"Bearer {access_token}"
-                            applications_response = requests.get(
-                                applications_url,
-                                headers=headers,
-                                timeout=30,
-                            )
-
-                    applications_response.raise_for_status()
-                    applications_data = applications_response.json()
-
-                    for application in applications_data.get("items", []):
-                        application_id = application.get("applicationId")
-                        candidate = application.get("candidate", {})
-                        candidate_id = candidate.get("candidateId")
-                        candidate_first_name = candidate.get("firstName", "")
-                        candidate_last_name = candidate.get("lastName", "")
-                        candidate_email = candidate.get("email", "")
-                        candidate_phone = candidate.get("mobile", "")
-                        updated_at = application.get("updatedAt", "")
-                        status = application.get("status")
-
-                        if len(candidate_phone) == 0:
-                            candidate_phone = candidate.get("phone", "")
-
-                        if candidate_phone and not candidate_phone.startswith("+44"):
-                            if candidate_phone.startswith("0"):
-                                candidate_phone = f"+44{candidate_phone[1:]}"
-                            elif candidate_phone.startswith("+0"):
-                                candidate_phone = f"+44{candidate_phone[2:]}"
-                            elif candidate_phone.startswith("44"):
-                                candidate_phone = f"+{candidate_phone}"
-
-                        if (
-                            status.get("statusId")
-                            == config.application_status_for_calling
-                            and has_enough_time_passed(updated_at, waiting_duration)
-                            and len(candidate_phone) > 0 and candidate_id == 16995516
-                        ):
-                            candidate_data = {
-                                "to_number": candidate_phone,
-                                "from_phone_number": str(config.phone.phone_number),
-                                "organization_id": config.organization_id,
-                                "application_id": application_id,
-                                "candidate_id": candidate_id,
-                                "candidate_name": f"{candidate_first_name} {candidate_last_name}",
-                                "candidate_email": candidate_email,
-                                "job_title": job_title,
-                                "job_ad_id": ad_id,
-                                "job_details": job_details,
-                                "interview_type": "general",
-                                "primary_questions": primary_questions,
-                                "should_end_if_primary_question_failed": config.end_call_if_primary_answer_negative,
-                                "welcome_message_audio_url": welcome_audio_url,
-                                "welcome_text": welcome_text,
-                                "voice_id": config.voice_id,
-                            }
-
-                            candidates.append(candidate_data)
-                            print(
-                                f"Added candidate: {candidate_first_name} {candidate_last_name} for job: {job_title}"
+        job_count = 0
+        for job in client.iter_items("jobads"):
+            job_count += 1
+            if job.get("state") != config.jobad_status_for_calling:
+                continue
+
+            ad_id = job.get("adId")
+            job_title = job.get("title")
+            job_self_url = job.get("links", {}).get("self")
+            applications_url = job.get("links", {}).get("applications")
+            if not applications_url:
+                print(f"No applications link found for job: {job_title}")
+                continue
+
+            # Job details and welcome audio are only built once a candidate
+            # of this job actually qualifies for a call
+            job_call = None
+
+            try:
+                for application in client.iter_items(applications_url):
+                    candidate = application.get("candidate", {})
+                    candidate_first_name = candidate.get("firstName", "")
+                    candidate_last_name = candidate.get("lastName", "")
+                    candidate_phone = get_candidate_phone(candidate)
+                    candidate_id = candidate.get("candidateId")
+                    updated_at = application.get("updatedAt", "")
+                    status = application.get("status")
+
+                    if (
+                        status.get("statusId") == config.application_status_for_calling
+                        and has_enough_time_passed(updated_at, waiting_duration)
+                        and len(candidate_phone) > 0
+                        and candidate_id == 16995516
+                    ):
+                        if job_call is None:
+                            # Generate welcome audio for this job
+                            welcome_audio_url, welcome_text = generate_welcome_audio(
+                                welcome_text=get_welcome_text(
+                                    organization_name, job_title
+                                ),
+                                voice_id=config.voice_id,
                             )
-                        elif (
-                            job.get("state") == config.jobad_status_for_calling
-                            and application.get("statusId")
-                            == config.application_status_for_calling
-                        ):
-                            print(
-                                f"Skipped candidate: {candidate_first_name} {candidate_last_name} - "
-                                f"waiting period not elapsed (updated: {updated_at})"
+                            job_call = JobCall(
+                                job_ad_id=ad_id,
+                                job_title=job_title,
+                                job_details=fetch_job_details(job_self_url, config),
+                                welcome_message_audio_url=welcome_audio_url,
+                                welcome_text=welcome_text,
                             )
 
-                except Exception as e:
-                    print(f"Error fetching applications for job {job_title}: {str(e)}")
-                    continue
-
+                        candidates.append(
+                            CandidateCall(
+                                to_number=candidate_phone,
+                                application_id=application.get("applicationId"),
+                                candidate_id=candidate_id,
+                                candidate_name=f"{candidate_first_name} {candidate_last_name}",
+                                candidate_email=candidate.get("email", ""),
+                                job=job_call,
+                            )
+                        )
+                        print(
+                            f"Added candidate: {candidate_first_name} {candidate_last_name} for job: {job_title}"
+                        )
+                    elif (
+                        application.get("statusId")
+                        == config.application_status_for_calling
+                    ):
+                        print(
+                            f"Skipped candidate: {candidate_first_name} {candidate_last_name} - "
+                            f"waiting period not elapsed (updated: {updated_at})"
+                        )
+
+            except Exception as e:
+                print(f"Error fetching applications for job {job_title}: {str(e)}")
+                continue
+
+        print(f"Found {job_count} live jobs")
         print(f"Total candidates collected: {len(candidates)}")
         return candidates
 
@@ -407,7 +344,9 @@ def fetch_platform_candidates(config):
 @shared_task
 def bulk_interview_calls(organization_id: int = None):
     try:
-        config = AIPhoneCallConfig.objects.get(organization_id=organization_id)
+        config = AIPhoneCallConfig.objects.select_related(
+            "organization", "platform", "phone"
+        ).get(organization_id=organization_id)
     except:
         print(f"No call configuration found for organization_{organization_id}")
         return
@@ -416,27 +355,41 @@ def bulk_interview_calls(organization_id: int = None):
     if not candidates:
         return {"error": "No candidates provided or fetched"}
 
-    for i, candidate in enumerate(candidates):
-        countdown = i * 120
+    reservations = reserve_call_quota(
+        organization_id,
+        [candidate.application_id for candidate in candidates],
+        spacing_seconds=CALL_SPACING_SECONDS,
+    )
+    if len(reservations) < len(candidates):
+        print(
+            f"Quota reached for organization_{organization_id}: "
+            f"dispatching {len(reservations)} of {len(candidates)} candidates"
+        )
+
+    from_phone_number = str(config.phone.phone_number)
+    primary_questions = config.get_primary_questions()
+    for i, (candidate, reservation) in enumerate(zip(candidates, reservations)):
+        countdown = i * CALL_SPACING_SECONDS
         make_interview_call.apply_async(
             args=[
-                candidate["to_number"],
-                candidate["from_phone_number"],
-                candidate["organization_id"],
-                candidate["application_id"],
-                candidate.get("interview_type", "general"),
-                candidate.get("candidate_name"),
-                candidate.get("candidate_id"),
-                candidate.get("job_title"),
-                candidate.get("job_ad_id"),
-                candidate.get("job_details"),
-                candidate.get("primary_questions"),
-                candidate.get("should_end_if_primary_question_failed"),
-                candidate.get("welcome_message_audio_url"),
-                candidate.get("welcome_text"),
-                candidate.get("voice_id"),
-                candidate.get("candidate_email"),
+                candidate.to_number,
+                from_phone_number,
+                config.organization_id,
+                candidate.application_id,
+                "general",
+                candidate.candidate_name,
+                candidate.candidate_id,
+                candidate.job.job_title,
+                candidate.job.job_ad_id,
+                candidate.job.job_details,
+                primary_questions,
+                config.end_call_if_primary_answer_negative,
+                candidate.job.welcome_message_audio_url,
+                candidate.job.welcome_text,
+                config.voice_id,
+                candidate.candidate_email,
             ],
+            kwargs={"reservation_id": reservation.id},
             countdown=countdown,
         )
 
@@ -1,6 +1,8 @@
 from celery import shared_task
 
-from phone_number.models import TwilioSubAccount
+from interview.choices import SMSStatus
+from interview.sms_log import build_message, get_send_options, save_messages
+from phone_number.twilio_clients import get_organization_twilio_client
 
 
 @shared_task
@@ -9,24 +11,20 @@ def send_sms_message(
 ) -> bool:
     """Send SMS message via Twilio or SMS service"""
     try:
-        # Import Twilio client
-        from twilio.rest import Client
-
-        twillio_sub_account = TwilioSubAccount.objects.get(
-            organization_id=organization_id
-        )
-        account_sid = twillio_sub_account.twilio_account_sid
-        auth_token = twillio_sub_account.twilio_auth_token
-
-        twilio_client = Client(account_sid, auth_token)
+        twilio_client = get_organization_twilio_client(organization_id)
 
         sms = twilio_client.messages.create(
-            body=message, from_=from_number, to=to_number
+            body=message, from_=from_number, to=to_number, **get_send_options()
         )
 
         print(f"SMS sent successfully: {sms.sid}")
-        return True
+        sms_message = build_message(organization_id, to_number, from_number, sms=sms)
 
     except Exception as e:
         print(f"Error sending SMS: {str(e)}")
-        return False
+        sms_message = build_message(
+            organization_id, to_number, from_number, error_message=str(e)
+        )
+
+    save_messages([sms_message])
+    return sms_message.status != SMSStatus.FAILED
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from interview.archive import create_conversation_partitions
+
+
+@shared_task
+def create_upcoming_conversation_partitions():
+    created = create_conversation_partitions()
+    print(f"Created {len(created)} conversation partitions")
@@ -0,0 +1,37 @@
+from celery import shared_task
+from django.utils import timezone
+
+from interview.choices import ExportStatus
+from interview.exports import write_export
+from interview.models import InterviewExport
+
+
+@shared_task
+def run_interview_export(export_id: int):
+    try:
+        export = InterviewExport.objects.get(id=export_id)
+    except InterviewExport.DoesNotExist:
+        print(f"No interview export found with id {export_id}")
+        return
+
+    export.status = ExportStatus.RUNNING
+    export.save(update_fields=["status", "updated_at"])
+
+    try:
+        export.row_count = write_export(export)
+        export.status = ExportStatus.COMPLETED
+    except Exception as e:
+        print(f"Interview export {export_id} failed: {str(e)}")
+        export.status = ExportStatus.FAILED
+        export.error = str(e)
+    export.finished_at = timezone.now()
+    export.save(
+        update_fields=[
+            "status",
+            "row_count",
+            "file_path",
+            "error",
+            "finished_at",
+            "updated_at",
+        ]
+    )
@@ -0,0 +1,394 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from interview.choices import RetryJobStatus
+from interview.models import (
+    AIPhoneCallConfig,
+    BulkRetryJob,
+    InterviewTaken,
+    RetryPolicy,
+    ScheduledRetry,
+)
+from interview.tasks.ai_phone import (
+    CALL_SPACING_SECONDS,
+    generate_welcome_audio,
+    get_welcome_text,
+    make_interview_call,
+)
+from subscription.utils import release_call_quota, reserve_call_quota
+
+DISCONNECTED_DECISIONS = ["user_disconnect", "network_disconnect"]
+RETRY_DISPATCH_BATCH_SIZE = 500
+# Bulk retry job progress is saved every this many candidates
+RETRY_JOB_SAVE_INTERVAL = 25
+# How long due retries are put back when they can not be placed, so they do
+# not hold up other organizations' retries
+RETRY_POSTPONE_DELAY = timedelta(hours=1)
+RETRY_JOB_PROGRESS_FIELDS = ["results", "processed", "retried", "failed", "updated_at"]
+
+
+def normalize_candidate_phone(candidate_phone):
+    if candidate_phone and not candidate_phone.startswith("+"):
+        if candidate_phone.startswith("0"):
+            candidate_phone = f"+44{candidate_phone[1:]}"
+        elif candidate_phone.startswith("44"):
+            candidate_phone = f"+{candidate_phone}"
+        else:
+            candidate_phone = f"+{candidate_phone}"
+    return candidate_phone
+
+
+class RetryDispatcher:
+    """
+    Places retry calls for one organization.
+
+    Config derived values are looked up once and welcome greetings are
+    generated once per job title, however many candidates are retried.
+    """
+
+    def __init__(self, config, organization_name):
+        self.config = config
+        self.organization_name = organization_name
+        self.from_phone_number = str(config.phone.phone_number)
+        self.primary_questions = config.get_primary_questions()
+        self.greetings = {}
+
+    def get_greeting(self, job_title):
+        greeting = self.greetings.get(job_title)
+        if greeting is None:
+            greeting = generate_welcome_audio(
+                welcome_text=get_welcome_text(self.organization_name, job_title),
+                voice_id=self.config.voice_id,
+            )
+            self.greetings[job_title] = greeting
+        return greeting
+
+    def dispatch(self, interview, countdown=0, reservation_id=None):
+        candidate_phone = normalize_candidate_phone(interview.candidate_phone)
+        welcome_audio_url, welcome_text = self.get_greeting(interview.job_title)
+        make_interview_call.apply_async(
+            args=[
+                candidate_phone,
+                self.from_phone_number,
+                interview.organization_id,
+                interview.application_id,
+                "general",
+                interview.candidate_name,
+                interview.candidate_id,
+                interview.job_title,
+                interview.job_id,
+                interview.job_details,
+                self.primary_questions,
+                self.config.end_call_if_primary_answer_negative,
+                welcome_audio_url,
+                welcome_text,
+                self.config.voice_id,
+                interview.candidate_email,
+                True,
+            ],
+            kwargs={"reservation_id": reservation_id},
+            countdown=countdown,
+        )
+        return candidate_phone
+
+
+@shared_task
+def run_bulk_retry_job(retry_job_id: int):
+    try:
+        retry_job = BulkRetryJob.objects.select_related("organization").get(
+            id=retry_job_id
+        )
+    except BulkRetryJob.DoesNotExist:
+        print(f"No bulk retry job found with id {retry_job_id}")
+        return
+
+    try:
+        process_bulk_retry_job(retry_job)
+    except Exception as e:
+        print(f"Bulk retry job {retry_job_id} failed: {str(e)}")
+        retry_job.status = RetryJobStatus.FAILED
+        retry_job.error = str(e)
+        retry_job.finished_at = timezone.now()
+        retry_job.save(
+            update_fields=["status", "error", "finished_at", *RETRY_JOB_PROGRESS_FIELDS]
+        )
+
+
+def process_bulk_retry_job(retry_job):
+    config = (
+        AIPhoneCallConfig.objects.select_related("phone")
+        .filter(organization_id=retry_job.organization_id)
+        .first()
+    )
+    if config is None:
+        retry_job.status = RetryJobStatus.FAILED
+        retry_job.error = "No call configuration found for this organization"
+        retry_job.finished_at = timezone.now()
+        retry_job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return
+
+    interviews = InterviewTaken.objects.filter(
+        organization_id=retry_job.organization_id,
+        ai_decision__in=DISCONNECTED_DECISIONS,
+    )
+    if retry_job.job_id:
+        interviews = interviews.filter(job_id=retry_job.job_id)
+    interviews = list(interviews[: retry_job.limit])
+
+    retry_job.status = RetryJobStatus.RUNNING
+    retry_job.total = len(interviews)
+    retry_job.save(update_fields=["status", "total", "updated_at"])
+
+    dispatcher = RetryDispatcher(config, retry_job.organization.name)
+    # Candidates beyond the remaining quota are reported as failed
+    reservations = reserve_call_quota(
+        retry_job.organization_id,
+        [interview.application_id for interview in interviews],
+        spacing_seconds=CALL_SPACING_SECONDS,
+    )
+    for i, interview in enumerate(interviews):
+        result = {
+            "interview_uid": str(interview.uid),
+            "candidate_name": interview.candidate_name,
+            "job_title": interview.job_title,
+        }
+        reservation = reservations[i] if i < len(reservations) else None
+        if reservation is None:
+            result.update({"status": "failed", "error": "Call quota exhausted"})
+            retry_job.failed += 1
+        else:
+            try:
+                candidate_phone = dispatcher.dispatch(
+                    interview,
+                    countdown=i * CALL_SPACING_SECONDS,
+                    reservation_id=reservation.id,
+                )
+                result.update({"status": "retried", "candidate_phone": candidate_phone})
+                retry_job.retried += 1
+            except Exception as e:
+                release_call_quota(reservation.id)
+                result.update({"status": "failed", "error": str(e)})
+                retry_job.failed += 1
+
+        retry_job.results.append(result)
+        retry_job.processed += 1
+        if retry_job.processed % RETRY_JOB_SAVE_INTERVAL == 0:
+            retry_job.save(update_fields=RETRY_JOB_PROGRESS_FIELDS)
+
+    retry_job.status = RetryJobStatus.COMPLETED
+    retry_job.finished_at = timezone.now()
+    retry_job.save(update_fields=["status", "finished_at", *RETRY_JOB_PROGRESS_FIELDS])
+
+
+def schedule_call_retry(interview):
+    """
+    Update the automatic retry state of an application after a call result.
+
+    Disconnected calls are scheduled according to the organization's retry
+    policy, any other outcome cancels a pending retry.
+    """
+    if not interview.application_id:
+        return None
+
+    if interview.ai_decision not in DISCONNECTED_DECISIONS:
+        ScheduledRetry.objects.filter(
+            organization_id=interview.organization_id,
+            application_id=interview.application_id,
+            next_retry_at__isnull=False,
+        ).update(next_retry_at=None, updated_at=timezone.now())
+        return None
+
+    policy = RetryPolicy.objects.filter(
+        organization_id=interview.organization_id, is_enabled=True
+    ).first()
+    if policy is None:
+        return None
+
+    scheduled_retry, _ = ScheduledRetry.objects.get_or_create(
+        organization_id=interview.organization_id,
+        application_id=interview.application_id,
+        defaults={"interview": interview},
+    )
+    scheduled_retry.interview = interview
+    scheduled_retry.next_retry_at = policy.get_next_retry_at(
+        scheduled_retry.attempts, timezone.now()
+    )
+    scheduled_retry.save(update_fields=["interview", "next_retry_at", "updated_at"])
+    return scheduled_retry
+
+
+def schedule_call_retries(organization_id, interviews):
+    """schedule_call_retry for many call results of one organization at once"""
+    # The latest result of an application decides its retry state
+    latest = {
+        interview.application_id: interview
+        for interview in interviews
+        if interview.application_id
+    }
+    cancelled = [
+        application_id
+        for application_id, interview in latest.items()
+        if interview.ai_decision not in DISCONNECTED_DECISIONS
+    ]
+    if cancelled:
+        ScheduledRetry.objects.filter(
+            organization_id=organization_id,
+            application_id__in=cancelled,
+            next_retry_at__isnull=False,
+        ).update(next_retry_at=None, updated_at=timezone.now())
+
+    disconnected = {
+        application_id: interview
+        for application_id, interview in latest.items()
+        if interview.ai_decision in DISCONNECTED_DECISIONS
+    }
+    if not disconnected:
+        return []
+    policy = RetryPolicy.objects.filter(
+        organization_id=organization_id, is_enabled=True
+    ).first()
+    if policy is None:
+        return []
+
+    attempts = dict(
+        ScheduledRetry.objects.filter(
+            organization_id=organization_id, application_id__in=list(disconnected)
+        ).values_list("application_id", "attempts")
+    )
+    now = timezone.now()
+    scheduled_retries = [
+        ScheduledRetry(
+            organization_id=organization_id,
+            application_id=application_id,
+            interview=interview,
+            attempts=attempts.get(application_id, 0),
+            next_retry_at=policy.get_next_retry_at(
+                attempts.get(application_id, 0), now
+            ),
+        )
+        for application_id, interview in disconnected.items()
+    ]
+    return ScheduledRetry.objects.bulk_create(
+        scheduled_retries,
+        update_conflicts=True,
+        unique_fields=["organization", "application_id"],
+        update_fields=["interview", "next_retry_at", "updated_at"],
+    )
+
+
+@shared_task
+def dispatch_due_retries():
+    now = timezone.now()
+    due = list(
+        ScheduledRetry.objects.filter(next_retry_at__lte=now)
+        .select_related("interview")
+        .order_by("next_retry_at")[:RETRY_DISPATCH_BATCH_SIZE]
+    )
+    if not due:
+        return
+
+    by_organization = {}
+    for scheduled_retry in due:
+        by_organization.setdefault(scheduled_retry.organization_id, []).append(
+            scheduled_retry
+        )
+
+    configs = {
+        config.organization_id: config
+        for config in AIPhoneCallConfig.objects.filter(
+            organization_id__in=list(by_organization)
+        ).select_related("organization", "phone")
+    }
+    policies = RetryPolicy.objects.in_bulk(
+        list(by_organization), field_name="organization_id"
+    )
+
+    processed = 0
+    for organization_id, scheduled_retries in by_organization.items():
+        try:
+            dispatch_organization_retries(
+                scheduled_retries,
+                configs.get(organization_id),
+                policies.get(organization_id),
+                now,
+            )
+            processed += len(scheduled_retries)
+        except Exception as e:
+            print(f"Failed to retry calls for organization_{organization_id}: {str(e)}")
+            for scheduled_retry in scheduled_retries:
+                scheduled_retry.next_retry_at = now + RETRY_POSTPONE_DELAY
+            save_scheduled_retries(scheduled_retries, now)
+    print(f"Processed {processed} of {len(due)} due call retries")
+
+
+def save_scheduled_retries(scheduled_retries, now):
+    for scheduled_retry in scheduled_retries:
+        # bulk_update does not set auto_now fields
+        scheduled_retry.updated_at = now
+    ScheduledRetry.objects.bulk_update(
+        scheduled_retries, ["attempts", "next_retry_at", "updated_at"]
+    )
+
+
+def dispatch_organization_retries(scheduled_retries, config, policy, now):
+    """
+    Place the due retries of one organization and save their new state
+    straight away, so a failure elsewhere never dispatches them twice.
+    """
+    if config is None or policy is None or not policy.is_enabled:
+        for scheduled_retry in scheduled_retries:
+            scheduled_retry.next_retry_at = None
+        save_scheduled_retries(scheduled_retries, now)
+        return
+
+    # The policy may have changed since these retries were scheduled
+    allowed_at = policy.get_next_allowed_time(now)
+    if allowed_at > now:
+        for scheduled_retry in scheduled_retries:
+            scheduled_retry.next_retry_at = allowed_at
+        save_scheduled_retries(scheduled_retries, now)
+        return
+
+    pending = []
+    for scheduled_retry in scheduled_retries:
+        if scheduled_retry.attempts >= policy.max_attempts:
+            scheduled_retry.next_retry_at = None
+        else:
+            pending.append(scheduled_retry)
+
+    dispatcher = RetryDispatcher(config, config.organization.name)
+    reservations = reserve_call_quota(
+        config.organization_id,
+        [scheduled_retry.application_id for scheduled_retry in pending],
+        spacing_seconds=CALL_SPACING_SECONDS,
+    )
+    for i, scheduled_retry in enumerate(pending):
+        if i >= len(reservations):
+            # Out of quota
+            scheduled_retry.next_retry_at = policy.get_next_allowed_time(
+                now + RETRY_POSTPONE_DELAY
+            )
+            continue
+
+        reservation = reservations[i]
+        try:
+            dispatcher.dispatch(
+                scheduled_retry.interview,
+                countdown=i * CALL_SPACING_SECONDS,
+                reservation_id=reservation.id,
+            )
+            # Cleared until the retried call reports its result
+            scheduled_retry.next_retry_at = None
+        except Exception as e:
+            release_call_quota(reservation.id)
+            print(
+                f"Failed to retry application {scheduled_retry.application_id}: {str(e)}"
+            )
+            scheduled_retry.next_retry_at = policy.get_next_retry_at(
+                scheduled_retry.attempts + 1, now
+            )
+        scheduled_retry.attempts += 1
+
+    save_scheduled_retries(scheduled_retries, now)
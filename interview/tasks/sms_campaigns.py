@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.core.cache import cache
+from django.utils import timezone
+
+from interview.choices import CampaignStatus
+from interview.models import SMSCampaign
+from interview.sms_campaigns import CAMPAIGN_SLICE_SECONDS, run_campaign_slice
+
+CAMPAIGN_LOCK_TIMEOUT = CAMPAIGN_SLICE_SECONDS + 120
+CAMPAIGN_LOCK_RETRY_SECONDS = 30
+# Campaigns untouched for this long lost their task, e.g. to a worker dying
+# mid slice, and are queued again
+CAMPAIGN_STALE_AFTER = timedelta(minutes=10)
+ACTIVE_STATUSES = [CampaignStatus.PENDING, CampaignStatus.RUNNING]
+
+
+def get_campaign_lock_key(organization_id):
+    return f"sms_campaign:{organization_id}"
+
+
+@shared_task
+def run_sms_campaign(campaign_id: int):
+    try:
+        campaign = SMSCampaign.objects.get(id=campaign_id)
+    except SMSCampaign.DoesNotExist:
+        print(f"No SMS campaign found with id {campaign_id}")
+        return
+
+    # The organization's numbers are paced by one campaign at a time
+    lock_key = get_campaign_lock_key(campaign.organization_id)
+    if not cache.add(lock_key, campaign_id, CAMPAIGN_LOCK_TIMEOUT):
+        run_sms_campaign.apply_async(
+            args=[campaign_id], countdown=CAMPAIGN_LOCK_RETRY_SECONDS
+        )
+        return
+
+    try:
+        finished = run_campaign_slice(campaign)
+    except Exception as e:
+        print(f"SMS campaign {campaign_id} failed: {str(e)}")
+        finished = True
+        SMSCampaign.objects.filter(id=campaign_id, status__in=ACTIVE_STATUSES).update(
+            status=CampaignStatus.FAILED,
+            error=str(e),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+    finally:
+        cache.delete(lock_key)
+
+    if not finished:
+        run_sms_campaign.delay(campaign_id)
+
+
+@shared_task
+def resume_stalled_sms_campaigns():
+    now = timezone.now()
+    stalled = SMSCampaign.objects.filter(
+        status__in=ACTIVE_STATUSES, updated_at__lt=now - CAMPAIGN_STALE_AFTER
+    ).values_list("id", "organization_id")
+    resumed = []
+    for campaign_id, organization_id in stalled:
+        # A held lock means a slice is still running or the campaign is
+        # waiting for another one of the organization
+        if cache.get(get_campaign_lock_key(organization_id)) is not None:
+            continue
+        resumed.append(campaign_id)
+        run_sms_campaign.delay(campaign_id)
+    # Not picked up again by the next sweep while the queued task waits
+    SMSCampaign.objects.filter(id__in=resumed).update(updated_at=now)
+    print(f"Resumed {len(resumed)} stalled SMS campaigns")
@@ -0,0 +1,36 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from interview.sms_log import (
+    flush_status_callbacks,
+    has_buffered_status_callbacks,
+    parse_status_callback,
+    push_status_callback,
+)
+
+SMS_STATUS_FLUSH_LOCK_KEY = "sms_status_flush"
+SMS_STATUS_FLUSH_DELAY_SECONDS = 5
+SMS_STATUS_RETRY_DELAY_SECONDS = 60
+
+
+def schedule_status_callback_flush(countdown=SMS_STATUS_FLUSH_DELAY_SECONDS):
+    if cache.add(SMS_STATUS_FLUSH_LOCK_KEY, 1, countdown + 60):
+        flush_sms_status_callbacks.apply_async(countdown=countdown)
+
+
+def buffer_status_callback(organization_id, data):
+    """Queue a Twilio status callback, written with the next flush."""
+    push_status_callback(parse_status_callback(organization_id, data))
+    schedule_status_callback_flush()
+
+
+@shared_task
+def flush_sms_status_callbacks():
+    # Callbacks arriving from now on schedule the next flush
+    cache.delete(SMS_STATUS_FLUSH_LOCK_KEY)
+    count = flush_status_callbacks()
+    print(f"Saved {count} SMS status callbacks")
+    # Callbacks put back after a failure are tried again a little later,
+    # without waiting for new ones to arrive
+    if has_buffered_status_callbacks():
+        schedule_status_callback_flush(countdown=SMS_STATUS_RETRY_DELAY_SECONDS)
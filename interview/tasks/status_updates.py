@@ -0,0 +1,145 @@
+import random
+from datetime import timedelta
+
+from celery import shared_task
+from django.core.cache import cache
+from django.utils import timezone
+
+from interview.models import AIPhoneCallConfig, ApplicationStatusUpdate
+from organizations.jobadder import JobAdderClient
+
+STATUS_FLUSH_DELAY_SECONDS = 10
+STATUS_FLUSH_BATCH_SIZE = 200
+STATUS_UPDATE_MAX_ATTEMPTS = 8
+STATUS_UPDATE_BACKOFF_BASE_SECONDS = 30
+STATUS_UPDATE_BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def get_flush_lock_key(organization_id):
+    return f"application_status_flush:{organization_id}"
+
+
+def get_retry_delay(attempts):
+    delay = min(
+        STATUS_UPDATE_BACKOFF_MAX_SECONDS,
+        STATUS_UPDATE_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1)),
+    )
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def schedule_status_flush(organization_id, countdown=STATUS_FLUSH_DELAY_SECONDS):
+    if cache.add(get_flush_lock_key(organization_id), 1, countdown + 60):
+        flush_application_status_updates.apply_async(
+            args=[organization_id], countdown=countdown
+        )
+
+
+def queue_application_status_update(organization_id, application_id, status_id=None):
+    """
+    Record the status an application should end up in on JobAdder.
+
+    Updates for the same application coalesce into one row, so only the most
+    recent status is written when the organization's queue is flushed.
+    """
+    queue_application_status_updates(organization_id, {application_id: status_id})
+
+
+def queue_application_status_updates(organization_id, statuses):
+    """Queue several {application_id: status_id} updates with one upsert."""
+    now = timezone.now()
+    ApplicationStatusUpdate.objects.bulk_create(
+        [
+            ApplicationStatusUpdate(
+                organization_id=organization_id,
+                application_id=application_id,
+                status_id=status_id,
+                attempts=0,
+                next_attempt_at=now,
+            )
+            for application_id, status_id in statuses.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["organization", "application_id"],
+        update_fields=["status_id", "attempts", "next_attempt_at", "updated_at"],
+    )
+    schedule_status_flush(organization_id)
+
+
+@shared_task
+def flush_application_status_updates(organization_id: int):
+    cache.delete(get_flush_lock_key(organization_id))
+
+    config = (
+        AIPhoneCallConfig.objects.select_related("platform")
+        .filter(organization_id=organization_id)
+        .first()
+    )
+    pending = ApplicationStatusUpdate.objects.filter(organization_id=organization_id)
+    if config is None:
+        print(f"No config found for organization {organization_id}")
+        pending.delete()
+        return
+
+    client = JobAdderClient(config.platform, timeout=10)
+    due = list(
+        pending.filter(next_attempt_at__lte=timezone.now()).order_by("updated_at")[
+            :STATUS_FLUSH_BATCH_SIZE
+        ]
+    )
+    written = 0
+    for update in due:
+        # Only drop the row if nothing newer was queued while we were writing
+        current = ApplicationStatusUpdate.objects.filter(
+            pk=update.pk, updated_at=update.updated_at
+        )
+        status_id = update.status_id or config.status_when_call_is_placed
+        if not status_id:
+            current.delete()
+            continue
+
+        try:
+            response = client.put(
+                f"applications/{update.application_id}", json={"statusId": status_id}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            attempts = update.attempts + 1
+            if attempts >= STATUS_UPDATE_MAX_ATTEMPTS:
+                print(
+                    f"Giving up on application {update.application_id} status "
+                    f"{status_id} after {attempts} attempts: {str(e)}"
+                )
+                current.delete()
+            else:
+                current.update(
+                    attempts=attempts,
+                    next_attempt_at=timezone.now() + get_retry_delay(attempts),
+                )
+            continue
+
+        current.delete()
+        written += 1
+
+    print(
+        f"Flushed {written} of {len(due)} application status updates "
+        f"for organization {organization_id}"
+    )
+
+    next_update = pending.order_by("next_attempt_at").first()
+    if next_update:
+        countdown = (next_update.next_attempt_at - timezone.now()).total_seconds()
+        schedule_status_flush(
+            organization_id, countdown=max(STATUS_FLUSH_DELAY_SECONDS, int(countdown))
+        )
+
+
+@shared_task
+def flush_all_application_status_updates():
+    organization_ids = (
+        ApplicationStatusUpdate.objects.filter(next_attempt_at__lte=timezone.now())
+        .order_by()
+        .values_list("organization_id", flat=True)
+        .distinct()
+    )
+    for organization_id in organization_ids:
+        schedule_status_flush(organization_id, countdown=0)
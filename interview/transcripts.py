@@ -0,0 +1,83 @@
+import re
+import zlib
+
+import orjson
+from django.utils.html import escape
+
+TRANSCRIPT_COMPRESSION_LEVEL = 6
+SNIPPET_RADIUS = 80
+
+SPEAKER_KEYS = ("role", "speaker", "sender")
+CONTENT_KEYS = ("content", "message", "text")
+
+
+def get_transcript_cache_key(call_sid):
+    return f"conversation_text:{call_sid}"
+
+
+def render_transcript_text(messages):
+    """Build the plain text transcript from conversation messages."""
+    lines = []
+    for message in messages or []:
+        if not isinstance(message, dict):
+            lines.append(str(message))
+            continue
+        speaker = next((message[key] for key in SPEAKER_KEYS if message.get(key)), "")
+        content = next(
+            (message[key] for key in CONTENT_KEYS if message.get(key) is not None), ""
+        )
+        lines.append(f"{speaker}: {content}" if speaker else str(content))
+    return "\n".join(lines)
+
+
+def pack_transcript(messages, text=None):
+    """
+    Compress a conversation into its stored form.
+
+    Only the messages are kept. The text is stored as well when it can not be
+    rebuilt from the messages, so no transcript is ever lost.
+    """
+    payload = {"messages": messages}
+    if text is not None and text != render_transcript_text(messages):
+        payload["text"] = text
+    return zlib.compress(orjson.dumps(payload), TRANSCRIPT_COMPRESSION_LEVEL)
+
+
+def unpack_transcript(data):
+    payload = orjson.loads(zlib.decompress(bytes(data)))
+    messages = payload.get("messages")
+    text = payload.get("text")
+    if text is None:
+        text = render_transcript_text(messages)
+    return messages, text
+
+
+def build_snippet(text, terms, radius=SNIPPET_RADIUS):
+    """
+    Return the part of a transcript around the first matching search term,
+    HTML escaped, with every matching term wrapped in <b> tags.
+    """
+    text = text or ""
+    pattern = "|".join(re.escape(term) for term in terms if term)
+    if not pattern:
+        return escape(text[: radius * 2])
+
+    match = re.search(rf"\b({pattern})\w*", text, flags=re.IGNORECASE)
+    if match is None:
+        return escape(text[: radius * 2])
+
+    start = max(0, match.start() - radius)
+    end = min(len(text), match.end() + radius)
+    window = text[start:end]
+    parts, last = [], 0
+    for term in re.finditer(rf"\b({pattern})\w*", window, flags=re.IGNORECASE):
+        parts.append(escape(window[last : term.start()]))
+        parts.append(f"<b>{escape(term.group())}</b>")
+        last = term.end()
+    parts.append(escape(window[last:]))
+    snippet = "".join(parts)
+    if start > 0:
+        snippet = f"...{snippet}"
+    if end < len(text):
+        snippet = f"{snippet}..."
+    return snippet
@@ -0,0 +1,233 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+import orjson
+import requests
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+JOBADDER_TOKEN_URL = os.getenv(
+    "JOBADDER_TOKEN_URL", "https://id.jobadder.com/connect/token"
+)
+
+DEFAULT_TIMEOUT = 30
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+# Requests per second allowed for a single tenant from one process
+TENANT_RATE_PER_SECOND = 5
+TENANT_BURST = 10
+
+# Running totals of JobAdder calls, keyed by "<METHOD> <status>"
+call_counts = Counter()
+call_seconds = Counter()
+
+_session = None
+_session_lock = threading.Lock()
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+class JobAdderError(Exception):
+    pass
+
+
+def get_session():
+    """Process wide keep-alive session shared by every JobAdder call."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def get_bucket(tenant):
+    with _buckets_lock:
+        bucket = _buckets.get(tenant)
+        if bucket is None:
+            bucket = TokenBucket(TENANT_RATE_PER_SECOND, TENANT_BURST)
+            _buckets[tenant] = bucket
+        return bucket
+
+
+def get_retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - timezone.now()).total_seconds())
+
+
+def get_backoff(attempt):
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2**attempt))
+    return random.uniform(0, delay)
+
+
+def send(method, url, tenant=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """
+    Send one JobAdder request through the pooled session.
+
+    Throttled responses and transient failures are retried with jittered
+    exponential backoff, honoring Retry-After. Non idempotent requests are only
+    retried when JobAdder explicitly throttled them.
+    """
+    method = method.upper()
+    session = get_session()
+    bucket = get_bucket(tenant)
+
+    attempt = 0
+    while True:
+        bucket.acquire()
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            call_counts[f"{method} error"] += 1
+            call_seconds[f"{method} error"] += time.monotonic() - started
+            if method not in IDEMPOTENT_METHODS or attempt >= MAX_RETRIES:
+                raise
+            delay = get_backoff(attempt)
+            logger.warning(
+                f"JobAdder {method} {url} failed ({e}), retry in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        elapsed = time.monotonic() - started
+        key = f"{method} {response.status_code}"
+        call_counts[key] += 1
+        call_seconds[key] += elapsed
+        logger.info(
+            f"JobAdder {method} {url} -> {response.status_code} in {elapsed:.3f}s"
+        )
+
+        retryable = response.status_code in RETRY_STATUS_CODES and (
+            method in IDEMPOTENT_METHODS or response.status_code == 429
+        )
+        if not retryable or attempt >= MAX_RETRIES:
+            return response
+
+        delay = get_retry_after(response)
+        if delay is None:
+            delay = get_backoff(attempt)
+        logger.warning(
+            f"JobAdder {method} {url} returned {response.status_code}, "
+            f"retry in {delay:.1f}s"
+        )
+        time.sleep(min(delay, BACKOFF_MAX_SECONDS))
+        attempt += 1
+
+
+class JobAdderClient:
+    """
+    JobAdder API client bound to one OrganizationPlatform connection.
+
+    Tokens are refreshed ahead of expiry; a token rejected with 401 is
+    refreshed once and the request is replayed with the new token.
+    """
+
+    def __init__(self, platform, timeout=DEFAULT_TIMEOUT):
+        self.platform = platform
+        self.timeout = timeout
+
+    def build_url(self, path_or_url):
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.platform.base_url}/{path_or_url.lstrip('/')}"
+
+    def get_headers(self, access_token):
+        return {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/json",
+        }
+
+    def request(self, method, path_or_url, **kwargs):
+        url = self.build_url(path_or_url)
+        kwargs.setdefault("timeout", self.timeout)
+        access_token = self.platform.get_access_token()
+        response = send(
+            method,
+            url,
+            tenant=self.platform.pk,
+            headers=self.get_headers(access_token),
+            **kwargs,
+        )
+        if response.status_code == 401:
+            logger.info(f"JobAdder token rejected for platform {self.platform.pk}")
+            access_token = self.platform.refresh_access_token(stale_token=access_token)
+            if not access_token:
+                raise JobAdderError("Could not refresh JobAdder access token")
+            response = send(
+                method,
+                url,
+                tenant=self.platform.pk,
+                headers=self.get_headers(access_token),
+                **kwargs,
+            )
+        return response
+
+    def get(self, path_or_url, **kwargs):
+        return self.request("GET", path_or_url, **kwargs)
+
+    def put(self, path_or_url, **kwargs):
+        return self.request("PUT", path_or_url, **kwargs)
+
+    def get_json(self, path_or_url, **kwargs):
+        response = self.get(path_or_url, **kwargs)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def iter_items(self, path_or_url, params=None):
+        """Yield every item of a paginated collection, following links.next."""
+        url = path_or_url
+        while url:
+            data = self.get_json(url, params=params)
+            yield from data.get("items", [])
+            url = (data.get("links") or {}).get("next")
+            params = None
@@ -0,0 +1,107 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from organizations.simulator import (
+    UPSTREAM_TOKEN_URL,
+    JobAdderSimulator,
+    SimulatorConfig,
+    create_server,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local JobAdder API simulator. Point an OrganizationPlatform "
+        "base_url and JOBADDER_TOKEN_URL at it to run sweeps without JobAdder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8700)
+        parser.add_argument("--jobs", type=int, default=100)
+        parser.add_argument("--applications", type=int, default=1000)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument(
+            "--latency-ms", type=int, default=0, help="Delay added to every response"
+        )
+        parser.add_argument(
+            "--token-ttl",
+            type=int,
+            default=3600,
+            help="Seconds before issued access tokens start returning 401",
+        )
+        parser.add_argument(
+            "--rate-limit",
+            type=int,
+            default=0,
+            help="Requests per second per access token before returning 429",
+        )
+        parser.add_argument("--calling-status-id", type=int, default=1)
+        parser.add_argument("--job-state", default="Current")
+        parser.add_argument(
+            "--record",
+            metavar="PATH",
+            help=(
+                "Proxy to --upstream and append every exchange to this JSONL "
+                "file. Tokens are redacted, but it holds candidate data: "
+                "do not commit it"
+            ),
+        )
+        parser.add_argument("--upstream", help="Real JobAdder API base url to record")
+        parser.add_argument(
+            "--upstream-token-url",
+            default=UPSTREAM_TOKEN_URL,
+            help="Real JobAdder token endpoint /connect/token is proxied to",
+        )
+        parser.add_argument(
+            "--replay", metavar="PATH", help="Serve responses recorded with --record"
+        )
+        parser.add_argument("--verbose-requests", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["record"] and not options["upstream"]:
+            raise CommandError("--record requires --upstream")
+        if options["record"] and options["replay"]:
+            raise CommandError("--record and --replay can not be used together")
+        if options["jobs"] < 1:
+            raise CommandError("--jobs must be at least 1")
+
+        config = SimulatorConfig(
+            jobs=options["jobs"],
+            applications=options["applications"],
+            page_size=options["page_size"],
+            latency_ms=options["latency_ms"],
+            token_ttl=options["token_ttl"],
+            rate_limit=options["rate_limit"],
+            calling_status_id=options["calling_status_id"],
+            job_state=options["job_state"],
+        )
+        base_url = f"http://{options['host']}:{options['port']}"
+        simulator = JobAdderSimulator(
+            config,
+            base_url,
+            record_path=options["record"],
+            upstream=options["upstream"] if options["record"] else None,
+            upstream_token_url=options["upstream_token_url"],
+        )
+        if options["replay"]:
+            simulator.load_replay(options["replay"])
+
+        server = create_server(
+            simulator,
+            host=options["host"],
+            port=options["port"],
+            quiet=not options["verbose_requests"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"JobAdder simulator listening on {base_url} "
+                f"({config.jobs} jobs, {config.applications} applications)"
+            )
+        )
+        self.stdout.write(f"Token endpoint: {base_url}/connect/token")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(f"Request stats: {dict(simulator.stats)}")
+        finally:
+            server.server_close()
@@ -1,16 +1,21 @@
+import time
 import uuid
+from datetime import timedelta
 
 import requests
 from autoslug import AutoSlugField
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 from versatileimagefield.fields import VersatileImageField
 
 from common.choices import Status
 from common.models import BaseModelWithUID
+from common.redis_client import get_redis
 from core.models import User
 
 from .choices import AuthTypeChoices, OrganizationInvitationStatus, OrganizationUserRole
+from .jobadder import JOBADDER_TOKEN_URL, send
 from .utils import (
     get_organization_media_path_prefix,
     get_organization_slug,
@@ -18,6 +23,17 @@ from .utils import (
     get_platform_slug,
 )
 
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+TOKEN_REFRESH_LOCK_TIMEOUT = 30
+# Releases the refresh lock only while it still holds the caller's token, so
+# a refresh that outlived the timeout can't free a lock another worker took
+RELEASE_TOKEN_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class Organization(BaseModelWithUID):
     name = models.CharField(max_length=255)
@@ -114,8 +130,84 @@ class OrganizationPlatform(BaseModelWithUID):
     def __str__(self):
         return f"{self.organization.name} - {self.platform.name}"
 
-    def refresh_access_token(self):
-        token_url = "https://id.jobadder.com/connect/token"
+    def get_token_cache_key(self):
+        return f"platform_token:{self.pk}"
+
+    def get_token_lock_key(self):
+        return f"platform_token_lock:{self.pk}"
+
+    def is_token_expiring(self, margin=TOKEN_REFRESH_MARGIN):
+        if not self.expires_at:
+            return False
+        return self.expires_at - margin <= timezone.now()
+
+    def load_cached_token(self):
+        cached = cache.get(self.get_token_cache_key())
+        if cached:
+            self.access_token, self.expires_at = cached
+        return cached
+
+    def cache_token(self):
+        timeout = None
+        if self.expires_at:
+            timeout = max(1, int((self.expires_at - timezone.now()).total_seconds()))
+        cache.set(
+            self.get_token_cache_key(), (self.access_token, self.expires_at), timeout
+        )
+
+    def get_access_token(self):
+        """
+        Return a usable access token, refreshing it ahead of expiry.
+        """
+        self.load_cached_token()
+        if self.access_token and not self.is_token_expiring():
+            return self.access_token
+        return self.refresh_access_token(stale_token=self.access_token)
+
+    def refresh_access_token(self, stale_token=None):
+        """
+        Refresh the access token under a per-platform lock.
+
+        JobAdder rotates refresh tokens, so only the lock holder talks to the
+        token endpoint. Everyone else waits for the new token to show up in the
+        shared cache. A token that differs from ``stale_token`` and is not about
+        to expire has already been refreshed by another worker and is reused.
+        """
+        if stale_token is None:
+            stale_token = self.access_token
+
+        redis = get_redis()
+        lock_key = self.get_token_lock_key()
+        lock_token = uuid.uuid4().hex
+        deadline = time.monotonic() + TOKEN_REFRESH_LOCK_TIMEOUT
+        while not redis.set(
+            lock_key, lock_token, nx=True, ex=TOKEN_REFRESH_LOCK_TIMEOUT
+        ):
+            if time.monotonic() >= deadline:
+                raise ValueError("Failed to refresh token: lock wait timed out")
+            time.sleep(0.2)
+            if self.load_cached_token() and self.is_fresh_token(stale_token):
+                return self.access_token
+
+        try:
+            self.refresh_from_db(
+                fields=["access_token", "refresh_token", "token_type", "expires_at"]
+            )
+            if self.is_fresh_token(stale_token):
+                self.cache_token()
+                return self.access_token
+            return self.request_new_token()
+        finally:
+            redis.eval(RELEASE_TOKEN_LOCK_SCRIPT, 1, lock_key, lock_token)
+
+    def is_fresh_token(self, stale_token):
+        return (
+            bool(self.access_token)
+            and self.access_token != stale_token
+            and not self.is_token_expiring()
+        )
+
+    def request_new_token(self):
         client_id = self.platform.client_id
         client_secret = self.platform.client_secret
 
@@ -127,7 +219,9 @@ class OrganizationPlatform(BaseModelWithUID):
         }
 
         try:
-            response = requests.post(token_url, data=data, timeout=15)
+            response = send(
+                "POST", JOBADDER_TOKEN_URL, tenant=self.pk, data=data, timeout=15
+            )
             response.raise_for_status()
         except requests.RequestException as e:
             raise ValueError(f"Failed to refresh token: {e}")
@@ -154,6 +248,7 @@ class OrganizationPlatform(BaseModelWithUID):
                 "connected_at",
             ]
         )
+        self.cache_token()
 
         return self.access_token
 
@@ -2,7 +2,9 @@ import requests
 from django.utils import timezone
 from rest_framework import serializers
 
+from organizations.jobadder import JOBADDER_TOKEN_URL
 from organizations.models import OrganizationPlatform, Platform
+from organizations.status_catalog import invalidate_status_catalog
 
 
 class OrganizationPlatformTokenSerializer(serializers.Serializer):
@@ -22,7 +24,7 @@ class OrganizationPlatformTokenSerializer(serializers.Serializer):
         except Platform.DoesNotExist:
             raise serializers.ValidationError({"platform_slug": "Platform not found"})
 
-        token_url = "https://id.jobadder.com/connect/token"
+        token_url = JOBADDER_TOKEN_URL
         payload = {
             "grant_type": "authorization_code",
             "code": code,
@@ -60,6 +62,8 @@ class OrganizationPlatformTokenSerializer(serializers.Serializer):
                     "is_connected": True,
                 },
             )
+            org_platform.cache_token()
+            invalidate_status_catalog(org_platform.pk)
 
             return org_platform
 
@@ -6,7 +6,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from common.tasks import send_email_task
+from common.tasks import queue_email
 from core.models import User
 
 from ..serializers import register
@@ -74,7 +74,7 @@ class UserForgetPasswordAPIView(APIView):
             "verification_link": f"{settings.FRONTEND_BASE_URL}/forgot-password-verify/{user.token}?email={email}",
             "current_year": 2025,
         }
-        send_email_task.delay(
+        queue_email(
             subject="Reset your password",
             recipient=email,
             template_name="emails/forget_password.html",
@@ -0,0 +1,398 @@
+"""
+Local JobAdder API simulator used to benchmark and exercise the candidate sweep.
+
+The dataset is generated on the fly from the job and application indexes, so
+large datasets cost no memory. In record mode every request is proxied to a
+real JobAdder API and the exchange is appended to a JSONL file; replay mode
+serves those captured responses back. Tokens are redacted from recordings, but
+they still hold real candidate data, so they must not be committed.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlencode
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import requests
+
+STATUS_LIST = [
+    {"statusId": 1, "name": "New"},
+    {"statusId": 2, "name": "Call Scheduled"},
+    {"statusId": 3, "name": "Interviewed"},
+    {"statusId": 4, "name": "Shortlisted"},
+    {"statusId": 5, "name": "Unsuccessful"},
+]
+
+UPSTREAM_TOKEN_URL = "https://id.jobadder.com/connect/token"
+# Never written to a recording
+REDACTED_KEYS = {"access_token", "refresh_token", "id_token", "authorization"}
+REDACTED_VALUE = "REDACTED"
+
+HTTP_STATUS_TEXT = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    404: "404 Not Found",
+    429: "429 Too Many Requests",
+    502: "502 Bad Gateway",
+}
+
+
+class SimulatorConfig:
+    def __init__(
+        self,
+        jobs=100,
+        applications=1000,
+        page_size=100,
+        latency_ms=0,
+        token_ttl=3600,
+        rate_limit=0,
+        calling_status_id=1,
+        job_state="Current",
+        updated_minutes_ago=60,
+    ):
+        self.jobs = jobs
+        self.applications = applications
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.token_ttl = token_ttl
+        # Requests per second allowed per access token, 0 disables throttling
+        self.rate_limit = rate_limit
+        self.calling_status_id = calling_status_id
+        self.job_state = job_state
+        self.updated_minutes_ago = updated_minutes_ago
+
+
+class JobAdderSimulator:
+    def __init__(
+        self,
+        config,
+        base_url,
+        record_path=None,
+        upstream=None,
+        upstream_token_url=UPSTREAM_TOKEN_URL,
+    ):
+        self.config = config
+        self.base_url = base_url.rstrip("/")
+        self.record_path = record_path
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.upstream_token_url = upstream_token_url
+        self.replay = {}
+        self.tokens = {}
+        self.refresh_tokens = set()
+        self.windows = {}
+        self.status_updates = {}
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.updated_at = (
+            datetime.now(timezone.utc) - timedelta(minutes=config.updated_minutes_ago)
+        ).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    # Dataset
+
+    def get_application_range(self, job_index):
+        per_job, remainder = divmod(self.config.applications, self.config.jobs)
+        start = job_index * per_job + min(job_index, remainder)
+        count = per_job + (1 if job_index < remainder else 0)
+        return start, count
+
+    def build_job(self, job_index):
+        ad_id = job_index + 1
+        return {
+            "adId": ad_id,
+            "title": f"Simulated Job {ad_id}",
+            "state": self.config.job_state,
+            "links": {
+                "self": f"{self.base_url}/jobads/{ad_id}",
+                "applications": f"{self.base_url}/jobads/{ad_id}/applications",
+            },
+        }
+
+    def build_job_details(self, ad_id):
+        return {
+            "adId": ad_id,
+            "title": f"Simulated Job {ad_id}",
+            "summary": f"Summary for simulated job {ad_id}",
+            "description": f"Description for simulated job {ad_id}. " * 20,
+            "location": {"city": "London"},
+            "salary": {"description": "GBP 30,000 - 40,000"},
+        }
+
+    def build_application(self, application_index):
+        application_id = application_index + 1
+        status_id = self.status_updates.get(
+            application_id, self.config.calling_status_id
+        )
+        return {
+            "applicationId": application_id,
+            "status": {"statusId": status_id},
+            "updatedAt": self.updated_at,
+            "candidate": {
+                "candidateId": application_id,
+                "firstName": "Candidate",
+                "lastName": str(application_id),
+                "email": f"candidate{application_id}@example.com",
+                "mobile": f"07{application_id:09d}",
+            },
+        }
+
+    def paginate(self, path, query, total, build):
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", [str(self.config.page_size)])[0])
+        limit = max(1, min(limit, self.config.page_size))
+        end = min(total, offset + limit)
+        body = {
+            "items": [build(index) for index in range(offset, end)],
+            "totalCount": total,
+            "links": {},
+        }
+        if end < total:
+            next_query = urlencode({"offset": end, "limit": limit})
+            body["links"]["next"] = f"{self.base_url}{path}?{next_query}"
+        return body
+
+    # Auth
+
+    def issue_token(self, form):
+        grant_type = form.get("grant_type", [""])[0]
+        if grant_type == "refresh_token":
+            refresh_token = form.get("refresh_token", [""])[0]
+            with self.lock:
+                if refresh_token not in self.refresh_tokens:
+                    return 400, {"error": "invalid_grant"}
+                # Refresh tokens are single use, like JobAdder
+                self.refresh_tokens.discard(refresh_token)
+        elif grant_type != "authorization_code":
+            return 400, {"error": "unsupported_grant_type"}
+
+        access_token = uuid.uuid4().hex
+        refresh_token = uuid.uuid4().hex
+        with self.lock:
+            self.tokens[access_token] = time.time() + self.config.token_ttl
+            self.refresh_tokens.add(refresh_token)
+        return 200, {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": self.config.token_ttl,
+            "token_type": "Bearer",
+            "api": self.base_url,
+        }
+
+    def check_token(self, environ):
+        header = environ.get("HTTP_AUTHORIZATION", "")
+        access_token = header.removeprefix("Bearer ").strip()
+        expires_at = self.tokens.get(access_token)
+        if expires_at is None or expires_at <= time.time():
+            return None
+        return access_token
+
+    def check_rate_limit(self, access_token):
+        if not self.config.rate_limit:
+            return None
+        second = int(time.time())
+        with self.lock:
+            window, count = self.windows.get(access_token, (second, 0))
+            if window != second:
+                window, count = second, 0
+            count += 1
+            self.windows[access_token] = (window, count)
+        if count > self.config.rate_limit:
+            return 1
+        return None
+
+    # Routing
+
+    def route(self, method, path, query, environ):
+        if method == "POST" and path == "/connect/token":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            form = parse_qs(environ["wsgi.input"].read(length).decode())
+            return self.issue_token(form) + ({},)
+
+        if path == "/_simulator/stats":
+            return 200, dict(self.stats), {}
+
+        access_token = self.check_token(environ)
+        if access_token is None:
+            return 401, {"message": "Unauthorized"}, {}
+        retry_after = self.check_rate_limit(access_token)
+        if retry_after:
+            return 429, {"message": "Too many requests"}, {"Retry-After": "1"}
+
+        parts = [part for part in path.split("/") if part]
+        if method == "GET" and parts == ["jobads"]:
+            return 200, self.paginate(path, query, self.config.jobs, self.build_job), {}
+        if method == "GET" and parts == ["applications", "lists", "status"]:
+            return 200, {"items": STATUS_LIST}, {}
+        if len(parts) >= 2 and parts[0] == "jobads" and parts[1].isdigit():
+            ad_id = int(parts[1])
+            if not 1 <= ad_id <= self.config.jobs:
+                return 404, {"message": "Job ad not found"}, {}
+            if method == "GET" and len(parts) == 2:
+                return 200, self.build_job_details(ad_id), {}
+            if method == "GET" and parts[2:] == ["applications"]:
+                start, count = self.get_application_range(ad_id - 1)
+                body = self.paginate(
+                    path,
+                    query,
+                    count,
+                    lambda index: self.build_application(start + index),
+                )
+                return 200, body, {}
+        if method == "PUT" and len(parts) == 2 and parts[0] == "applications":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            payload = json.loads(environ["wsgi.input"].read(length) or b"{}")
+            application_id = int(parts[1])
+            with self.lock:
+                self.status_updates[application_id] = payload.get("statusId")
+            return 200, self.build_application(application_id - 1), {}
+        return 404, {"message": "Not found"}, {}
+
+    def proxy(self, method, path, query_string, environ):
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = environ["wsgi.input"].read(length) if length else None
+        headers = {
+            key: environ[name]
+            for key, name in (
+                ("Authorization", "HTTP_AUTHORIZATION"),
+                ("Content-Type", "CONTENT_TYPE"),
+            )
+            if environ.get(name)
+        }
+        # Tokens come from the identity host, everything else from the API
+        if path == "/connect/token":
+            url = self.upstream_token_url
+        else:
+            url = f"{self.upstream}{path}"
+        if query_string:
+            url = f"{url}?{query_string}"
+        response = requests.request(method, url, data=body, headers=headers, timeout=60)
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"raw": response.text}
+        data = self.rewrite_upstream_urls(data)
+        headers = {}
+        if response.headers.get("Retry-After"):
+            headers["Retry-After"] = response.headers["Retry-After"]
+        return response.status_code, data, headers
+
+    def rewrite_upstream_urls(self, data):
+        """
+        Point the absolute urls of a proxied body (pagination links, the
+        token's api url) at the simulator, so clients keep paging through it.
+        """
+        if isinstance(data, dict):
+            return {
+                key: self.rewrite_upstream_urls(value) for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self.rewrite_upstream_urls(value) for value in data]
+        if isinstance(data, str) and data.startswith(self.upstream):
+            return f"{self.base_url}{data[len(self.upstream):]}"
+        return data
+
+    def load_replay(self, path):
+        with open(path) as records:
+            for line in records:
+                record = json.loads(line)
+                key = (record["method"], record["path"], record["query"])
+                self.replay.setdefault(key, []).append(record)
+
+    def __call__(self, environ, start_response):
+        if self.config.latency_ms:
+            time.sleep(self.config.latency_ms / 1000)
+
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("PATH_INFO", "/")
+        query_string = environ.get("QUERY_STRING", "")
+        query = parse_qs(query_string)
+
+        if self.replay:
+            records = self.replay.get((method, path, query_string))
+            if records:
+                # Cycle through captured responses for repeated requests
+                record = records.pop(0)
+                records.append(record)
+                status_code, body, headers = (
+                    record["status"],
+                    record["body"],
+                    record["headers"],
+                )
+            else:
+                status_code, body, headers = 404, {"message": "Not recorded"}, {}
+        elif self.upstream:
+            status_code, body, headers = self.proxy(method, path, query_string, environ)
+            self.record(method, path, query_string, status_code, body, headers)
+        else:
+            status_code, body, headers = self.route(method, path, query, environ)
+
+        with self.lock:
+            self.stats[f"{method} {status_code}"] += 1
+
+        payload = json.dumps(body).encode()
+        response_headers = [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(payload))),
+        ]
+        response_headers.extend(headers.items())
+        start_response(
+            HTTP_STATUS_TEXT.get(status_code, f"{status_code} Unknown"),
+            response_headers,
+        )
+        return [payload]
+
+    def redact(self, data):
+        if isinstance(data, dict):
+            return {
+                key: (
+                    REDACTED_VALUE
+                    if key.lower() in REDACTED_KEYS
+                    else self.redact(value)
+                )
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self.redact(value) for value in data]
+        return data
+
+    def record(self, method, path, query_string, status_code, body, headers):
+        if not self.record_path:
+            return
+        line = json.dumps(
+            {
+                "method": method,
+                "path": path,
+                "query": query_string,
+                "status": status_code,
+                "body": self.redact(body),
+                "headers": self.redact(headers),
+            }
+        )
+        with self.lock:
+            with open(self.record_path, "a") as records:
+                records.write(line + "\n")
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(simulator, host="127.0.0.1", port=8700, quiet=True):
+    handler = QuietRequestHandler if quiet else WSGIRequestHandler
+    return make_server(
+        host,
+        port,
+        simulator,
+        server_class=ThreadingWSGIServer,
+        handler_class=handler,
+    )
@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+
+from .jobadder import JobAdderClient
+
+STATUS_CATALOG_TTL = 60 * 60
+# Stale copies are kept around much longer so the UI still works while
+# JobAdder is unavailable.
+STATUS_CATALOG_STALE_TTL = 7 * 24 * 60 * 60
+STATUS_CATALOG_REFRESH_LOCK_TIMEOUT = 60
+
+
+def get_catalog_cache_key(platform_id):
+    return f"jobadder_status_catalog:{platform_id}"
+
+
+def get_catalog_lock_key(platform_id):
+    return f"jobadder_status_catalog_lock:{platform_id}"
+
+
+def fetch_status_catalog(platform):
+    """Fetch the application status list from JobAdder and cache it."""
+    data = JobAdderClient(platform, timeout=10).get_json("applications/lists/status")
+    statuses = [
+        {"id": item.get("statusId"), "name": item.get("name")}
+        for item in data.get("items", [])
+    ]
+    cache.set(
+        get_catalog_cache_key(platform.pk),
+        {"statuses": statuses, "fetched_at": time.time()},
+        STATUS_CATALOG_STALE_TTL,
+    )
+    return statuses
+
+
+def get_status_catalog(platform):
+    """
+    Return the cached status catalog for a platform connection.
+
+    A stale entry is served as is and refreshed in the background. Only a
+    cold cache goes to JobAdder inline.
+    """
+    cached = cache.get(get_catalog_cache_key(platform.pk))
+    if cached is None:
+        return fetch_status_catalog(platform)
+
+    if time.time() - cached["fetched_at"] >= STATUS_CATALOG_TTL:
+        schedule_status_catalog_refresh(platform.pk)
+    return cached["statuses"]
+
+
+def schedule_status_catalog_refresh(platform_id):
+    from .tasks import refresh_status_catalog
+
+    if cache.add(
+        get_catalog_lock_key(platform_id), 1, STATUS_CATALOG_REFRESH_LOCK_TIMEOUT
+    ):
+        refresh_status_catalog.delay(platform_id)
+
+
+def invalidate_status_catalog(platform_id):
+    cache.delete(get_catalog_cache_key(platform_id))
+    schedule_status_catalog_refresh(platform_id)
@@ -0,0 +1,46 @@
+from celery import shared_task
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from common.choices import Status
+
+from .models import TOKEN_REFRESH_MARGIN, OrganizationPlatform
+from .status_catalog import fetch_status_catalog, get_catalog_lock_key
+
+TOKEN_REFRESH_INTERVAL = timezone.timedelta(minutes=5)
+
+
+@shared_task
+def refresh_expiring_platform_tokens():
+    """Refresh every connected platform token that would expire before the next run."""
+    refresh_before = timezone.now() + TOKEN_REFRESH_MARGIN + TOKEN_REFRESH_INTERVAL
+    platforms = (
+        OrganizationPlatform.objects.filter(
+            is_connected=True,
+            status=Status.ACTIVE,
+            expires_at__lte=refresh_before,
+        )
+        .exclude(Q(refresh_token__isnull=True) | Q(refresh_token=""))
+        .select_related("platform")
+    )
+    for platform in platforms:
+        try:
+            platform.refresh_access_token(stale_token=platform.access_token)
+        except ValueError as e:
+            print(f"Failed to refresh token for platform connection {platform.id}: {e}")
+
+
+@shared_task
+def refresh_status_catalog(platform_id):
+    try:
+        platform = OrganizationPlatform.objects.select_related("platform").get(
+            id=platform_id
+        )
+        fetch_status_catalog(platform)
+    except OrganizationPlatform.DoesNotExist:
+        print(f"No platform connection found with id {platform_id}")
+    except Exception as e:
+        print(f"Failed to refresh status catalog for platform {platform_id}: {e}")
+    finally:
+        cache.delete(get_catalog_lock_key(platform_id))
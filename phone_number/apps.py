@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PhoneNumberConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'phone_number'
+
+    def ready(self):
+        from phone_number import signals  # noqa: F401
@@ -0,0 +1,129 @@
+"""
+Countries Twilio has phone numbers for.
+
+The list is the same for every tenant and rarely changes, so it is fetched
+once with the parent account, shared through the cache and refreshed daily.
+A stale copy is kept for a long time so the endpoint keeps answering while
+Twilio is unavailable. Each process holds the catalog with a search index,
+and only looks at the shared cache again every few minutes.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+
+from .twilio_clients import get_twilio_client
+
+COUNTRY_CATALOG_CACHE_KEY = "twilio_country_catalog"
+COUNTRY_CATALOG_LOCK_KEY = "twilio_country_catalog_lock"
+COUNTRY_CATALOG_TTL = 24 * 60 * 60
+COUNTRY_CATALOG_STALE_TTL = 30 * 24 * 60 * 60
+COUNTRY_CATALOG_REFRESH_LOCK_TIMEOUT = 60
+# How long a process serves its own copy before checking the shared cache
+COUNTRY_CATALOG_LOCAL_TTL = 5 * 60
+
+_local = {"index": None, "fetched_at": None, "checked_at": 0}
+_local_lock = threading.Lock()
+
+
+class CountryIndex:
+    """
+    Countries sorted by name, with every substring of their names and codes
+    mapped to the countries containing it. Countries where the query starts
+    the name, a word of it or the code are listed first.
+    """
+
+    def __init__(self, countries):
+        self.countries = sorted(countries, key=lambda country: country["country"])
+        prefixes, substrings = {}, {}
+        for position, country in enumerate(self.countries):
+            name = country["country"].lower()
+            code = country["country_code"].lower()
+            for text in (name, code):
+                for start in range(len(text)):
+                    for end in range(start + 1, len(text) + 1):
+                        substrings.setdefault(text[start:end], set()).add(position)
+            for word in [name, code, *name.split()]:
+                for end in range(1, len(word) + 1):
+                    prefixes.setdefault(word[:end], set()).add(position)
+
+        self.matches = {}
+        for text, positions in substrings.items():
+            first = prefixes.get(text, set())
+            self.matches[text] = tuple(sorted(first) + sorted(positions - first))
+
+    def search(self, query):
+        query = " ".join(query.lower().split())
+        if not query:
+            return self.countries
+        return [self.countries[position] for position in self.matches.get(query, ())]
+
+
+def fetch_country_catalog():
+    """Fetch the country list from Twilio and share it through the cache."""
+    countries = [
+        {
+            "country_code": country.country_code,
+            "country": country.country,
+            "beta": country.beta,
+            "number_types": sorted(country.subresource_uris or {}),
+        }
+        for country in get_twilio_client().available_phone_numbers.list()
+    ]
+    catalog = {"countries": countries, "fetched_at": time.time()}
+    cache.set(COUNTRY_CATALOG_CACHE_KEY, catalog, COUNTRY_CATALOG_STALE_TTL)
+    return catalog
+
+
+def schedule_country_catalog_refresh():
+    from .tasks import refresh_country_catalog
+
+    if cache.add(COUNTRY_CATALOG_LOCK_KEY, 1, COUNTRY_CATALOG_REFRESH_LOCK_TIMEOUT):
+        refresh_country_catalog.delay()
+
+
+def get_country_index():
+    """
+    Return this process's CountryIndex, rebuilt when the shared catalog has
+    changed. Only a cold cache goes to Twilio inline.
+    """
+    now = time.time()
+    if _local["index"] is not None and now - _local["checked_at"] < (
+        COUNTRY_CATALOG_LOCAL_TTL
+    ):
+        return _local["index"]
+
+    cached = cache.get(COUNTRY_CATALOG_CACHE_KEY)
+    if cached is None:
+        if _local["index"] is not None:
+            # The shared copy is gone, keep serving ours while it is rebuilt
+            schedule_country_catalog_refresh()
+            _local["checked_at"] = now
+            return _local["index"]
+        cached = fetch_country_catalog()
+    elif now - cached["fetched_at"] >= COUNTRY_CATALOG_TTL:
+        schedule_country_catalog_refresh()
+
+    with _local_lock:
+        if _local["fetched_at"] != cached["fetched_at"]:
+            _local["index"] = CountryIndex(cached["countries"])
+            _local["fetched_at"] = cached["fetched_at"]
+        _local["checked_at"] = now
+    return _local["index"]
+
+
+def search_countries(query=""):
+    return get_country_index().search(query)
+
+
+def get_country(country_code):
+    country_code = (country_code or "").upper()
+    return next(
+        (
+            country
+            for country in get_country_index().countries
+            if country["country_code"] == country_code
+        ),
+        None,
+    )
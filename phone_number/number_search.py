@@ -0,0 +1,146 @@
+"""
+Available phone number search.
+
+One search covers several number types (local, mobile, toll free) and area
+codes. Twilio has a separate endpoint for each, so they are queried
+concurrently and the results merged, without duplicates. Results are cached
+briefly so paging through them in the UI doesn't go back to Twilio.
+"""
+
+import asyncio
+import hashlib
+import logging
+
+import httpx
+import orjson
+from django.core.cache import cache
+
+from .country_catalog import get_country
+
+TWILIO_API_BASE_URL = "https://api.twilio.com/2010-04-01"
+NUMBER_TYPES = {"local": "Local", "mobile": "Mobile", "toll_free": "TollFree"}
+NUMBER_SEARCH_TIMEOUT = 10
+NUMBER_SEARCH_PAGE_SIZE = 50
+NUMBER_SEARCH_CACHE_TIMEOUT = 2 * 60
+MAX_AREA_CODES = 5
+
+logger = logging.getLogger(__name__)
+
+
+def get_number_types(country_code, number_types=None):
+    """The requested number types the country has, all of them by default."""
+    try:
+        country = get_country(country_code)
+    except Exception:
+        # Without the catalog every type is tried
+        country = None
+    available = country["number_types"] if country else list(NUMBER_TYPES)
+    return [
+        number_type
+        for number_type in number_types or NUMBER_TYPES
+        if number_type in NUMBER_TYPES and number_type in available
+    ]
+
+
+def get_search_cache_key(query):
+    digest = hashlib.sha1(orjson.dumps(query, option=orjson.OPT_SORT_KEYS))
+    return f"phone_number_search:{digest.hexdigest()}"
+
+
+async def fetch_numbers(client, account_sid, query, number_type, area_code):
+    url = (
+        f"{TWILIO_API_BASE_URL}/Accounts/{account_sid}/AvailablePhoneNumbers/"
+        f"{query['country']}/{NUMBER_TYPES[number_type]}.json"
+    )
+    params = {"PageSize": NUMBER_SEARCH_PAGE_SIZE}
+    if query["contains"]:
+        params["Contains"] = query["contains"]
+    if area_code:
+        params["AreaCode"] = area_code
+    if query["sms_enabled"]:
+        params["SmsEnabled"] = "true"
+    if query["voice_enabled"]:
+        params["VoiceEnabled"] = "true"
+    response = await client.get(url, params=params)
+    # The country has no numbers of this type
+    if response.status_code == 404:
+        return []
+    response.raise_for_status()
+    return response.json().get("available_phone_numbers", [])
+
+
+async def fetch_all_numbers(account_sid, auth_token, query):
+    searches = [
+        (number_type, area_code)
+        for number_type in query["number_types"]
+        for area_code in query["area_codes"] or [None]
+    ]
+    async with httpx.AsyncClient(
+        auth=(account_sid, auth_token), timeout=NUMBER_SEARCH_TIMEOUT
+    ) as client:
+        results = await asyncio.gather(
+            *[
+                fetch_numbers(client, account_sid, query, number_type, area_code)
+                for number_type, area_code in searches
+            ],
+            return_exceptions=True,
+        )
+    return list(zip(searches, results))
+
+
+def get_error_message(error):
+    """
+    What a client is told about a failed search. Twilio error texts and
+    request urls name the subaccount, so they are only logged.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"Twilio returned status {error.response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return "Twilio did not respond in time"
+    return "Twilio request failed"
+
+
+def merge_results(results):
+    """Merge the numbers of every search, each number once, and collect errors."""
+    phone_numbers, errors, seen = [], [], set()
+    for (number_type, area_code), result in results:
+        if isinstance(result, Exception):
+            logger.error(
+                f"Twilio number search for {number_type} {area_code} failed: {result}"
+            )
+            errors.append(
+                {
+                    "number_type": number_type,
+                    "area_code": area_code,
+                    "error": get_error_message(result),
+                }
+            )
+            continue
+        for number in result:
+            if number.get("phone_number") in seen:
+                continue
+            seen.add(number.get("phone_number"))
+            phone_numbers.append({**number, "number_type": number_type})
+    return phone_numbers, errors
+
+
+def search_available_numbers(account_sid, auth_token, query):
+    """
+    Return (phone numbers, errors) for a query of country, number_types,
+    area_codes, contains, sms_enabled and voice_enabled.
+    """
+    cache_key = get_search_cache_key(query)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached["phone_numbers"], cached["errors"]
+
+    results = asyncio.run(fetch_all_numbers(account_sid, auth_token, query))
+    phone_numbers, errors = merge_results(results)
+    # Partial results are not cached, the failed searches are tried again
+    if not errors:
+        cache.set(
+            cache_key,
+            {"phone_numbers": phone_numbers, "errors": errors},
+            NUMBER_SEARCH_CACHE_TIMEOUT,
+        )
+    return phone_numbers, errors
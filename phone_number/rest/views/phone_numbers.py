@@ -1,7 +1,6 @@
 # views.py
 import json
 import logging
-import os
 
 import requests
 from django.http import HttpResponse, JsonResponse
@@ -12,7 +11,6 @@ from rest_framework import generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from twilio.base.exceptions import TwilioRestException
-from twilio.rest import Client
 
 from phone_number.models import (
     EndUser,
@@ -28,20 +26,17 @@ from phone_number.rest.serializers.phone_numbers import (
     RegulatoryBundleSerializer,
     SupportingDocumentSerializer,
 )
+from phone_number.country_catalog import search_countries
+from phone_number.number_search import (
+    MAX_AREA_CODES,
+    get_number_types,
+    search_available_numbers,
+)
+from phone_number.twilio_clients import get_twilio_client
+from phone_number.workflow import get_workflow_snapshot, invalidate_workflow_snapshot
 
 logger = logging.getLogger(__name__)
 
-# Parent account credentials
-TWILIO_PARENT_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
-TWILIO_PARENT_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
-
-
-def get_twilio_client(account_sid=None, auth_token=None):
-    """Get Twilio client with specified or parent credentials"""
-    sid = account_sid or TWILIO_PARENT_ACCOUNT_SID
-    token = auth_token or TWILIO_PARENT_AUTH_TOKEN
-    return Client(sid, token)
-
 
 # ============================================
 # 1. CREATE SUBACCOUNT FOR CUSTOMER
@@ -1241,6 +1236,9 @@ def bundle_status_webhook(request):
             bundle.rejection_reason = data.get("FailureReason", "")
 
         bundle.save()
+        # Twilio reports the review outcome here, so make sure the next
+        # workflow status read sees it
+        invalidate_workflow_snapshot(bundle.organization_id)
 
         logger.info(f"Bundle {bundle_sid} status updated to {new_status}")
 
@@ -1274,85 +1272,10 @@ def get_workflow_status(request):
     GET /api/twilio/workflow-status/
     """
     try:
-        user = request.user
-        organization = user.get_organization()
-
-        # Check subaccount
-        subaccount = TwilioSubAccount.objects.filter(organization=organization).first()
-
-        # Check end users
-        end_user = EndUser.objects.filter(organization=organization).first()
-
-        # Check address
-        address = RegulatoryAddress.objects.filter(organization=organization).first()
-
-        # Check bundles
-        bundles = RegulatoryBundle.objects.filter(organization=organization)
-        approved_bundle = bundles.filter(status="TWILIO_APPROVED").first()
-
-        # Check phone numbers
-        phone_numbers = TwilioPhoneNumber.objects.filter(
-            organization=organization, status="ACTIVE"
+        organization = request.user.get_organization()
+        workflow_status = get_workflow_snapshot(
+            organization.id if organization else None
         )
-
-        workflow_status = {
-            "step_1_subaccount": {
-                "completed": bool(subaccount),
-                "data": {
-                    "account_sid": subaccount.twilio_account_sid
-                    if subaccount
-                    else None,
-                    "status": subaccount.status if subaccount else None,
-                }
-                if subaccount
-                else None,
-            },
-            "step_2_end_user": {
-                "completed": bool(end_user),
-                "data": {
-                    "end_user_sid": end_user.end_user_sid if end_user else None,
-                    "type": end_user.end_user_type if end_user else None,
-                }
-                if end_user
-                else None,
-            },
-            "step_3_address": {
-                "completed": bool(address),
-                "data": {
-                    "address_sid": address.address_sid if address else None,
-                    "status": address.status if address else None,
-                }
-                if address
-                else None,
-            },
-            "step_4_bundle": {
-                "completed": bool(approved_bundle),
-                "pending": bundles.filter(
-                    status__in=["PENDING_REVIEW", "IN_REVIEW"]
-                ).exists(),
-                "data": [
-                    {
-                        "bundle_sid": b.bundle_sid,
-                        "status": b.status,
-                        "can_purchase": b.status == "TWILIO_APPROVED",
-                    }
-                    for b in bundles
-                ],
-            },
-            "step_5_phone_numbers": {
-                "completed": phone_numbers.exists(),
-                "count": phone_numbers.count(),
-                "data": [
-                    {"phone_number": str(pn.phone_number), "status": pn.status}
-                    for pn in phone_numbers
-                ],
-            },
-            "can_purchase_numbers": bool(approved_bundle),
-            "next_step": _get_next_step(
-                subaccount, end_user, address, approved_bundle, phone_numbers
-            ),
-        }
-
         return JsonResponse({"success": True, "workflow": workflow_status})
 
     except Exception as e:
@@ -1360,21 +1283,6 @@ def get_workflow_status(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
-def _get_next_step(subaccount, end_user, address, approved_bundle, phone_numbers):
-    """Helper to determine next step in workflow"""
-    if not subaccount:
-        return "Create subaccount"
-    if not end_user:
-        return "Create end user (business information)"
-    if not address:
-        return "Create address"
-    if not approved_bundle:
-        return "Create bundle, assign end user & address, upload documents, and submit for approval"
-    if not phone_numbers.exists():
-        return "Purchase phone number"
-    return "All steps completed"
-
-
 # ============================================
 # LIST VIEWS FOR API
 # ============================================
@@ -1419,41 +1327,28 @@ class SupportingDocumentListView(generics.ListAPIView):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def countries(request):
-    user = request.user
-    organization = user.get_organization()
-    subaccount = get_object_or_404(TwilioSubAccount, organization=organization)
-
-    url = (
-        "https://api.twilio.com/2010-04-01/Accounts/"
-        f"{subaccount.twilio_account_sid}/AvailablePhoneNumbers.json"
-    )
-    auth = (subaccount.twilio_account_sid, subaccount.twilio_auth_token)
-
+    """Countries with Twilio numbers, served from the shared country catalog."""
     try:
-        resp = requests.get(url, auth=auth, timeout=10)
-        resp.raise_for_status()
-    except requests.RequestException as e:
+        countries = search_countries(request.GET.get("search", ""))
+    except (TwilioRestException, requests.RequestException) as e:
         return HttpResponse(f"Error fetching from Twilio: {e}", status=502)
 
-    data = resp.json()
-    countries = data.get("countries", [])
-
-    # --- 🔍 Search Support ---
-    search_query = request.GET.get("search", "").strip().lower()
-    if search_query:
-        countries = [
-            c
-            for c in countries
-            if search_query in c.get("country", "").lower()
-            or search_query in c.get("country_code", "").lower()
-        ]
-
     return JsonResponse({"countries": countries}, safe=False)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def available_phone_numbers(request):
+    """
+    Search available numbers of one country across number types and area
+    codes at once.
+
+    GET /api/phone_number/available_phone_numbers?country=GB
+        &types=local,mobile,toll_free&area_codes=20,161&search=777
+        &sms_enabled=true&page=1&page_size=20
+
+    Every number found is returned unless page or page_size is given.
+    """
     country_code = request.GET.get("country", None)
     if country_code == None:
         return HttpResponse("Country code is required", status=400)
@@ -1461,27 +1356,53 @@ def available_phone_numbers(request):
     organization = user.get_organization()
     subaccount = get_object_or_404(TwilioSubAccount, organization=organization)
 
-    url = (
-        f"https://api.twilio.com/2010-04-01/Accounts/"
-        f"{subaccount.twilio_account_sid}/AvailablePhoneNumbers/{country_code}/Local.json"
-    )
-    auth = (subaccount.twilio_account_sid, subaccount.twilio_auth_token)
-
-    search_query = request.GET.get("search", "").strip()
-
-    params = {}
-    if search_query:
-        params["Contains"] = search_query
-
-    try:
-        resp = requests.get(url, auth=auth, params=params, timeout=10)
-        resp.raise_for_status()
-    except requests.RequestException as e:
+    types = [t.strip() for t in request.GET.get("types", "").split(",") if t.strip()]
+    area_codes = [
+        a.strip() for a in request.GET.get("area_codes", "").split(",") if a.strip()
+    ]
+    if len(area_codes) > MAX_AREA_CODES:
         return HttpResponse(
-            f"Error fetching phone numbers from Twilio: {e}", status=502
+            f"At most {MAX_AREA_CODES} area codes can be searched at once", status=400
         )
+    paginated = "page" in request.GET or "page_size" in request.GET
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        page_size = min(max(int(request.GET.get("page_size", 20)), 1), 100)
+    except ValueError:
+        return HttpResponse("page and page_size must be numbers", status=400)
+
+    query = {
+        "country": country_code.upper(),
+        "number_types": get_number_types(country_code, types),
+        "area_codes": sorted(set(area_codes)),
+        "contains": request.GET.get("search", "").strip(),
+        "sms_enabled": request.GET.get("sms_enabled") == "true",
+        "voice_enabled": request.GET.get("voice_enabled") == "true",
+    }
+    if not query["number_types"]:
+        return JsonResponse({"phone_numbers": [], "count": 0, "errors": []})
 
-    data = resp.json()
-    phone_numbers = data.get("available_phone_numbers", [])
+    phone_numbers, errors = search_available_numbers(
+        subaccount.twilio_account_sid, subaccount.twilio_auth_token, query
+    )
+    if errors and not phone_numbers:
+        return HttpResponse(
+            f"Error fetching phone numbers from Twilio: {errors[0]['error']}",
+            status=502,
+        )
 
-    return JsonResponse({"phone_numbers": phone_numbers}, safe=False)
+    response = {
+        "phone_numbers": phone_numbers,
+        "count": len(phone_numbers),
+        "errors": errors,
+    }
+    if paginated:
+        start = (page - 1) * page_size
+        response.update(
+            {
+                "phone_numbers": phone_numbers[start : start + page_size],
+                "page": page,
+                "page_size": page_size,
+            }
+        )
+    return JsonResponse(response, safe=False)
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from phone_number.models import (
+    EndUser,
+    RegulatoryAddress,
+    RegulatoryBundle,
+    TwilioPhoneNumber,
+    TwilioSubAccount,
+)
+from phone_number.twilio_clients import (
+    invalidate_account_credentials,
+    invalidate_subaccount_credentials,
+    invalidate_twilio_client,
+)
+from phone_number.workflow import invalidate_workflow_snapshot
+
+
+@receiver(post_save, sender=TwilioSubAccount)
+@receiver(post_delete, sender=TwilioSubAccount)
+def invalidate_subaccount_client(sender, instance, **kwargs):
+    invalidate_subaccount_credentials(instance.organization_id)
+    invalidate_account_credentials(instance.twilio_account_sid)
+    invalidate_twilio_client(instance.twilio_account_sid)
+
+
+@receiver(post_save, sender=TwilioSubAccount)
+@receiver(post_delete, sender=TwilioSubAccount)
+@receiver(post_save, sender=EndUser)
+@receiver(post_delete, sender=EndUser)
+@receiver(post_save, sender=RegulatoryAddress)
+@receiver(post_delete, sender=RegulatoryAddress)
+@receiver(post_save, sender=RegulatoryBundle)
+@receiver(post_delete, sender=RegulatoryBundle)
+@receiver(post_save, sender=TwilioPhoneNumber)
+@receiver(post_delete, sender=TwilioPhoneNumber)
+def invalidate_workflow(sender, instance, **kwargs):
+    invalidate_workflow_snapshot(instance.organization_id)
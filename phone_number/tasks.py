@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from .country_catalog import COUNTRY_CATALOG_LOCK_KEY, fetch_country_catalog
+
+
+@shared_task
+def refresh_country_catalog():
+    try:
+        catalog = fetch_country_catalog()
+        print(f"Refreshed the catalog of {len(catalog['countries'])} Twilio countries")
+    except Exception as e:
+        print(f"Failed to refresh the Twilio country catalog: {e}")
+    finally:
+        cache.delete(COUNTRY_CATALOG_LOCK_KEY)
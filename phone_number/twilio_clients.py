@@ -0,0 +1,128 @@
+"""
+Reused Twilio clients.
+
+Building a twilio.rest.Client per message or request opens a new connection
+pool and TLS handshake every time. Clients are kept per account SID instead.
+TwilioHttpClient keeps per request state, so every thread has its own HTTP
+client and clients, which campaign sender threads rely on. Subaccount
+credentials are cached in the process, never in the shared cache, so
+sending an SMS needs no database query.
+"""
+
+import os
+import threading
+import time
+
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
+
+from phone_number.models import TwilioSubAccount
+
+# Parent account credentials
+TWILIO_PARENT_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID")
+TWILIO_PARENT_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN")
+
+TWILIO_HTTP_TIMEOUT = 30
+# Signals clear the copy of the process saving a subaccount, other processes
+# see a changed auth token once theirs expires
+TWILIO_CREDENTIALS_CACHE_TIMEOUT = 5 * 60
+
+_local = threading.local()
+# Bumped by invalidate_twilio_client, so every thread rebuilds its client
+_client_generations = {}
+_client_generations_lock = threading.Lock()
+# key: (expires_at, credentials)
+_credentials = {}
+
+
+def get_http_client():
+    http_client = getattr(_local, "http_client", None)
+    if http_client is None:
+        http_client = TwilioHttpClient(
+            pool_connections=True, timeout=TWILIO_HTTP_TIMEOUT
+        )
+        _local.http_client = http_client
+    return http_client
+
+
+def get_twilio_client(account_sid=None, auth_token=None):
+    """Get Twilio client with specified or parent credentials"""
+    sid = account_sid or TWILIO_PARENT_ACCOUNT_SID
+    token = auth_token or TWILIO_PARENT_AUTH_TOKEN
+    generation = _client_generations.get(sid, 0)
+    clients = _local.__dict__.setdefault("clients", {})
+    entry = clients.get(sid)
+    # A changed auth token replaces the client built with the old one
+    if entry is None or entry[0] != token or entry[1] != generation:
+        entry = (token, generation, Client(sid, token, http_client=get_http_client()))
+        clients[sid] = entry
+    return entry[2]
+
+
+def invalidate_twilio_client(account_sid):
+    with _client_generations_lock:
+        _client_generations[account_sid] = _client_generations.get(account_sid, 0) + 1
+
+
+def get_cached_credentials(key):
+    entry = _credentials.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def set_cached_credentials(key, credentials):
+    _credentials[key] = (
+        time.monotonic() + TWILIO_CREDENTIALS_CACHE_TIMEOUT,
+        credentials,
+    )
+
+
+def get_subaccount_credentials(organization_id):
+    """Return (account_sid, auth_token) of an organization's Twilio subaccount."""
+    key = ("subaccount", organization_id)
+    credentials = get_cached_credentials(key)
+    if credentials is not None:
+        return credentials
+
+    subaccount = TwilioSubAccount.objects.only(
+        "twilio_account_sid", "twilio_auth_token"
+    ).get(organization_id=organization_id)
+    credentials = (subaccount.twilio_account_sid, subaccount.twilio_auth_token)
+    set_cached_credentials(key, credentials)
+    return credentials
+
+
+def invalidate_subaccount_credentials(organization_id):
+    _credentials.pop(("subaccount", organization_id), None)
+
+
+def get_organization_twilio_client(organization_id):
+    return get_twilio_client(*get_subaccount_credentials(organization_id))
+
+
+def get_account_credentials(account_sid):
+    """
+    Return (organization_id, auth_token) of the subaccount with this SID, or
+    None when it is not one of ours. Used to authenticate Twilio webhooks.
+    """
+    key = ("account", account_sid)
+    credentials = get_cached_credentials(key)
+    if credentials is not None:
+        return credentials
+
+    subaccount = (
+        TwilioSubAccount.objects.filter(twilio_account_sid=account_sid)
+        .only("organization_id", "twilio_auth_token")
+        .first()
+    )
+    # Unknown SIDs are not cached, so made up ones can not fill the cache
+    if subaccount is None:
+        return None
+    credentials = (subaccount.organization_id, subaccount.twilio_auth_token)
+    set_cached_credentials(key, credentials)
+    return credentials
+
+
+def invalidate_account_credentials(account_sid):
+    _credentials.pop(("account", account_sid), None)
@@ -0,0 +1,163 @@
+"""
+Phone number purchase workflow status.
+
+The status of every step (subaccount, end user, address, bundle, phone
+numbers) is read with one query on the organization, each step being a
+subquery of it. The result is cached per organization and dropped by the
+signals in phone_number.signals whenever one of the models changes.
+"""
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.db.models import Exists, JSONField, OuterRef, Q, Subquery
+from django.db.models.functions import JSONObject
+
+from organizations.models import Organization
+from phone_number.models import (
+    EndUser,
+    RegulatoryAddress,
+    RegulatoryBundle,
+    TwilioPhoneNumber,
+    TwilioSubAccount,
+)
+
+WORKFLOW_CACHE_TIMEOUT = 10 * 60
+
+BUNDLE_APPROVED_STATUS = "TWILIO_APPROVED"
+BUNDLE_PENDING_STATUSES = ["PENDING_REVIEW", "IN_REVIEW"]
+PHONE_NUMBER_ACTIVE_STATUS = "ACTIVE"
+
+EMPTY_SNAPSHOT = {
+    "subaccount_data": None,
+    "end_user_data": None,
+    "address_data": None,
+    "has_approved_bundle": False,
+    "has_pending_bundle": False,
+    "bundles": [],
+    "phone_numbers": [],
+}
+
+
+def get_workflow_cache_key(organization_id):
+    return f"twilio_workflow:{organization_id}"
+
+
+def _latest(model, **fields):
+    """The organization's latest row of model, as a JSON object of fields."""
+    return Subquery(
+        model.objects.filter(organization=OuterRef("pk"))
+        .order_by("-created_at")
+        .values(data=JSONObject(**fields))[:1],
+        output_field=JSONField(),
+    )
+
+
+def _all(queryset, **fields):
+    return ArraySubquery(
+        queryset.filter(organization=OuterRef("pk"))
+        .order_by("-created_at")
+        .values(data=JSONObject(**fields))
+    )
+
+
+def query_workflow_snapshot(organization_id):
+    """Every step of the workflow in one query."""
+    bundles = RegulatoryBundle.objects.filter(organization=OuterRef("pk"))
+    return (
+        Organization.objects.filter(pk=organization_id)
+        .annotate(
+            subaccount_data=_latest(
+                TwilioSubAccount, account_sid="twilio_account_sid", status="status"
+            ),
+            end_user_data=_latest(
+                EndUser, end_user_sid="end_user_sid", type="end_user_type"
+            ),
+            address_data=_latest(
+                RegulatoryAddress, address_sid="address_sid", status="status"
+            ),
+            has_approved_bundle=Exists(bundles.filter(status=BUNDLE_APPROVED_STATUS)),
+            has_pending_bundle=Exists(
+                bundles.filter(status__in=BUNDLE_PENDING_STATUSES)
+            ),
+            bundles=_all(
+                RegulatoryBundle.objects.all(),
+                bundle_sid="bundle_sid",
+                status="status",
+                can_purchase=Q(status=BUNDLE_APPROVED_STATUS),
+            ),
+            phone_numbers=_all(
+                TwilioPhoneNumber.objects.filter(status=PHONE_NUMBER_ACTIVE_STATUS),
+                phone_number="phone_number",
+                status="status",
+            ),
+        )
+        .values(
+            "subaccount_data",
+            "end_user_data",
+            "address_data",
+            "has_approved_bundle",
+            "has_pending_bundle",
+            "bundles",
+            "phone_numbers",
+        )
+        .first()
+    ) or dict(EMPTY_SNAPSHOT)
+
+
+def get_next_step(snapshot):
+    """Helper to determine next step in workflow"""
+    if not snapshot["subaccount_data"]:
+        return "Create subaccount"
+    if not snapshot["end_user_data"]:
+        return "Create end user (business information)"
+    if not snapshot["address_data"]:
+        return "Create address"
+    if not snapshot["has_approved_bundle"]:
+        return "Create bundle, assign end user & address, upload documents, and submit for approval"
+    if not snapshot["phone_numbers"]:
+        return "Purchase phone number"
+    return "All steps completed"
+
+
+def build_workflow_status(snapshot):
+    return {
+        "step_1_subaccount": {
+            "completed": bool(snapshot["subaccount_data"]),
+            "data": snapshot["subaccount_data"],
+        },
+        "step_2_end_user": {
+            "completed": bool(snapshot["end_user_data"]),
+            "data": snapshot["end_user_data"],
+        },
+        "step_3_address": {
+            "completed": bool(snapshot["address_data"]),
+            "data": snapshot["address_data"],
+        },
+        "step_4_bundle": {
+            "completed": snapshot["has_approved_bundle"],
+            "pending": snapshot["has_pending_bundle"],
+            "data": snapshot["bundles"],
+        },
+        "step_5_phone_numbers": {
+            "completed": bool(snapshot["phone_numbers"]),
+            "count": len(snapshot["phone_numbers"]),
+            "data": snapshot["phone_numbers"],
+        },
+        "can_purchase_numbers": snapshot["has_approved_bundle"],
+        "next_step": get_next_step(snapshot),
+    }
+
+
+def get_workflow_snapshot(organization_id):
+    cache_key = get_workflow_cache_key(organization_id)
+    workflow_status = cache.get(cache_key)
+    if workflow_status is None:
+        workflow_status = build_workflow_status(
+            query_workflow_snapshot(organization_id)
+        )
+        cache.set(cache_key, workflow_status, WORKFLOW_CACHE_TIMEOUT)
+    return workflow_status
+
+
+def invalidate_workflow_snapshot(organization_id):
+    cache.delete(get_workflow_cache_key(organization_id))
@@ -1,8 +1,9 @@
 from django.contrib import admin
 
-from .models import Category, Feature, PlanFeature, Subscription
+from .models import Category, Feature, PlanFeature, QuotaReservation, Subscription
 
 admin.site.register(Subscription)
 admin.site.register(Feature)
 admin.site.register(PlanFeature)
 admin.site.register(Category)
+admin.site.register(QuotaReservation)
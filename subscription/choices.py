@@ -3,3 +3,9 @@ from django.db import models
 
 class FeatureType(models.TextChoices):
     AI_CALL = "AI_CALL", "AI Call"
+
+
+class ReservationStatus(models.TextChoices):
+    RESERVED = "RESERVED", "Reserved"
+    CONSUMED = "CONSUMED", "Consumed"
+    RELEASED = "RELEASED", "Released"
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:16
+
+import dirtyfields.dirtyfields
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('subscription', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuotaReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('RESERVED', 'Reserved'), ('CONSUMED', 'Consumed'), ('RELEASED', 'Released')], default='RESERVED', max_length=20)),
+                ('expires_at', models.DateTimeField(help_text='Reservations still open after this time are reconciled')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quota_reservations', to='organizations.organization')),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='subscription.subscription')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='subscriptio_status_a92832_idx')],
+            },
+            bases=(dirtyfields.dirtyfields.DirtyFieldsMixin, models.Model),
+        ),
+    ]
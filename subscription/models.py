@@ -6,7 +6,7 @@ from common.choices import Status
 from common.models import BaseModelWithUID
 from organizations.models import Organization
 
-from .choices import FeatureType
+from .choices import FeatureType, ReservationStatus
 
 User = get_user_model()
 
@@ -77,3 +77,31 @@ class Subscription(BaseModelWithUID):
 
     def __str__(self):
         return f"{self.organization.name} - {self.plan_feature.feature.name}"
+
+
+class QuotaReservation(BaseModelWithUID):
+    """
+    One unit of subscription quota held for a dispatched call
+    """
+
+    subscription = models.ForeignKey(
+        Subscription, on_delete=models.CASCADE, related_name="reservations"
+    )
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="quota_reservations"
+    )
+    application_id = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=ReservationStatus.choices,
+        default=ReservationStatus.RESERVED,
+    )
+    expires_at = models.DateTimeField(
+        help_text="Reservations still open after this time are reconciled"
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "expires_at"])]
+
+    def __str__(self):
+        return f"{self.organization_id} - {self.application_id} - {self.status}"
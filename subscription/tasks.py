@@ -0,0 +1,41 @@
+from celery import shared_task
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from interview.models import InterviewTaken
+
+from .choices import ReservationStatus
+from .models import QuotaReservation
+from .utils import release_call_quota
+
+
+@shared_task
+def reconcile_call_quota():
+    """
+    Settle reservations whose call never reported back in time.
+
+    A reservation with a matching InterviewTaken is consumed, everything else
+    is released to the subscription.
+    """
+    interview_taken = InterviewTaken.objects.filter(
+        organization_id=OuterRef("organization_id"),
+        application_id=OuterRef("application_id"),
+        created_at__gte=OuterRef("created_at"),
+    )
+    expired = QuotaReservation.objects.filter(
+        status=ReservationStatus.RESERVED, expires_at__lte=timezone.now()
+    )
+
+    consumed = expired.filter(Exists(interview_taken)).update(
+        status=ReservationStatus.CONSUMED, updated_at=timezone.now()
+    )
+
+    released = 0
+    for reservation_id in expired.filter(~Exists(interview_taken)).values_list(
+        "id", flat=True
+    ):
+        if release_call_quota(reservation_id):
+            released += 1
+
+    print(f"Reconciled call quota: {consumed} consumed, {released} released")
+    return {"consumed": consumed, "released": released}
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.choices import Status
+
+from .choices import FeatureType, ReservationStatus
+from .models import QuotaReservation, Subscription
+
+RESERVATION_GRACE_PERIOD = timedelta(hours=1)
+
+
+def reserve_call_quota(organization_id, application_ids, spacing_seconds=0):
+    """
+    Atomically reserve one AI call unit per application id.
+
+    The subscription row is locked once for the whole batch, so a sweep stops
+    exactly at the remaining quota. Returns the created reservations, which may
+    be fewer than the requested application ids.
+    """
+    if not application_ids:
+        return []
+
+    with transaction.atomic():
+        subscription = (
+            Subscription.objects.select_for_update(of=("self",))
+            .filter(
+                organization_id=organization_id,
+                plan_feature__feature__type=FeatureType.AI_CALL,
+                status=Status.ACTIVE,
+                available_limit__gt=0,
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if subscription is None:
+            return []
+
+        granted = min(subscription.available_limit, len(application_ids))
+        Subscription.objects.filter(pk=subscription.pk).update(
+            available_limit=F("available_limit") - granted
+        )
+
+        now = timezone.now()
+        reservations = [
+            QuotaReservation(
+                subscription=subscription,
+                organization_id=organization_id,
+                application_id=application_id,
+                expires_at=now
+                + timedelta(seconds=index * spacing_seconds)
+                + RESERVATION_GRACE_PERIOD,
+            )
+            for index, application_id in enumerate(application_ids[:granted])
+        ]
+        return QuotaReservation.objects.bulk_create(reservations)
+
+
+def release_call_quota(reservation_id):
+    """Give an open reservation back to its subscription."""
+    if not reservation_id:
+        return False
+
+    with transaction.atomic():
+        reservation = (
+            QuotaReservation.objects.select_for_update()
+            .filter(pk=reservation_id, status=ReservationStatus.RESERVED)
+            .first()
+        )
+        if reservation is None:
+            return False
+
+        reservation.status = ReservationStatus.RELEASED
+        reservation.save(update_fields=["status", "updated_at"])
+        Subscription.objects.filter(pk=reservation.subscription_id).update(
+            available_limit=F("available_limit") + 1
+        )
+    return True
+
+
+def consume_call_quota(reservation_id):
+    """Mark an open reservation as spent by a successfully placed call."""
+    if not reservation_id:
+        return False
+
+    updated = QuotaReservation.objects.filter(
+        pk=reservation_id, status=ReservationStatus.RESERVED
+    ).update(status=ReservationStatus.CONSUMED, updated_at=timezone.now())
+    return bool(updated)